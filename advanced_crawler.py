@@ -4,14 +4,15 @@ IP 차단 우회를 위한 다양한 기법들을 포함
 """
 
 import requests
-import pandas as pd
-import json
-import time
 import random
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from retry_policy import RetryPolicy
 from urllib3.exceptions import InsecureRequestWarning
-from analysis import analyze_sentiment, topic_modeling
+from review_iterator import paginate_reviews, collect_reviews, SORT_RANKING, ENDPOINT_WRITABLE_REVIEWS
+from review_pipeline import StreamingReviewAnalyzer
+from summary_cache import get_summary_cache
+from pacing import get_pacer
+from http_transport import get_transport
+from response_archive import install_archive, install_replay
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -26,20 +27,40 @@ USER_AGENTS = [
 ]
 
 class AdvancedNaverCrawler:
-    def __init__(self, product_id):
+    review_endpoint = ENDPOINT_WRITABLE_REVIEWS
+
+    def __init__(self, product_id, archive=None, replay_archive=None, retry_policy=None):
+        """archive(ResponseArchive)를 주면 받은 응답 원문을 보관하고, replay_archive를 주면 네트워크 대신 아카이브로 응답합니다.
+        retry_policy(RetryPolicy)의 시간 예산 안에서만 재시도합니다 (정상 응답하는 페이지 수집은 예산과 무관)."""
         self.product_id = product_id
+        self.product_info = None
+        self.replay = replay_archive is not None
+        self.pacer = get_pacer("advanced")
+        self.retry_policy = retry_policy or RetryPolicy()
         self.session = self._create_session()
-        
+        if archive is not None:
+            install_archive(self.session, archive)
+        if replay_archive is not None:
+            install_replay(self.session, replay_archive)
+
+    @classmethod
+    def from_config(cls, product_id, crawler_config, archive=None, browser_pool=None, retry_policy=None):
+        """스케줄러용 생성자 (crawler_registry.Crawler 참고)."""
+        return cls(product_id, archive=archive, retry_policy=retry_policy)
+
+    def start(self):
+        return True
+
     def _create_session(self):
-        session = requests.Session()
-        retry_strategy = Retry(
+        retry_strategy = self.retry_policy.urllib3_retry(
             total=5, backoff_factor=2,
             status_forcelist=[429, 500, 502, 503, 504, 403],
             allowed_methods=["GET", "OPTIONS"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
+        # 상품/크롤러가 바뀌어도 연결을 다시 맺지 않도록 프로세스 공유 연결 풀을 씁니다.
+        session = get_transport().session(retry_strategy)
         session.verify = False
+        session.hooks['response'].append(self.pacer.record_response)
         return session
     
     def _get_dynamic_headers(self, referer_url=None):
@@ -51,11 +72,17 @@ class AdvancedNaverCrawler:
         return headers
     
     def get_product_info(self):
+        """상품 정보(merchant_no, origin_product_no, 상태 코드). 요약 캐시에 있으면 요청하지 않습니다."""
+        if self.product_info is None:
+            self.product_info = get_summary_cache().resolve(self.product_id, self._fetch_product_info, source='advanced')
+        return self.product_info
+
+    def _fetch_product_info(self):
         print("상품 정보를 가져오는 중...")
         info_url = f"https://smartstore.naver.com/i/v1/products/{self.product_id}/summary"
         status_code = None
         try:
-            response = self.session.get(info_url, headers=self._get_dynamic_headers(), timeout=15)
+            response = self.session.get(info_url, headers=self._get_dynamic_headers(), timeout=self.retry_policy.timeout(15))
             status_code = response.status_code
             response.raise_for_status()
             product_info = response.json()
@@ -78,52 +105,42 @@ class AdvancedNaverCrawler:
             print(f"❌ 상품 정보 획득 실패: {e}")
             return None, None, status_code
 
-    def crawl_reviews(self):
+    def _fetch_review_page(self, merchant_no, origin_product_no, page, sort=SORT_RANKING):
+        url = f"https://smartstore.naver.com/main/products/{origin_product_no}/reviews/writable-reviews?page={page}&sort={sort}&merchantNo={merchant_no}"
+        try:
+            if not self.replay:
+                self.pacer.wait()
+            response = self.session.get(url, headers=self._get_dynamic_headers(), timeout=20)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            self.pacer.record_exception(e)
+            print(f"❌ 오류로 크롤링 중단: {e}")
+            return None
+
+    def iter_review_pages(self, sort=SORT_RANKING, watermark=None, progress=None, checkpoint=None, workers=1):
+        """리뷰를 페이지 단위로 (페이지 번호, 레코드 목록)씩 돌려줍니다. 인자는 paginate_reviews 참고."""
         merchant_no, origin_product_no, _ = self.get_product_info()
         if not merchant_no or not origin_product_no:
-            return None
-            
-        all_reviews, page = [], 1
+            return
         print("리뷰 크롤링을 시작합니다...")
-        
-        while True:
-            url = f"https://smartstore.naver.com/main/products/{origin_product_no}/reviews/writable-reviews?page={page}&sort=REVIEW_RANKING&merchantNo={merchant_no}"
-            try:
-                time.sleep(random.uniform(2, 5))
-                response = self.session.get(url, headers=self._get_dynamic_headers(), timeout=20)
-                response.raise_for_status()
-                data = response.json()
-                reviews = data.get('contents', [])
-                
-                if not reviews:
-                    print("✅ 모든 리뷰를 가져왔습니다.")
-                    break
-                
-                for review in reviews:
-                    option_contents = review.get('productOptionContents', [])
-                    option_text = " / ".join([opt.get('optionContent', '') for opt in option_contents])
-                    all_reviews.append({
-                        'id': review.get('id'), 'rating': review.get('reviewScore'),
-                        'writer': review.get('writerMemberId'), 'date': review.get('createDate'),
-                        'content': review.get('reviewContent', ''), 'option': option_text,
-                    })
-                
-                print(f"📄 {page} 페이지: {len(reviews)}개 리뷰 수집 완료 (총 {len(all_reviews)}개)")
-                page += 1
-            
-            except Exception as e:
-                print(f"❌ 오류로 크롤링 중단: {e}")
-                break
-        
-        return pd.DataFrame(all_reviews) if all_reviews else None
+        yield from paginate_reviews(lambda page: self._fetch_review_page(merchant_no, origin_product_no, page, sort),
+                                    watermark=watermark, progress=progress,
+                                    checkpoint=checkpoint, endpoint=self.review_endpoint, workers=workers)
+
+    def crawl_reviews(self, on_page=None):
+        return collect_reviews(self.iter_review_pages(), on_page)
+
+    def close(self):
+        self.session.close()
 
 if __name__ == '__main__':
+    positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른']
+    negative_keywords = ['불편', '별로', '실망', '아쉬', '불만']
+    analyzer = StreamingReviewAnalyzer(positive_keywords, negative_keywords)
     crawler = AdvancedNaverCrawler(PRODUCT_ID)
-    review_df = crawler.crawl_reviews()
+    review_df = crawler.crawl_reviews(on_page=analyzer.submit_page)
     if review_df is not None and not review_df.empty:
-        positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른']
-        negative_keywords = ['불편', '별로', '실망', '아쉬', '불만']
-        review_df['sentiment'] = review_df['content'].apply(lambda x: analyze_sentiment(x, positive_keywords, negative_keywords))
-        review_df = topic_modeling(review_df, NUM_TOPICS)
+        review_df = analyzer.finish(review_df, NUM_TOPICS, product_id=PRODUCT_ID)
         review_df.to_csv(OUTPUT_FILE_NAME, index=False, encoding='utf-8-sig')
         print(f"\n✅ 분석 완료! 결과가 '{OUTPUT_FILE_NAME}' 파일로 저장되었습니다.")
\ No newline at end of file
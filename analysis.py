@@ -1,7 +1,44 @@
-from konlpy.tag import Okt
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
+# konlpy(JVM)와 scikit-learn은 무거워서 실제로 분석할 때 처음 한 번만 불러옵니다.
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from token_cache import TokenCache
+from keyword_matcher import AhoCorasick
+from tokenizer_backends import get_tokenizer
+from functools import lru_cache
+from contextlib import contextmanager
 import logging
+import os
+
+# --- 토크나이저 설정 ---
+# JDK가 없는 서버에서는 REVIEWER_TOKENIZER=regex (또는 ngram)로 JVM 없이 분석할 수 있습니다.
+DEFAULT_TOKENIZER = os.environ.get("REVIEWER_TOKENIZER", "okt")
+
+# --- 토큰화 병렬 처리 설정 ---
+TOKENIZE_WORKERS = max(1, (os.cpu_count() or 1) - 1)
+TOKENIZE_CHUNK_SIZE = 500
+PARALLEL_MIN_ROWS = 2000  # 이보다 적으면 워커 JVM 기동 비용이 더 큼
+
+# --- 감성 분석 설정 ---
+# 키워드가 이보다 적으면 키워드별 `in` 검사(C 구현)가 순수 파이썬 오토마톤보다 빠릅니다 (benchmarks/bench_analysis.py 기준).
+AUTOMATON_MIN_KEYWORDS = 64
+
+# --- 유사 중복 설정 ---
+# 복사/붙여넣기 리뷰가 토픽을 좌우하지 않도록 유사 중복 군집마다 대표 리뷰만 학습합니다.
+# REVIEWER_DEDUP=0 으로 모든 리뷰를 그대로 학습할 수 있습니다.
+DEDUP_NEAR_DUPLICATES = os.environ.get("REVIEWER_DEDUP", "1") != "0"
+# 대표 리뷰가 max(토픽 수, 이 값)보다 적으면 TfidfVectorizer(min_df=2)가 학습할 수 없으므로 모든 리뷰로 학습합니다.
+MIN_DEDUP_DOCUMENTS = 3
+
+# --- 증분 토픽 모델 설정 ---
+# 크롤링 후 분석에 상품 id를 넘기면 topic_store의 상품별 모델을 새 리뷰로만 갱신합니다.
+# REVIEWER_TOPIC_STORE=0 으로 매번 전체 리뷰로 다시 학습할 수 있습니다.
+USE_TOPIC_STORE = os.environ.get("REVIEWER_TOPIC_STORE", "1") != "0"
+
+# --- 토큰 캐시 설정 ---
+# 캐시 키에는 백엔드별 버전이 포함되어, 토큰화 규칙이 바뀌면 기존 캐시는 자동으로 무시됩니다.
+USE_TOKEN_CACHE = True
+
+_token_cache = None
 
 def analyze_sentiment(text, positive_keywords, negative_keywords):
     """간단한 키워드 기반으로 긍정/부정 점수를 계산합니다."""
@@ -16,6 +53,9 @@ def analyze_sentiment(text, positive_keywords, negative_keywords):
         if keyword in text:
             score -= 1
     
+    return _score_to_label(score)
+
+def _score_to_label(score):
     if score > 0:
         return '긍정'
     elif score < 0:
@@ -23,17 +63,201 @@ def analyze_sentiment(text, positive_keywords, negative_keywords):
     else:
         return '중립'
 
-def topic_modeling(df, num_topics):
-    """LDA를 사용하여 리뷰 데이터의 주제를 분석합니다."""
-    okt = Okt()
-    
-    def tokenize(text):
-        if isinstance(text, str):
-            return [token for token in okt.nouns(text) if len(token) > 1]
-        return []
+class KeywordSentimentScorer:
+    """키워드 집합을 한 번 컴파일해 두고 여러 리뷰를 한 번에 채점합니다 (analyze_sentiment와 동일한 결과)."""
+    def __init__(self, positive_keywords, negative_keywords):
+        # 같은 키워드가 목록에 여러 번 있으면 그 횟수만큼 점수에 반영됩니다.
+        weights = {}
+        for keyword in positive_keywords:
+            weights[keyword] = weights.get(keyword, 0) + 1
+        for keyword in negative_keywords:
+            weights[keyword] = weights.get(keyword, 0) - 1
+        self._base_score = weights.pop('', 0)  # 빈 키워드는 모든 문자열에 포함됨
+        # 긍정/부정 양쪽에 같은 횟수로 들어 있어 점수에 영향이 없는 키워드는 검사하지 않습니다.
+        self._items = [(keyword, weight) for keyword, weight in weights.items() if weight]
+        self._matcher = None
+        if len(self._items) >= AUTOMATON_MIN_KEYWORDS:
+            self._matcher = AhoCorasick(keyword for keyword, _ in self._items)
+            self._weights = [weight for _, weight in self._items]
 
-    df['tokens'] = df['content'].apply(tokenize)
-    
+    def score(self, text):
+        if not isinstance(text, str):
+            return 0
+        score = self._base_score
+        if self._matcher is None:
+            for keyword, weight in self._items:
+                if keyword in text:
+                    score += weight
+            return score
+        weights = self._weights
+        return score + sum(weights[idx] for idx in self._matcher.find_all(text))
+
+    def score_batch(self, texts):
+        """리뷰 목록(Series/list)을 채점해 (라벨 목록, 점수 목록)을 돌려줍니다."""
+        memo = {}
+        labels, scores = [], []
+        for text in texts:
+            if not isinstance(text, str):
+                labels.append('중립'); scores.append(0)
+                continue
+            score = memo.get(text)
+            if score is None:
+                score = memo[text] = self.score(text)
+            labels.append(_score_to_label(score)); scores.append(score)
+        return labels, scores
+
+@lru_cache(maxsize=32)
+def _get_sentiment_scorer(positive_keywords, negative_keywords):
+    return KeywordSentimentScorer(positive_keywords, negative_keywords)
+
+def analyze_sentiment_batch(texts, positive_keywords, negative_keywords):
+    """analyze_sentiment의 일괄 처리 버전. (라벨 목록, 점수 목록)을 돌려줍니다."""
+    scorer = _get_sentiment_scorer(tuple(positive_keywords), tuple(negative_keywords))
+    return scorer.score_batch(texts)
+
+def _init_tokenize_worker(tokenizer_name):
+    """워커 프로세스마다 토크나이저(Okt라면 JVM)를 한 번 띄워 미리 예열해 둡니다."""
+    get_tokenizer(tokenizer_name).warmup()
+
+def _tokenize_chunk(tokenizer_name, texts):
+    tokenizer = get_tokenizer(tokenizer_name)
+    return [tokenizer.tokenize(text) for text in texts]
+
+def get_token_cache():
+    """프로세스 전역 토큰 캐시를 돌려줍니다."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TokenCache()
+    return _token_cache
+
+@contextmanager
+def tokenize_pool(tokenizer=None, n_workers=None):
+    """tokenize_texts를 여러 번 부를 때 재사용할 워커 풀 (pool 인자로 넘기세요). 워커가 1개 이하면 None을 줍니다."""
+    n_workers = TOKENIZE_WORKERS if n_workers is None else n_workers
+    if n_workers <= 1:
+        yield None
+        return
+    name = get_tokenizer(tokenizer or DEFAULT_TOKENIZER).name
+    with _new_tokenize_pool(name, n_workers) as pool:
+        yield pool
+
+def _new_tokenize_pool(tokenizer_name, n_workers):
+    # fork는 부모의 JVM(JPype)과 실행 중인 스레드 상태를 물려받아 워커가 멈출 수 있으므로,
+    # 워커는 spawn으로 새로 띄우고 초기화 함수에서 각자 토크나이저를 만듭니다.
+    return ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=_init_tokenize_worker, initargs=(tokenizer_name,))
+
+def tokenize_texts(texts, n_workers=None, chunk_size=None, cache=None, tokenizer=None, pool=None):
+    """리뷰 본문을 명사 토큰 리스트로 변환합니다. 캐시에 없는 본문만 토큰화합니다 (cache=False면 캐시 미사용).
+    pool(tokenize_pool)을 주면 호출마다 워커를 새로 띄우지 않고 그 풀에서 토큰화합니다."""
+    texts = list(texts)
+    backend = get_tokenizer(tokenizer or DEFAULT_TOKENIZER)
+    if cache is None:
+        cache = get_token_cache() if USE_TOKEN_CACHE else False
+    if cache is False:
+        return _tokenize_uncached(backend, texts, n_workers, chunk_size, pool)
+
+    tokens = [[] for _ in texts]
+    keys = {i: TokenCache.make_key(text, backend.version) for i, text in enumerate(texts) if isinstance(text, str)}
+    cached = cache.get_many(list(keys.values()))
+
+    missing = {}
+    for i, key in keys.items():
+        if key in cached:
+            tokens[i] = cached[key]
+        else:
+            missing.setdefault(key, []).append(i)
+
+    if missing:
+        # 같은 본문이 여러 번 나와도 한 번만 토큰화합니다.
+        miss_keys = list(missing)
+        miss_tokens = _tokenize_uncached(backend, [texts[missing[key][0]] for key in miss_keys], n_workers, chunk_size, pool)
+        for key, result in zip(miss_keys, miss_tokens):
+            for i in missing[key]:
+                tokens[i] = result
+        cache.put_many(dict(zip(miss_keys, miss_tokens)))
+
+    stats = cache.stats()
+    logging.info(f"토큰 캐시: 적중 {len(keys) - sum(map(len, missing.values()))}건, 신규 토큰화 {len(missing)}건 (누적 적중률 {stats['hit_rate']:.1%})")
+    return tokens
+
+def _tokenize_uncached(backend, texts, n_workers=None, chunk_size=None, pool=None):
+    n_workers = TOKENIZE_WORKERS if n_workers is None else n_workers
+    chunk_size = chunk_size or TOKENIZE_CHUNK_SIZE
+
+    # 이미 띄워 둔 풀은 기동 비용이 없으므로 행 수와 상관없이 씁니다.
+    if texts and (pool is not None or (n_workers > 1 and len(texts) >= PARALLEL_MIN_ROWS)):
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        try:
+            if pool is not None:
+                return _map_chunks(pool, backend.name, chunks)
+            with _new_tokenize_pool(backend.name, min(n_workers, len(chunks))) as new_pool:
+                return _map_chunks(new_pool, backend.name, chunks)
+        except Exception as e:
+            logging.warning(f"병렬 토큰화 실패, 순차 처리로 전환합니다: {e}")
+
+    return [backend.tokenize(text) for text in texts]
+
+def _map_chunks(pool, tokenizer_name, chunks):
+    # map은 제출 순서대로 결과를 돌려주므로 원래 행 순서가 유지됩니다.
+    results = pool.map(_tokenize_chunk, [tokenizer_name] * len(chunks), chunks)
+    return [tokens for chunk in results for tokens in chunk]
+
+def topic_modeling(df, num_topics, n_workers=None, chunk_size=None, cache=None, tokenizer=None, dedup=None):
+    """LDA를 사용하여 리뷰 데이터의 주제를 분석합니다. dedup=True면 유사 중복 군집마다 대표 리뷰만 분석합니다
+    (None이면 DEDUP_NEAR_DUPLICATES 설정을 따름)."""
+    if DEDUP_NEAR_DUPLICATES if dedup is None else dedup:
+        return _topic_modeling_dedup(df, num_topics, n_workers=n_workers, chunk_size=chunk_size, cache=cache, tokenizer=tokenizer)
+    df['tokens'] = tokenize_texts(df['content'], n_workers=n_workers, chunk_size=chunk_size, cache=cache, tokenizer=tokenizer)
+    return fit_topics(df, num_topics)
+
+def _topic_modeling_dedup(df, num_topics, **tokenize_kwargs):
+    representatives, unique_rows = _near_duplicate_groups(df)
+    rep_df = df.iloc[unique_rows].copy()
+    rep_df['tokens'] = tokenize_texts(rep_df['content'], **tokenize_kwargs)
+    fitted = _fit_representatives(rep_df, num_topics)
+    if fitted is None:
+        df['tokens'] = tokenize_texts(df['content'], **tokenize_kwargs)
+        return fit_topics(df, num_topics)
+    return _share_with_duplicates(df, fitted, representatives, unique_rows, ['tokens', 'topic'])
+
+def fit_topics_dedup(df, num_topics):
+    """fit_topics와 같지만 유사 중복 군집마다 대표 리뷰만 학습하고 토픽을 나머지에 전파합니다 (df['tokens']는 이미 채워져 있어야 함)."""
+    representatives, unique_rows = _near_duplicate_groups(df)
+    fitted = _fit_representatives(df.iloc[unique_rows].copy(), num_topics)
+    if fitted is None:
+        return fit_topics(df, num_topics)
+    return _share_with_duplicates(df, fitted, representatives, unique_rows, ['topic'])
+
+def _near_duplicate_groups(df):
+    from dedup import find_near_duplicates
+    representatives = find_near_duplicates(df['content'].tolist())
+    return representatives, sorted(set(representatives.tolist()))
+
+def _fit_representatives(rep_df, num_topics):
+    """대표 리뷰만으로 학습합니다. 대표가 너무 적거나 벡터라이저가 학습할 수 없으면 None (모든 리뷰로 학습하라는 뜻)."""
+    if len(rep_df) < max(num_topics, MIN_DEDUP_DOCUMENTS):
+        print(f"🧹 유사 중복을 묶으면 대표 리뷰가 {len(rep_df)}건뿐이라 모든 리뷰로 토픽을 학습합니다.")
+        return None
+    try:
+        return fit_topics(rep_df, num_topics)
+    except ValueError as e:
+        logging.warning(f"대표 리뷰만으로는 토픽을 학습할 수 없어 모든 리뷰로 학습합니다: {e}")
+        return None
+
+def _share_with_duplicates(df, rep_df, representatives, unique_rows, columns):
+    print(f"🧹 유사 중복 리뷰 {len(df) - len(unique_rows)}건은 대표 리뷰 결과를 공유합니다 (분석 대상 {len(unique_rows)}/{len(df)}건)")
+    # 대표 리뷰의 결과(columns)를 군집 내 나머지 리뷰에 그대로 전파합니다.
+    position = {row: pos for pos, row in enumerate(unique_rows)}
+    rep_positions = [position[row] for row in representatives]
+    for column in columns:
+        df[column] = rep_df[column].iloc[rep_positions].tolist()
+    df['duplicate_of'] = [df.index[row] if row != i else None for i, row in enumerate(representatives)]
+    df.attrs['dedup_skipped'] = len(df) - len(unique_rows)
+    return df
+
+def fit_topics(df, num_topics):
+    """이미 채워진 df['tokens']로 LDA를 학습해 df['topic']을 채웁니다."""
     texts = [" ".join(tokens) for tokens in df['tokens']]
 
     if not any(texts):
@@ -41,18 +265,28 @@ def topic_modeling(df, num_topics):
         df['topic'] = '분석 불가'
         return df
 
-    vectorizer = TfidfVectorizer(max_features=1000, max_df=0.95, min_df=2)
+    vectorizer = build_vectorizer()
     tfidf_matrix = vectorizer.fit_transform(texts)
     
-    lda = LatentDirichletAllocation(n_components=num_topics, random_state=42)
+    lda = build_lda(num_topics)
     lda.fit(tfidf_matrix)
     
     topic_results = lda.transform(tfidf_matrix)
     df['topic'] = topic_results.argmax(axis=1)
 
-    feature_names = vectorizer.get_feature_names_out()
-    for topic_idx, topic in enumerate(lda.components_):
-        top_keywords = [feature_names[i] for i in topic.argsort()[:-10 - 1:-1]]
-        print(f"토픽 #{topic_idx}: {', '.join(top_keywords)}")
+    print_topic_keywords(lda, vectorizer.get_feature_names_out())
         
-    return df
\ No newline at end of file
+    return df
+
+def build_vectorizer():
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(max_features=1000, max_df=0.95, min_df=2)
+
+def build_lda(num_topics):
+    from sklearn.decomposition import LatentDirichletAllocation
+    return LatentDirichletAllocation(n_components=num_topics, random_state=42)
+
+def print_topic_keywords(model, feature_names, top_n=10):
+    for topic_idx, topic in enumerate(model.components_):
+        top_keywords = [feature_names[i] for i in topic.argsort()[:-top_n - 1:-1]]
+        print(f"토픽 #{topic_idx}: {', '.join(top_keywords)}")
@@ -0,0 +1,208 @@
+"""
+asyncio 기반 다중 상품 크롤링 엔진
+여러 상품을 동시에 수집하되 호스트별 동시 요청 수와 초당 요청 수를 제한하고 429/Retry-After를 존중함
+상품 하나의 페이지는 순서대로 받고(마지막 페이지 판정), 동시성은 상품 단위로 얻음
+"""
+import asyncio
+import random
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from review_iterator import begin_pagination, accept_review_page, ReviewCsvWriter, SORT_RANKING, ENDPOINT_WRITABLE_REVIEWS
+from summary_cache import get_summary_cache
+from http_transport import http2_enabled
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+SUMMARY_URL = "https://smartstore.naver.com/i/v1/products/{product_id}/summary"
+REVIEWS_URL = "https://smartstore.naver.com/main/products/{origin_product_no}/reviews/writable-reviews"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_BACKOFF = 60.0
+
+# httpx는 요청마다 INFO 로그를 남기므로 스케줄러 로그가 묻히지 않게 낮춥니다.
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+]
+
+def parse_retry_after(value, default):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 바꿉니다. 없거나 해석할 수 없으면 default."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+class HostLimiter:
+    """호스트 하나의 동시 요청 수(세마포어)와 요청 간격(초당 요청 수)을 제한하고, 429를 받으면 호스트 전체를 잠시 멈춥니다."""
+    def __init__(self, max_concurrency=4, requests_per_second=2.0):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            await self._wait_turn()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+    async def _wait_turn(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            # 단일 스레드 이벤트 루프라 await 없이 슬롯을 예약하면 경쟁이 없습니다.
+            slot = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = slot + self._interval
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            # 기다리는 사이 다른 요청이 429를 받았다면 차단이 끝날 때까지 다시 기다립니다.
+            if self._blocked_until <= loop.time():
+                return
+
+    def block_for(self, seconds):
+        until = asyncio.get_running_loop().time() + seconds
+        self._blocked_until = max(self._blocked_until, until)
+
+class AsyncCrawlEngine:
+    def __init__(self, max_concurrent_products=8, per_host_concurrency=4, requests_per_second=2.0,
+                 max_retries=3, timeout=20):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx가 설치되지 않았습니다. pip install httpx")
+        self.max_concurrent_products = max_concurrent_products
+        self.per_host_concurrency = per_host_concurrency
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._limiters = {}
+        self._product_slots = None
+
+    @classmethod
+    def from_config(cls, async_config):
+        return cls(max_concurrent_products=async_config.get('max_concurrent_products', 8),
+                   per_host_concurrency=async_config.get('per_host_concurrency', 4),
+                   requests_per_second=async_config.get('requests_per_second', 2.0),
+                   max_retries=async_config.get('max_retries', 3),
+                   timeout=async_config.get('timeout', 20))
+
+    def open_client(self):
+        """엔진이 쓸 비동기 HTTP 클라이언트 (async with로 사용). 연결 수는 호스트 동시성 상한에 맞춥니다.
+        HTTP/2가 켜져 있으면 한 연결로 여러 요청을 동시에 보냅니다."""
+        self._product_slots = asyncio.Semaphore(self.max_concurrent_products)
+        limits = httpx.Limits(max_connections=self.per_host_concurrency * 4,
+                              max_keepalive_connections=self.per_host_concurrency * 2)
+        return httpx.AsyncClient(timeout=self.timeout, limits=limits, verify=False, follow_redirects=True,
+                                 http2=http2_enabled())
+
+    def _limiter(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(self.per_host_concurrency, self.requests_per_second)
+        return self._limiters[host]
+
+    async def _get_json(self, client, url, params=None, referer=None, retry_policy=None):
+        """재시도 가능한 오류(429/5xx/네트워크)는 Retry-After 또는 지수 백오프만큼 기다렸다 다시 요청합니다. (JSON, 상태 코드)를 돌려줍니다.
+        retry_policy(RetryPolicy)를 주면 남은 시간 예산을 넘겨 기다리거나 재시도하지 않습니다 (첫 요청은 예산과 무관)."""
+        limiter = self._limiter(url)
+        headers = {
+            "User-Agent": random.choice(USER_AGENTS),
+            "Accept": "application/json, text/plain, */*",
+            "Referer": referer or "https://smartstore.naver.com/",
+        }
+        status_code = None
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0 and retry_policy is not None and retry_policy.expired():
+                logging.warning(f"⏰ 시간 예산을 모두 써서 요청을 중단합니다: {url}")
+                break
+            wait = min(MAX_BACKOFF, 2 ** attempt + random.random())
+            async with limiter:
+                try:
+                    response = await client.get(url, params=params, headers=headers)
+                except httpx.HTTPError as e:
+                    logging.warning(f"⚠️ 요청 오류 ({url}): {e}")
+                else:
+                    status_code = response.status_code
+                    if status_code == 200:
+                        return response.json(), status_code
+                    if status_code not in RETRY_STATUS:
+                        return None, status_code
+                    wait = min(MAX_BACKOFF, parse_retry_after(response.headers.get('Retry-After'), wait))
+                    if status_code == 429:
+                        limiter.block_for(wait)
+            if retry_policy is not None:
+                wait = min(wait, max(0.0, retry_policy.remaining()))
+            if attempt < self.max_retries:
+                logging.warning(f"⏳ {status_code or '연결 오류'} 응답, {wait:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {url}")
+                await asyncio.sleep(wait)
+        return None, status_code
+
+    async def _resolve_product(self, client, product_id, retry_policy=None):
+        cached = get_summary_cache().lookup(product_id, source='async')
+        if cached is not None:
+            return cached
+        info, status_code = await self._get_json(client, SUMMARY_URL.format(product_id=product_id),
+                                                 referer=f"https://smartstore.naver.com/products/{product_id}", retry_policy=retry_policy)
+        product_data = (info or {}).get('product', {})
+        result = product_data.get('channel', {}).get('channelNo'), product_data.get('productNo'), status_code
+        get_summary_cache().store(product_id, *result, source='async')
+        return result
+
+    async def crawl_product(self, client, product_id, output_file, sort=SORT_RANKING, watermark=None,
+                            progress=None, checkpoint=None, keep_empty=False, retry_policy=None):
+        """상품 하나의 리뷰를 결과 CSV에 이어 씁니다. (저장한 리뷰 수, 상태 코드)를 돌려주며 종료 상태는 progress에 기록합니다.
+        인자의 의미는 review_iterator.paginate_reviews와 같고, retry_policy의 시간 예산이 바닥난 뒤 재시도가 필요한 페이지를 만나면 미완료로 멈춥니다."""
+        progress = progress if progress is not None else {}
+        async with self._product_slots:
+            if retry_policy is not None:
+                retry_policy.start()
+            merchant_no, origin_product_no, status_code = await self._resolve_product(client, product_id, retry_policy)
+            if not merchant_no or not origin_product_no:
+                progress.setdefault('completed', False)
+                return 0, status_code
+
+            page = begin_pagination(progress, watermark, 1, checkpoint, ENDPOINT_WRITABLE_REVIEWS)
+            url = REVIEWS_URL.format(origin_product_no=origin_product_no)
+            writer = ReviewCsvWriter(output_file)
+            try:
+                if checkpoint is not None:
+                    for _, records in checkpoint.replay_pages():
+                        writer.write(records)
+                while True:
+                    data, status_code = await self._get_json(client, url, params={'page': page, 'sort': sort, 'merchantNo': merchant_no},
+                                                             referer=f"https://smartstore.naver.com/products/{product_id}",
+                                                             retry_policy=retry_policy)
+                    if data is None:
+                        break
+                    reviews = data.get('contents', [])
+                    if not reviews:
+                        progress['completed'] = True
+                        break
+                    writer.write(accept_review_page(page, reviews, progress, watermark, checkpoint, ENDPOINT_WRITABLE_REVIEWS))
+                    if progress['unordered']:
+                        break
+                    if progress['reached_watermark']:
+                        progress['completed'] = True
+                        break
+                    page += 1
+            finally:
+                saved_count = writer.close(keep_empty)
+            return saved_count, status_code
@@ -0,0 +1,122 @@
+"""
+분석 성능 벤치마크
+합성 리뷰 말뭉치(1k/10k/100k)로 감성 분석 처리량, 토큰화 속도(tokens/sec), LDA 학습 시간, 최대 메모리를 측정
+네트워크 없이 실행되며 JSON으로 저장해 커밋 간 비교 가능
+
+사용법: python benchmarks/bench_analysis.py [--sizes 1000 10000 100000] [--tokenizer regex] [--json 결과.json] [--compare 이전.json]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import analysis  # noqa: E402
+from synthetic_corpus import generate_reviews  # noqa: E402
+
+POSITIVE_KEYWORDS = ['좋아요', '만족', '추천', '최고', '빠른', '편하고', '예뻐요', '가볍고', '튼튼', '잘', '맘에']
+NEGATIVE_KEYWORDS = ['불편', '별로', '실망', '아쉬', '불만', '느린', '무거', '약한', '문제', '고장']
+NUM_TOPICS = 5
+
+def _timed(measure_memory, func, *args, **kwargs):
+    """실행 시간(초)과 tracemalloc 기준 최대 메모리(MB)를 잽니다.
+    tracemalloc은 실행을 크게 느리게 하므로 시간은 추적 없이 재고, 메모리는 한 번 더 실행해 잽니다."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    if not measure_memory:
+        return result, elapsed, None
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, round(peak / (1024 * 1024), 2)
+
+def _fit_lda(tokens):
+    texts = [" ".join(t) for t in tokens]
+    vectorizer = analysis.build_vectorizer()
+    matrix = vectorizer.fit_transform(texts)
+    analysis.build_lda(NUM_TOPICS).fit(matrix)
+
+def bench_size(rows, tokenizer, workers, seed, measure_memory=True):
+    df = generate_reviews(rows, seed)
+    contents = df['content'].tolist()
+    result = {"rows": rows}
+
+    _, elapsed, _ = _timed(False, lambda: [analysis.analyze_sentiment(t, POSITIVE_KEYWORDS, NEGATIVE_KEYWORDS) for t in contents])
+    result["sentiment_rows_per_sec"] = round(rows / elapsed, 1)
+    # 컴파일된 채점기는 캐시되므로 미리 한 번 만들어 두고 채점만 잽니다.
+    analysis.analyze_sentiment_batch([], POSITIVE_KEYWORDS, NEGATIVE_KEYWORDS)
+    _, elapsed, peak = _timed(measure_memory, analysis.analyze_sentiment_batch, contents, POSITIVE_KEYWORDS, NEGATIVE_KEYWORDS)
+    result["sentiment_batch_rows_per_sec"] = round(rows / elapsed, 1)
+    result["sentiment_peak_mb"] = peak
+
+    tokens, elapsed, peak = _timed(measure_memory, analysis.tokenize_texts, contents, n_workers=workers, cache=False, tokenizer=tokenizer)
+    token_count = sum(len(t) for t in tokens)
+    result["tokenize_seconds"] = round(elapsed, 3)
+    result["tokens_per_sec"] = round(token_count / elapsed, 1)
+    result["tokenize_peak_mb"] = peak
+
+    _, elapsed, peak = _timed(measure_memory, _fit_lda, tokens)
+    result["lda_fit_seconds"] = round(elapsed, 3)
+    result["lda_peak_mb"] = peak
+    return result
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent).stdout.strip() or None
+    except Exception:
+        return None
+
+def _print_comparison(current, previous_path):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = {r["rows"]: r for r in json.load(f)["results"]}
+    print(f"\n📊 {previous_path} 대비 변화")
+    for r in current:
+        old = previous.get(r["rows"])
+        if not old:
+            continue
+        for key, value in r.items():
+            if key == "rows" or key not in old or not old[key]:
+                continue
+            print(f"   {r['rows']:>7}행 {key:<30} {old[key]:>12} → {value:>12} ({(value - old[key]) / old[key]:+.1%})")
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 성능 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--tokenizer", default=analysis.DEFAULT_TOKENIZER)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="최대 메모리 측정(단계별 재실행) 생략")
+    parser.add_argument("--json", dest="json_path")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.sizes:
+        print(f"⏱️  {rows}행 측정 중 (토크나이저: {args.tokenizer}, 워커: {args.workers})...")
+        r = bench_size(rows, args.tokenizer, args.workers, args.seed, measure_memory=not args.no_memory)
+        results.append(r)
+        print(f"   감성 {r['sentiment_rows_per_sec']:.0f} → 일괄 {r['sentiment_batch_rows_per_sec']:.0f} rows/s | "
+              f"토큰화 {r['tokens_per_sec']:.0f} tokens/s ({r['tokenize_seconds']}s) | LDA {r['lda_fit_seconds']}s | "
+              f"최대 메모리 감성/토큰화/LDA {r['sentiment_peak_mb']}/{r['tokenize_peak_mb']}/{r['lda_peak_mb']}MB")
+
+    if args.json_path:
+        report = {
+            "revision": _git_revision(), "python": platform.python_version(), "machine": platform.machine(),
+            "tokenizer": args.tokenizer, "workers": args.workers, "seed": args.seed, "results": results,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json_path}")
+    if args.compare:
+        _print_comparison(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+엔트리 포인트 콜드 스타트(import) 시간 측정
+각 모듈을 새 파이썬 프로세스에서 import 하여 벽시계 시간과 -X importtime 상위 항목을 보고
+
+사용법: python benchmarks/import_time.py [--repeat 5] [--json 결과.json] [모듈 ...]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ["analysis", "smart_scheduler", "web_gui", "desktop_gui", "quick_start"]
+HEAVY_MODULES = ["konlpy", "jpype", "sklearn", "scipy", "selenium", "pandas"]
+
+PROBE = (
+    "import sys, json, {module}; "
+    "print(json.dumps(sorted(m for m in {heavy!r} if m in sys.modules)))"
+)
+
+def _run_once(code, workdir):
+    env = dict(os.environ, PYTHONPATH=str(REPO_DIR), PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=workdir, env=env, capture_output=True, text=True)
+    return time.perf_counter() - start, result
+
+def _top_imports(stderr, top_n):
+    """-X importtime 출력에서 누적 시간이 큰 최상위 import를 뽑습니다."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit() or name.startswith("   "):
+            continue
+        entries.append((int(cumulative), name.strip()))
+    entries.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(us / 1000, 1)} for us, name in entries[:top_n]]
+
+def measure(module, repeat, top_n, workdir):
+    baseline = statistics.median(_run_once("pass", workdir)[0] for _ in range(repeat))
+    timings, result = [], None
+    for _ in range(repeat):
+        elapsed, result = _run_once(PROBE.format(module=module, heavy=HEAVY_MODULES), workdir)
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+            return {"module": module, "error": error}
+        timings.append(elapsed)
+    return {
+        "module": module,
+        "median_s": round(statistics.median(timings), 3),
+        "import_only_s": round(statistics.median(timings) - baseline, 3),
+        "heavy_modules_loaded": json.loads(result.stdout.strip().splitlines()[-1]),
+        "top_imports": _top_imports(result.stderr, top_n),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리 포인트 import 시간 측정")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    # web_gui 등은 import 시 설정/로그 파일을 만들므로 임시 폴더에서 실행합니다.
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [measure(module, args.repeat, args.top, workdir) for module in args.modules]
+
+    for r in results:
+        if "error" in r:
+            print(f"❌ {r['module']}: {r['error']}")
+            continue
+        print(f"⏱️  {r['module']}: {r['median_s']:.3f}s (import {r['import_only_s']:.3f}s), "
+              f"무거운 모듈: {', '.join(r['heavy_modules_loaded']) or '없음'}")
+        for entry in r["top_imports"]:
+            print(f"     {entry['cumulative_ms']:>8.1f} ms  {entry['module']}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json_path}")
+
+if __name__ == "__main__":
+    main()
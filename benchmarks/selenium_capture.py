@@ -0,0 +1,90 @@
+"""
+Selenium 수집 방식 벤치마크
+같은 상품의 리뷰 페이지를 기존 방식(페이지 이동 후 body 텍스트 파싱)과
+JSON 캡처 방식(이미지/CSS 없는 브라우저에서 fetch로 여러 페이지를 한 번에 받기)으로 받아
+브라우저 시작 시간과 페이지당 지연(평균/중앙값/p95)을 비교. 요청 간격 대기는 측정에서 제외
+
+사용법: python benchmarks/selenium_capture.py 상품ID [--pages 20] [--batch-size 5] [--json 결과.json]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from selenium_crawler import SeleniumNaverCrawler  # noqa: E402
+from review_iterator import SORT_RANKING  # noqa: E402
+
+def _summarize(per_page, pages_ok):
+    ordered = sorted(per_page)
+    return {
+        "pages": len(per_page),
+        "pages_ok": pages_ok,
+        "mean_ms": round(statistics.mean(per_page) * 1000, 1),
+        "median_ms": round(statistics.median(per_page) * 1000, 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+    }
+
+def bench_mode(product_id, pages, batch_size, json_capture, headless):
+    crawler = SeleniumNaverCrawler(product_id, headless=headless, json_capture=json_capture, fetch_batch_size=batch_size)
+    try:
+        start = time.perf_counter()
+        if not crawler._setup_driver():
+            raise RuntimeError("브라우저를 시작하지 못했습니다.")
+        startup = time.perf_counter() - start
+        merchant_no, origin_product_no, _ = crawler.get_product_info()
+        if not merchant_no:
+            raise RuntimeError("상품 정보를 가져오지 못했습니다.")
+        urls = [crawler._review_url(merchant_no, origin_product_no, page, SORT_RANKING) for page in range(1, pages + 1)]
+
+        per_page, pages_ok = [], 0
+        if json_capture:
+            for i in range(0, len(urls), batch_size):
+                batch = urls[i:i + batch_size]
+                start = time.perf_counter()
+                results = crawler._fetch_json_batch(batch)
+                elapsed = time.perf_counter() - start
+                per_page.extend([elapsed / len(batch)] * len(batch))
+                pages_ok += sum(1 for _, data in results if data is not None)
+        else:
+            for url in urls:
+                start = time.perf_counter()
+                data = crawler._read_json_via_dom(url)
+                per_page.append(time.perf_counter() - start)
+                pages_ok += data is not None
+        result = _summarize(per_page, pages_ok)
+        result["startup_seconds"] = round(startup, 2)
+        return result
+    finally:
+        crawler.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Selenium 수집 방식 벤치마크")
+    parser.add_argument("product_id")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--show-browser", action="store_true", help="headless 대신 창을 띄워 실행")
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    results = {}
+    for mode, json_capture in (("dom", False), ("capture", True)):
+        print(f"⏱️  {mode} 방식 측정 중 ({args.pages}페이지)...")
+        r = results[mode] = bench_mode(args.product_id, args.pages, args.batch_size, json_capture, not args.show_browser)
+        print(f"   시작 {r['startup_seconds']}s | 페이지당 평균 {r['mean_ms']}ms, 중앙값 {r['median_ms']}ms, "
+              f"p95 {r['p95_ms']}ms | 성공 {r['pages_ok']}/{r['pages']}")
+    speedup = results["dom"]["mean_ms"] / results["capture"]["mean_ms"] if results["capture"]["mean_ms"] else None
+    if speedup:
+        print(f"📊 JSON 캡처 방식이 페이지당 {speedup:.1f}배 빠릅니다 (배치 {args.batch_size}페이지)")
+
+    if args.json_path:
+        report = {"product_id": args.product_id, "pages": args.pages, "batch_size": args.batch_size,
+                  "results": results, "speedup": round(speedup, 2) if speedup else None}
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.json_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+재현 가능한 합성 한국어 리뷰 말뭉치 생성기
+크롤러 결과와 같은 컬럼(id, rating, writer, date, content, option)의 DataFrame을 만듦
+
+사용법: python benchmarks/synthetic_corpus.py 10000 [--seed 42] [--output 합성리뷰.csv]
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+ASPECTS = {
+    "배송": ["배송이 빨라서", "택배가 하루 만에 와서", "배송이 늦어서", "포장이 꼼꼼해서", "박스가 찌그러져서"],
+    "품질": ["재질이 튼튼하고", "마감이 깔끔하고", "품질이 생각보다", "실밥이 좀 보여서", "냄새가 조금 나서"],
+    "가격": ["가격 대비", "할인받아서 저렴하게", "가성비가", "이 가격에", "가격이 조금 비싸서"],
+    "디자인": ["색상이 사진이랑 같고", "디자인이 깔끔해서", "색감이 예뻐서", "사진과 색이 달라서", "모양이 귀여워서"],
+    "사이즈": ["사이즈가 딱 맞고", "생각보다 작아서", "한 치수 크게 주문했는데", "길이가 적당하고", "품이 넉넉해서"],
+}
+POSITIVE_ENDINGS = ["너무 좋아요", "만족합니다", "추천해요", "최고예요", "재구매 의사 있어요", "맘에 들어요"]
+NEGATIVE_ENDINGS = ["별로예요", "실망했어요", "아쉬워요", "불편해요", "불만이에요", "다시는 안 살 것 같아요"]
+NEUTRAL_ENDINGS = ["그냥 그래요", "보통이에요", "쓸만해요", "무난합니다"]
+TEMPLATED_REVIEWS = ["좋아요 잘 쓸게요", "잘 받았습니다", "배송 빠르고 좋아요", "만족합니다", "좋아요"]
+OPTIONS = ["색상: 블랙 / 사이즈: M", "색상: 화이트 / 사이즈: L", "색상: 네이비 / 사이즈: S", "색상: 베이지 / 사이즈: M", ""]
+
+def _make_content(rng, rating):
+    if rng.random() < 0.15:
+        return rng.choice(TEMPLATED_REVIEWS)
+    endings = POSITIVE_ENDINGS if rating >= 4 else NEGATIVE_ENDINGS if rating <= 2 else NEUTRAL_ENDINGS
+    aspects = rng.sample(list(ASPECTS), k=rng.randint(1, 3))
+    phrases = [f"{rng.choice(ASPECTS[aspect])} {rng.choice(endings)}" for aspect in aspects]
+    return " ".join(phrases)
+
+def generate_reviews(n, seed=42):
+    """n건의 합성 리뷰를 만듭니다. 같은 seed면 항상 같은 결과가 나옵니다."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(n):
+        rating = rng.choices([5, 4, 3, 2, 1], weights=[55, 20, 10, 8, 7])[0]
+        rows.append({
+            'id': 4000000000 + i, 'rating': rating, 'writer': f"user{rng.randint(1, n * 2)}",
+            'date': (start + timedelta(minutes=rng.randint(0, 60 * 24 * 365))).strftime("%Y-%m-%dT%H:%M:%S.000+00:00"),
+            'content': _make_content(rng, rating), 'option': rng.choice(OPTIONS),
+        })
+    return pd.DataFrame(rows)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 한국어 리뷰 말뭉치 생성")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    output = args.output or f"synthetic_reviews_{args.rows}.csv"
+    generate_reviews(args.rows, args.seed).to_csv(output, index=False, encoding='utf-8-sig')
+    print(f"✅ 합성 리뷰 {args.rows}건 저장: {output}")
@@ -0,0 +1,111 @@
+"""
+토큰화 백엔드 비교 (처리량 + 토픽 품질)
+같은 리뷰 CSV(content 컬럼)에 대해 백엔드별 토큰화 속도, LDA 토픽 일관성(UMass), 토픽 다양성,
+기준 백엔드 대비 토픽 배정 일치도(ARI)를 측정
+
+사용법: python benchmarks/tokenizer_compare.py 리뷰.csv [--tokenizers okt regex ngram] [--num-topics 5] [--json 결과.json]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from analysis import tokenize_texts, build_vectorizer, build_lda  # noqa: E402
+
+TOP_N = 10
+
+def umass_coherence(doc_term, top_indices):
+    """상위 단어 쌍의 문서 동시 출현으로 계산한 UMass 일관성 (0에 가까울수록 좋음)."""
+    binary = (doc_term > 0).astype(np.int32).tocsc()
+    doc_freq = np.asarray(binary.sum(axis=0)).ravel()
+    scores = []
+    for indices in top_indices:
+        columns = binary[:, indices]
+        co_occurrence = (columns.T @ columns).toarray()
+        topic_score = 0.0
+        for m in range(1, len(indices)):
+            for l in range(m):
+                topic_score += np.log((co_occurrence[m, l] + 1) / max(doc_freq[indices[l]], 1))
+        scores.append(topic_score)
+    return float(np.mean(scores))
+
+def evaluate(texts, tokenizer, num_topics, n_workers):
+    start = time.perf_counter()
+    tokens = tokenize_texts(texts, n_workers=n_workers, cache=False, tokenizer=tokenizer)
+    elapsed = time.perf_counter() - start
+    token_count = sum(len(t) for t in tokens)
+
+    joined = [" ".join(t) for t in tokens]
+    vectorizer = build_vectorizer()
+    doc_term = vectorizer.fit_transform(joined)
+    lda = build_lda(num_topics)
+    start = time.perf_counter()
+    topics = lda.fit_transform(doc_term).argmax(axis=1)
+    fit_seconds = time.perf_counter() - start
+
+    feature_names = vectorizer.get_feature_names_out()
+    top_indices = [topic.argsort()[:-TOP_N - 1:-1] for topic in lda.components_]
+    top_words = [[feature_names[i] for i in indices] for indices in top_indices]
+    unique_words = {word for words in top_words for word in words}
+    return {
+        "tokenizer": tokenizer,
+        "docs_per_sec": round(len(texts) / elapsed, 1) if elapsed else None,
+        "tokens_per_sec": round(token_count / elapsed, 1) if elapsed else None,
+        "avg_tokens_per_doc": round(token_count / max(len(texts), 1), 2),
+        "vocabulary_size": len(feature_names),
+        "lda_fit_seconds": round(fit_seconds, 3),
+        "umass_coherence": round(umass_coherence(doc_term, top_indices), 3),
+        "topic_diversity": round(len(unique_words) / (TOP_N * num_topics), 3),
+        "top_words": top_words,
+    }, topics
+
+def main():
+    parser = argparse.ArgumentParser(description="토큰화 백엔드 처리량/토픽 품질 비교")
+    parser.add_argument("csv_path")
+    parser.add_argument("--tokenizers", nargs="+", default=["okt", "regex", "ngram"])
+    parser.add_argument("--num-topics", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1, help="토큰화 프로세스 수 (기본 1: 백엔드 자체 속도 비교)")
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.csv_path)['content'].tolist()
+    print(f"📚 리뷰 {len(texts)}건으로 비교합니다.")
+
+    results, assignments = [], {}
+    for name in args.tokenizers:
+        try:
+            result, topics = evaluate(texts, name, args.num_topics, args.workers)
+        except Exception as e:
+            print(f"❌ {name}: {e}")
+            continue
+        results.append(result)
+        assignments[name] = topics
+
+    # 첫 번째 백엔드를 기준으로 토픽 배정이 얼마나 비슷한지 비교합니다.
+    if results:
+        from sklearn.metrics import adjusted_rand_score
+        reference = results[0]["tokenizer"]
+        for result in results:
+            result[f"ari_vs_{reference}"] = round(adjusted_rand_score(assignments[reference], assignments[result["tokenizer"]]), 3)
+
+    ari_key = f"ari_vs_{results[0]['tokenizer']}" if results else None
+    for r in results:
+        print(f"\n🔤 {r['tokenizer']}: {r['docs_per_sec']} docs/s, {r['tokens_per_sec']} tokens/s, "
+              f"어휘 {r['vocabulary_size']}, LDA {r['lda_fit_seconds']}s")
+        print(f"   UMass {r['umass_coherence']}, 다양성 {r['topic_diversity']}, "
+              f"{ari_key} {r[ari_key]}")
+        for idx, words in enumerate(r["top_words"]):
+            print(f"   토픽 #{idx}: {', '.join(words)}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json_path}")
+
+if __name__ == "__main__":
+    main()
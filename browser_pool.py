@@ -0,0 +1,146 @@
+"""
+상시 대기하는 headless Chrome 풀
+크롤링마다 브라우저를 새로 띄우는 수 초의 시작 비용을 없애기 위해 브라우저를 빌려 주고 돌려받으며,
+빌려 줄 때 상태를 확인하고 일정 페이지 수나 메모리(RSS) 상한을 넘으면 새 브라우저로 교체함
+메모리 확인은 psutil이 있을 때만 동작
+"""
+import atexit
+import queue
+import threading
+import time
+import weakref
+import logging
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+DEFAULT_POOL_SIZE = 1  # 스케줄러 기본 설정(crawlers.selenium.pool_size)과 같은 값
+
+# 실행마다 풀을 새로 만들어도 종료 처리기는 하나만 두고, 살아 있는 풀만 종료 시 정리합니다.
+_open_pools = weakref.WeakSet()
+
+def _close_open_pools():
+    for pool in list(_open_pools):
+        pool.close()
+
+atexit.register(_close_open_pools)
+
+class PooledBrowser:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+    def is_healthy(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def rss_mb(self):
+        """chromedriver와 그 하위 Chrome 프로세스들의 RSS 합계(MB). psutil이 없으면 None."""
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+        except Exception:
+            return None
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+class BrowserPool:
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_pages=300, max_rss_mb=1500, headless=True, lightweight=False, driver_factory=None):
+        """size: 동시에 띄워 둘 최대 브라우저 수, max_pages: 이만큼 페이지를 열면 교체, max_rss_mb: 메모리 상한(MB).
+        lightweight: 이미지/CSS 없이 띄움 (JSON 캡처 모드용)."""
+        if driver_factory is None:
+            from selenium_crawler import create_chrome_driver
+            driver_factory = lambda: create_chrome_driver(headless, lightweight=lightweight)
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._factory = driver_factory
+        self._idle = queue.LifoQueue()  # 가장 최근에 쓴(캐시가 따뜻한) 브라우저부터 빌려 줍니다.
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._browsers = set()
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0, 'unhealthy': 0, 'closed': 0}
+        _open_pools.add(self)
+
+    @classmethod
+    def from_config(cls, selenium_config):
+        return cls(size=selenium_config.get('pool_size', DEFAULT_POOL_SIZE),
+                   max_pages=selenium_config.get('max_pages_per_browser', 300),
+                   max_rss_mb=selenium_config.get('max_rss_mb', 1500),
+                   headless=selenium_config.get('headless', True),
+                   lightweight=selenium_config.get('json_capture', False))
+
+    def _create(self):
+        browser = PooledBrowser(self._factory())
+        with self._lock:
+            self._browsers.add(browser)
+            self.stats['created'] += 1
+        logging.info(f"🌐 브라우저 풀: 새 브라우저 시작 (총 {len(self._browsers)}/{self.size})")
+        return browser
+
+    def _discard(self, browser, reason):
+        with self._lock:
+            self._browsers.discard(browser)
+            self.stats[reason] += 1
+        browser.quit()
+
+    def checkout(self, timeout=None):
+        """대기 중인 브라우저를 빌려 줍니다. 모두 사용 중이고 상한에 도달했으면 반납될 때까지 기다립니다."""
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("브라우저 풀에서 사용 가능한 브라우저가 없습니다.")
+        try:
+            while True:
+                try:
+                    browser = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._create()
+                if browser.is_healthy():
+                    self.stats['reused'] += 1
+                    return browser
+                logging.warning("⚠️ 브라우저 풀: 응답 없는 브라우저를 교체합니다.")
+                self._discard(browser, 'unhealthy')
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, browser, pages=0):
+        """브라우저를 돌려받습니다. 페이지 수나 메모리 상한을 넘었으면 종료하고 다음에 새로 띄웁니다."""
+        browser.pages += pages
+        try:
+            rss = browser.rss_mb()
+            if browser.pages >= self.max_pages or (rss is not None and rss > self.max_rss_mb):
+                detail = f"{rss:.0f}MB" if rss is not None else "-"
+                logging.info(f"♻️ 브라우저 풀: 교체 (페이지 {browser.pages}, 메모리 {detail})")
+                self._discard(browser, 'recycled')
+            else:
+                try:
+                    # 다음 크롤링에 이전 상품 페이지가 남지 않도록 비워 둡니다.
+                    browser.driver.get("about:blank")
+                except Exception:
+                    self._discard(browser, 'unhealthy')
+                    return
+                self._idle.put(browser)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """대기 중인 브라우저를 모두 종료합니다 (빌려 간 브라우저는 반납 시 다시 풀에 들어옵니다)."""
+        while True:
+            try:
+                browser = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(browser, 'closed')
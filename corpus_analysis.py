@@ -0,0 +1,164 @@
+"""
+저장된 전체 크롤링 결과에 대한 아웃오브코어 토픽 모델링
+crawl_results/의 CSV들을 청크 단위로 읽어 HashingVectorizer로 특징을 만들고
+LDA partial_fit으로 학습하므로 메모리 사용량이 전체 말뭉치 크기와 무관함
+(같은 상품의 결과 파일끼리만 리뷰 id로 중복을 걸러내므로, id 집합도 가장 큰 상품 하나의 리뷰 수까지만 커짐)
+
+사용법: python corpus_analysis.py [결과 폴더] [--num-topics 10] [--chunk-size 5000] [--output 결과.csv]
+"""
+import argparse
+import glob
+import heapq
+import logging
+import os
+from collections import Counter
+
+import pandas as pd
+from analysis import tokenize_texts, tokenize_pool
+
+DEFAULT_RESULTS_DIR = "crawl_results"
+DEFAULT_CHUNK_SIZE = 5000
+N_FEATURES = 2 ** 18
+TOP_N = 10
+MAX_TRACKED_TERMS = 200000  # 해시 버킷별 대표 단어 추적 상한 (키워드 출력용)
+
+def _build_hashing_vectorizer(n_features):
+    from sklearn.feature_extraction.text import HashingVectorizer
+    # 이미 토큰화된 텍스트를 공백으로 나눠 그대로 해싱합니다 (상태 없음).
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                             token_pattern=None, tokenizer=str.split, lowercase=False)
+
+PARTIAL_SUFFIX = "_partial.csv"  # 스케줄러가 남기는 부분 결과 (이어 받은 뒤 전체 결과 파일에 다시 들어감)
+
+def _product_key(path):
+    # 결과 파일 이름은 {product_id}_{timestamp}_{crawler}.csv 형식입니다 (스케줄러 output.filename_pattern 기본값).
+    return os.path.basename(path).split('_', 1)[0]
+
+def _group_by_product(paths):
+    """결과 파일을 상품별로 묶습니다 (상품이 처음 나온 순서, 상품 안에서는 원래 순서 유지)."""
+    groups = {}
+    for path in paths:
+        if not path.endswith(PARTIAL_SUFFIX):
+            groups.setdefault(_product_key(path), []).append(path)
+    return list(groups.values())
+
+def iter_review_chunks(paths, chunk_size):
+    """여러 결과 파일에서 리뷰를 chunk_size 행씩 읽어 (파일 경로, DataFrame)을 차례로 돌려줍니다.
+    부분 결과 파일은 건너뛰고, 같은 상품의 앞선 파일에서 이미 나온 리뷰 id는 빼고 돌려줍니다 (id가 없는 행은 그대로).
+    리뷰 id는 같은 상품의 결과 파일끼리만 겹치므로 상품이 바뀌면 id 집합을 비웁니다."""
+    for group in _group_by_product(paths):
+        seen_ids = set()
+        for path in group:
+            yield from _read_new_reviews(path, chunk_size, seen_ids)
+
+def _read_new_reviews(path, chunk_size, seen_ids):
+    try:
+        for chunk in pd.read_csv(path, chunksize=chunk_size, usecols=lambda c: c in ('id', 'content')):
+            if 'content' not in chunk.columns:
+                continue
+            if 'id' in chunk.columns:
+                # 파일마다 id 열의 dtype이 다를 수 있어 문자열로 비교합니다.
+                ids = chunk['id'].astype(str).where(chunk['id'].notna())
+                duplicate = ids.isin(seen_ids) | (ids.notna() & ids.duplicated())
+                seen_ids.update(ids.dropna())
+                chunk = chunk[~duplicate]
+            if not chunk.empty:
+                yield path, chunk
+    except Exception as e:
+        logging.warning(f"결과 파일 읽기 실패, 건너뜁니다 ({path}): {e}")
+
+class StreamingTopicModel:
+    def __init__(self, num_topics, n_features=N_FEATURES, tokenizer=None, pool=None):
+        """pool(analysis.tokenize_pool)을 주면 청크마다 워커를 새로 띄우지 않고 그 풀에서 토큰화합니다."""
+        from sklearn.decomposition import LatentDirichletAllocation
+        self.num_topics = num_topics
+        self.tokenizer = tokenizer
+        self.pool = pool
+        self.vectorizer = _build_hashing_vectorizer(n_features)
+        self.lda = LatentDirichletAllocation(n_components=num_topics, learning_method='online', random_state=42)
+        self.n_docs = 0
+        self._bucket_terms = {}  # 해시 버킷 → 가장 많이 본 단어 (키워드 역추적용)
+        self._term_counts = Counter()
+
+    def _featurize(self, contents):
+        tokens = tokenize_texts(contents, tokenizer=self.tokenizer, pool=self.pool)
+        return tokens, self.vectorizer.transform([" ".join(t) for t in tokens])
+
+    def _track_terms(self, tokens):
+        for doc in tokens:
+            self._term_counts.update(doc)
+        if len(self._term_counts) > MAX_TRACKED_TERMS:
+            # 메모리 상한을 지키기 위해 빈도 상위 절반만 남깁니다.
+            self._term_counts = Counter(dict(self._term_counts.most_common(MAX_TRACKED_TERMS // 2)))
+
+    def partial_fit(self, contents, total_samples=None):
+        tokens, matrix = self._featurize(contents)
+        self._track_terms(tokens)
+        self.n_docs += matrix.shape[0]
+        if total_samples:
+            self.lda.set_params(total_samples=total_samples)
+        self.lda.partial_fit(matrix)
+
+    def transform(self, contents):
+        _, matrix = self._featurize(contents)
+        return self.lda.transform(matrix).argmax(axis=1)
+
+    def top_keywords(self, top_n=TOP_N):
+        terms = list(self._term_counts)
+        # 단어 하나짜리 문서를 해싱하면 행마다 정확히 하나의 버킷 번호가 나옵니다.
+        bucket_ids = self.vectorizer.transform(terms).indices
+        buckets = {}
+        for term, index in zip(terms, bucket_ids):
+            count = self._term_counts[term]
+            if count > buckets.get(index, ("", 0))[1]:
+                buckets[index] = (term, count)
+        keywords = []
+        for topic in self.lda.components_:
+            ranked = heapq.nlargest(top_n, buckets, key=lambda i: topic[i])
+            keywords.append([buckets[i][0] for i in ranked])
+        return keywords
+
+def corpus_topic_modeling(paths, num_topics, chunk_size=DEFAULT_CHUNK_SIZE, output_path=None, tokenizer=None, passes=1):
+    """결과 파일 전체를 스트리밍으로 학습하고, output_path가 있으면 리뷰별 토픽을 청크 단위로 기록합니다."""
+    # 토큰화 워커 풀은 스트림 전체에서 하나만 띄워 청크마다 프로세스(와 JVM)를 다시 띄우지 않습니다.
+    with tokenize_pool(tokenizer) as pool:
+        model = StreamingTopicModel(num_topics, tokenizer=tokenizer, pool=pool)
+
+        total_rows = 0
+        for epoch in range(passes):
+            for path, chunk in iter_review_chunks(paths, chunk_size):
+                model.partial_fit(chunk['content'], total_samples=total_rows or None)
+                print(f"📚 [{epoch + 1}/{passes}] {os.path.basename(path)}: 누적 {model.n_docs}건 학습")
+            total_rows = total_rows or model.n_docs
+
+        if not model.n_docs:
+            logging.warning("분석할 리뷰가 없어 토픽 모델링을 건너뜁니다.")
+            return model
+
+        for topic_idx, keywords in enumerate(model.top_keywords()):
+            print(f"토픽 #{topic_idx}: {', '.join(keywords)}")
+
+        if output_path:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            for path, chunk in iter_review_chunks(paths, chunk_size):
+                chunk = chunk.assign(source=os.path.basename(path), topic=model.transform(chunk['content']))
+                chunk.to_csv(output_path, mode='a', index=False, header=not os.path.exists(output_path), encoding='utf-8-sig')
+            print(f"💾 리뷰별 토픽 저장: {output_path}")
+        return model
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="전체 크롤링 결과 아웃오브코어 토픽 모델링")
+    parser.add_argument("results_dir", nargs="?", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--num-topics", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--passes", type=int, default=1)
+    parser.add_argument("--tokenizer")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    csv_paths = sorted(glob.glob(os.path.join(args.results_dir, "*.csv")))
+    print(f"📂 결과 파일 {len(csv_paths)}개를 {args.chunk_size}행 단위로 분석합니다.")
+    corpus_topic_modeling(csv_paths, args.num_topics, chunk_size=args.chunk_size, output_path=args.output,
+                          tokenizer=args.tokenizer, passes=args.passes)
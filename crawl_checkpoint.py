@@ -0,0 +1,121 @@
+"""
+재시작/크롤러 전환에도 이어지는 크롤링 체크포인트
+상품 + 정렬 기준마다 엔드포인트별 페이지 커서를 JSON으로, 수집한 리뷰는 JSONL로 보관하여
+프로세스가 죽거나 폴백 크롤러로 넘어가도 처음부터 다시 받지 않도록 함
+페이지마다 다시 쓰는 상태 파일에는 커서와 워터마크만 두고, 수집한 리뷰 id는 불러올 때 JSONL에서 다시 만듦
+"""
+import json
+import os
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_CHECKPOINT_DIR = "crawl_results/.checkpoints"
+DEFAULT_MAX_AGE_HOURS = 24  # 랭킹 정렬은 시간이 지나면 순서가 바뀌므로 오래된 커서는 버립니다.
+REPLAY_PAGE_SIZE = 500
+
+class CrawlCheckpoint:
+    def __init__(self, product_id, sort, watermark=None, base_dir=DEFAULT_CHECKPOINT_DIR, max_age_hours=DEFAULT_MAX_AGE_HOURS):
+        self.product_id = product_id
+        self.sort = sort
+        self.watermark = watermark
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.base_dir / f"{product_id}_{sort}.json"
+        self.records_path = self.base_dir / f"{product_id}_{sort}.partial.jsonl"
+        self.cursors = {}
+        self.review_ids = set()
+        self._load(max_age_hours)
+
+    def _load(self, max_age_hours):
+        if not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            updated_at = datetime.fromisoformat(state['updated_at'])
+            if datetime.now() - updated_at > timedelta(hours=max_age_hours):
+                logging.info(f"오래된 체크포인트를 폐기합니다 ({self.product_id}, {state['updated_at']})")
+            elif state.get('watermark') != self.watermark:
+                logging.info(f"워터마크가 달라진 체크포인트를 폐기합니다 ({self.product_id})")
+            else:
+                self.cursors = state.get('cursors', {})
+                self._trim_partial_line()
+                self.review_ids = {str(record.get('id')) for record in self.iter_records()}
+                logging.info(f"♻️  체크포인트에서 이어서 수집합니다: {self.product_id} {self.cursors} (리뷰 {len(self.review_ids)}개)")
+                return
+        except Exception as e:
+            logging.warning(f"체크포인트 로드 실패, 새로 시작합니다 ({self.product_id}): {e}")
+        self.clear()
+
+    def _trim_partial_line(self):
+        """기록 도중 프로세스가 죽어 잘린 마지막 줄을 잘라 냅니다 (그 페이지는 커서가 오르지 않아 다시 받음)."""
+        if not self.records_path.exists():
+            return
+        with open(self.records_path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if not size:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            data = f.read()
+            f.truncate(data.rfind(b"\n") + 1)
+        logging.warning(f"체크포인트의 잘린 마지막 레코드를 버립니다 ({self.product_id})")
+
+    def _save(self):
+        state = {
+            'product_id': self.product_id, 'sort': self.sort, 'watermark': self.watermark,
+            'cursors': self.cursors,
+            'updated_at': datetime.now().isoformat(),
+        }
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def has_records(self):
+        return bool(self.review_ids)
+
+    def next_page(self, endpoint):
+        """해당 엔드포인트에서 다음에 받아야 할 페이지 번호."""
+        return self.cursors.get(endpoint, 0) + 1
+
+    def record_page(self, endpoint, page, records):
+        """페이지 수집 결과를 기록하고, 이미 다른 시도에서 수집한 리뷰를 뺀 새 레코드만 돌려줍니다."""
+        new_records = [record for record in records if str(record.get('id')) not in self.review_ids]
+        if new_records:
+            # 레코드를 먼저 디스크에 쓴 뒤 커서를 올려야 중간에 죽어도 리뷰를 잃지 않습니다.
+            with open(self.records_path, 'a', encoding='utf-8') as f:
+                for record in new_records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.review_ids.update(str(record.get('id')) for record in new_records)
+        self.cursors[endpoint] = page
+        self._save()
+        return new_records
+
+    def iter_records(self):
+        if not self.records_path.exists():
+            return
+        with open(self.records_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def replay_pages(self):
+        """이전 시도에서 수집해 둔 리뷰를 페이지 반복자와 같은 (페이지, 레코드 목록) 형태로 돌려줍니다."""
+        chunk = []
+        for record in self.iter_records():
+            chunk.append(record)
+            if len(chunk) >= REPLAY_PAGE_SIZE:
+                yield 0, chunk
+                chunk = []
+        if chunk:
+            yield 0, chunk
+
+    def clear(self):
+        self.cursors, self.review_ids = {}, set()
+        for path in (self.state_path, self.records_path):
+            if path.exists():
+                path.unlink()
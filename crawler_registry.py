@@ -0,0 +1,83 @@
+"""
+크롤러 등록부 (지연 로딩)
+크롤러는 이름과 "모듈:클래스" 경로로 등록하고, 처음 선택될 때 모듈을 불러옴
+(selenium처럼 무거운 의존성은 그 크롤러를 쓸 때만 로드됨)
+새 전송 방식은 register_crawler() 또는 설정의 crawlers.plugins로 스케줄러 수정 없이 추가
+"""
+import importlib
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Tuple
+
+class Crawler(Protocol):
+    """스케줄러가 기대하는 크롤러 인터페이스."""
+    review_endpoint: str
+
+    @classmethod
+    def from_config(cls, product_id: str, crawler_config: Dict, archive=None,
+                    browser_pool: Optional[Callable] = None, retry_policy=None) -> "Crawler":
+        """crawlers 설정으로 인스턴스를 만듭니다. archive(ResponseArchive)를 주면 응답 원문을 보관하고,
+        browser_pool은 공유 브라우저 풀을 돌려주는 함수입니다 (브라우저를 쓰는 크롤러만 호출).
+        retry_policy(RetryPolicy)를 주면 모든 재시도와 재시도 대기를 그 시간 예산 안에서만 합니다 (정상 페이지 수집은 끊지 않음)."""
+
+    def start(self) -> bool:
+        """수집 전에 필요한 자원(브라우저 등)을 준비합니다. 실패하면 False."""
+
+    def get_product_info(self) -> Tuple[Optional[str], Optional[str], Optional[int]]:
+        """(merchant_no, origin_product_no, 상태 코드)"""
+
+    def iter_review_pages(self, sort: str = ..., watermark=None, progress=None, checkpoint=None,
+                          workers: int = 1) -> Iterator[Tuple[int, List[Dict]]]:
+        """(페이지 번호, 레코드 목록)을 페이지 순서대로 돌려줍니다 (review_iterator.paginate_reviews 참고)."""
+
+    def crawl_reviews(self, on_page=None):
+        """리뷰를 모두 받아 DataFrame으로 돌려줍니다 (없으면 None)."""
+
+    def close(self) -> None:
+        """세션/브라우저 등 자원을 정리합니다."""
+
+BUILTIN_CRAWLERS = {
+    "stealth": "stealth_crawler:StealthNaverCrawler",
+    "selenium": "selenium_crawler:SeleniumNaverCrawler",
+    "mobile": "mobile_crawler:MobileNaverCrawler",
+    "advanced": "advanced_crawler:AdvancedNaverCrawler",
+}
+
+_registry = dict(BUILTIN_CRAWLERS)
+_loaded = {}
+_lock = threading.Lock()
+
+def register_crawler(name, target):
+    """크롤러를 등록합니다. target은 "모듈:클래스" 문자열(지연 로딩) 또는 클래스 자체입니다."""
+    with _lock:
+        _registry[name] = target
+        _loaded.pop(name, None)
+
+def register_plugins(plugins):
+    """설정의 {이름: "모듈:클래스"} 목록을 등록합니다."""
+    for name, target in (plugins or {}).items():
+        register_crawler(name, target)
+
+def crawler_names():
+    return list(_registry)
+
+def is_registered(name):
+    return name in _registry
+
+def get_crawler_class(name):
+    """등록된 크롤러 클래스를 돌려줍니다. 처음 요청될 때 모듈을 불러오며, 모듈을 불러오지 못하면 ImportError가 납니다."""
+    with _lock:
+        if name in _loaded:
+            return _loaded[name]
+        if name not in _registry:
+            raise KeyError(f"등록되지 않은 크롤러: {name}")
+        target = _registry[name]
+        if isinstance(target, str):
+            module_name, _, class_name = target.partition(":")
+            target = getattr(importlib.import_module(module_name), class_name)
+        _loaded[name] = target
+        return target
+
+def create_crawler(name, product_id, crawler_config=None, archive=None, browser_pool=None, retry_policy=None):
+    """이름으로 크롤러를 만들어 돌려줍니다 (인자는 Crawler.from_config 참고)."""
+    return get_crawler_class(name).from_config(product_id, crawler_config or {}, archive=archive, browser_pool=browser_pool,
+                                               retry_policy=retry_policy)
@@ -0,0 +1,122 @@
+"""
+크롤러별 성공률/소요 시간 통계와 시도 순서 자동 조정
+크롤러 × 상품마다 결과, 소요 시간, 초당 페이지 수를 지수 이동 평균으로 기록해 JSON으로 보관하고,
+기대 성공 소요 시간(한 번 시도하는 평균 시간 / 성공률)이 짧은 크롤러부터 시도하도록 순서를 바꿈
+통계가 없는 크롤러는 설정된 자리를 그대로 지킴
+
+사용법: python crawler_stats.py [--product 상품ID] [--order stealth selenium mobile advanced]
+"""
+import argparse
+import json
+import os
+import threading
+import logging
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_STATS_PATH = "crawler_stats.json"
+SMOOTHING = 0.3          # 최근 결과에 줄 가중치 (지수 이동 평균)
+MIN_PRODUCT_SAMPLES = 2  # 상품별 시도가 이보다 적으면 크롤러 전체 통계를 씁니다.
+MIN_SUCCESS_RATE = 0.05  # 연속 실패한 크롤러도 완전히 배제하지 않고 맨 뒤로만 보냅니다.
+
+def _ewma(previous, value):
+    return value if previous is None else previous + SMOOTHING * (value - previous)
+
+def _update_entry(entry, success, duration, pages, status_code):
+    entry['attempts'] = entry.get('attempts', 0) + 1
+    entry['successes'] = entry.get('successes', 0) + int(success)
+    entry['success_rate'] = _ewma(entry.get('success_rate'), 1.0 if success else 0.0)
+    key = 'avg_success_seconds' if success else 'avg_failure_seconds'
+    entry[key] = _ewma(entry.get(key), duration)
+    if success and pages and duration > 0:
+        entry['pages_per_sec'] = _ewma(entry.get('pages_per_sec'), pages / duration)
+    entry['last_status'] = status_code
+    entry['last_attempt'] = datetime.now().isoformat()
+
+def expected_seconds(entry):
+    """성공할 때까지 기대 소요 시간(초). 성공/실패 시간 중 모르는 쪽은 아는 쪽으로 대신합니다."""
+    rate = max(entry.get('success_rate') or 0.0, MIN_SUCCESS_RATE)
+    success_seconds = entry.get('avg_success_seconds') or entry.get('avg_failure_seconds') or 0.0
+    failure_seconds = entry.get('avg_failure_seconds') or entry.get('avg_success_seconds') or 0.0
+    return (rate * success_seconds + (1 - rate) * failure_seconds) / rate
+
+class CrawlerStats:
+    def __init__(self, path=DEFAULT_STATS_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                return {'crawlers': data.get('crawlers', {}), 'products': data.get('products', {})}
+            except Exception as e:
+                logging.warning(f"크롤러 통계 로드 실패, 비우고 시작합니다: {e}")
+        return {'crawlers': {}, 'products': {}}
+
+    def _save(self):
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def record(self, crawler_name, product_id, success, duration, pages=0, status_code=None):
+        """시도 한 번의 결과를 크롤러 전체 통계와 상품별 통계에 반영하고 저장합니다."""
+        with self._lock:
+            _update_entry(self._data['crawlers'].setdefault(crawler_name, {}), success, duration, pages, status_code)
+            product = self._data['products'].setdefault(str(product_id), {})
+            _update_entry(product.setdefault(crawler_name, {}), success, duration, pages, status_code)
+            self._save()
+
+    def entry_for(self, crawler_name, product_id=None):
+        """순서 결정에 쓸 통계: 상품별 시도가 충분하면 상품 통계, 아니면 크롤러 전체 통계 (없으면 None)."""
+        product_entry = self._data['products'].get(str(product_id), {}).get(crawler_name)
+        if product_entry and product_entry.get('attempts', 0) >= MIN_PRODUCT_SAMPLES:
+            return product_entry
+        return self._data['crawlers'].get(crawler_name)
+
+    def order(self, crawler_names, product_id=None):
+        """통계가 있는 크롤러끼리 기대 성공 소요 시간 순으로 자리를 바꿉니다. 통계가 없는 크롤러는 제자리에 둡니다."""
+        known = [name for name in crawler_names if self.entry_for(name, product_id)]
+        ranked = iter(sorted(known, key=lambda name: expected_seconds(self.entry_for(name, product_id))))
+        return [next(ranked) if name in known else name for name in crawler_names]
+
+    def snapshot(self, product_id=None):
+        """저장된 통계 사본 (product_id를 주면 그 상품의 크롤러별 통계만)."""
+        with self._lock:
+            data = json.loads(json.dumps(self._data))
+        return data if product_id is None else data['products'].get(str(product_id), {})
+
+    def report(self, product_id=None):
+        """크롤러별 통계 표 (product_id를 주면 그 상품 통계)를 문자열로 돌려줍니다."""
+        if product_id is None:
+            title, entries = "크롤러 전체 통계", self._data['crawlers']
+        else:
+            title, entries = f"상품 {product_id} 통계", self._data['products'].get(str(product_id), {})
+        if not entries:
+            return f"📊 {title}: 기록 없음"
+        lines = [f"📊 {title}",
+                 f"   {'크롤러':<10} {'시도':>5} {'성공':>5} {'성공률':>7} {'성공 시간':>9} {'실패 시간':>9} {'페이지/초':>9} {'기대 시간':>9}"]
+        for name, entry in sorted(entries.items(), key=lambda item: expected_seconds(item[1])):
+            def seconds(key):
+                return f"{entry[key]:.0f}s" if entry.get(key) is not None else "-"
+            pages_per_sec = f"{entry['pages_per_sec']:.2f}" if entry.get('pages_per_sec') is not None else "-"
+            lines.append(f"   {name:<10} {entry['attempts']:>5} {entry['successes']:>5} {entry['success_rate']:>7.0%} "
+                         f"{seconds('avg_success_seconds'):>9} {seconds('avg_failure_seconds'):>9} {pages_per_sec:>9} "
+                         f"{expected_seconds(entry):>8.0f}s")
+        return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="크롤러 통계 보기")
+    parser.add_argument("--stats-file", default=DEFAULT_STATS_PATH)
+    parser.add_argument("--product", help="상품별 통계와 그 상품의 시도 순서")
+    parser.add_argument("--order", nargs="+", default=["stealth", "selenium", "mobile", "advanced"], help="설정된 시도 순서")
+    args = parser.parse_args()
+
+    stats = CrawlerStats(args.stats_file)
+    print(stats.report())
+    if args.product:
+        print(stats.report(args.product))
+    print(f"🔀 시도 순서: {' → '.join(stats.order(args.order, args.product))}")
@@ -0,0 +1,78 @@
+"""
+MinHash + LSH 기반 유사 중복 리뷰 탐지
+"좋아요 잘 쓸게요"처럼 복사/템플릿 리뷰를 묶어 군집마다 대표 리뷰 하나만 분석하도록 함
+"""
+import re
+import zlib
+
+import numpy as np
+
+MERSENNE_PRIME = (1 << 31) - 1
+MAX_HASH = (1 << 32) - 1
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+SHINGLE_SIZE = 3
+_SIGNATURE_BATCH = 2000  # 한 번에 서명을 계산할 문서 수 (메모리 상한)
+
+_NORMALIZE = re.compile(r'[\s\W_]+')
+
+def _shingles(text, size):
+    text = _NORMALIZE.sub('', text.lower()) if isinstance(text, str) else ''
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def _choose_bands(num_perm, threshold):
+    """S-커브 임계값 (1/b)^(1/r)이 threshold에 가장 가까운 (밴드 수, 밴드당 행 수)를 고릅니다."""
+    candidates = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(candidates, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - threshold))
+
+def minhash_signatures(texts, num_perm=DEFAULT_NUM_PERM, shingle_size=SHINGLE_SIZE, seed=42):
+    """문서별 MinHash 서명 행렬 (문서 수 x num_perm)을 계산합니다."""
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+    b = rng.randint(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for start in range(0, len(texts), _SIGNATURE_BATCH):
+        batch = texts[start:start + _SIGNATURE_BATCH]
+        hashes, offsets = [], [0]
+        for text in batch:
+            doc_hashes = [zlib.crc32(s.encode('utf-8')) & MERSENNE_PRIME for s in _shingles(text, shingle_size)]
+            hashes.extend(doc_hashes)
+            offsets.append(offsets[-1] + len(doc_hashes))
+        # 모든 문서의 shingle 해시를 한 번에 순열 변환한 뒤 문서 구간별 최솟값을 취합니다.
+        permuted = (a * np.asarray(hashes, dtype=np.uint64)[None, :] + b) % MERSENNE_PRIME
+        signatures[start:start + len(batch)] = np.minimum.reduceat(permuted, offsets[:-1], axis=1).T
+    return signatures
+
+def find_near_duplicates(texts, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, shingle_size=SHINGLE_SIZE, seed=42):
+    """행마다 대표 행 번호를 돌려줍니다. 유사 중복 군집의 대표는 군집에서 가장 앞선 행입니다."""
+    texts = list(texts)
+    parent = np.arange(len(texts))
+    if len(texts) < 2:
+        return parent
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    signatures = minhash_signatures(texts, num_perm, shingle_size, seed)
+    bands, rows = _choose_bands(num_perm, threshold)
+    for band in range(bands):
+        buckets = {}
+        band_values = signatures[:, band * rows:(band + 1) * rows]
+        for i, key in enumerate(map(bytes, band_values)):
+            j = buckets.setdefault(key, i)
+            if j == i:
+                continue
+            root_i, root_j = find(i), find(j)
+            if root_i == root_j:
+                continue
+            # 같은 버킷에 들어온 후보 쌍은 추정 자카드 유사도로 한 번 더 확인합니다.
+            if np.mean(signatures[i] == signatures[j]) >= threshold:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    return np.array([find(i) for i in range(len(texts))])
@@ -365,7 +365,8 @@ class CrawlerGUI:
                     progress = 30 + (i * 15)
                     self.message_queue.put(('progress', progress, f'{crawler_name} 크롤러 시도 중...'))
                     
-                    result = self.scheduler._run_crawler(crawler_name, product_id)
+                    # _run_crawler는 (결과 파일, 상태 코드)를 돌려주므로 파일 경로만 꺼냅니다.
+                    result, _ = self.scheduler._run_crawler(crawler_name, product_id)
                     if result:
                         self.message_queue.put(('log', f'{crawler_name} 크롤러 성공'))
                         break
@@ -378,7 +379,7 @@ class CrawlerGUI:
                     time.sleep(5)
             else:
                 # 특정 크롤러
-                result = self.scheduler._run_crawler(job['crawler'], product_id)
+                result, _ = self.scheduler._run_crawler(job['crawler'], product_id)
             
             # VPN 해제
             if job['use_vpn']:
@@ -569,6 +570,8 @@ class CrawlerGUI:
                         result = self.scheduler.crawl_product(product)
                         if result:
                             result_log.insert(tk.END, f"✅ {product['name']} 성공: {result}\n")
+                        elif product.get('partial_result'):
+                            result_log.insert(tk.END, f"⚠️ {product['name']} 실패 (부분 결과만 저장): {product['partial_result']}\n")
                         else:
                             result_log.insert(tk.END, f"❌ {product['name']} 실패\n")
                     except Exception as e:
@@ -0,0 +1,114 @@
+"""
+프로세스 전체가 공유하는 HTTP 연결 풀
+크롤러 인스턴스마다 새 Session/HTTPAdapter를 만들면 상품마다 DNS/TCP/TLS 연결을 다시 맺으므로,
+urllib3 연결 풀 하나를 모든 크롤러 세션이 나눠 쓰게 하고 (재시도 정책은 세션별로 유지)
+요청 수 대비 새 연결 수로 연결 재사용률을 보고함
+비동기 엔진(httpx)은 h2 패키지가 있으면 설정에 따라 HTTP/2 다중화를 사용
+"""
+import threading
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter, DEFAULT_POOLBLOCK
+
+try:
+    import h2  # noqa: F401 (httpx의 HTTP/2 지원에 필요)
+    H2_AVAILABLE = True
+except ImportError:
+    H2_AVAILABLE = False
+
+DEFAULT_POOL_CONNECTIONS = 10  # 연결 풀을 유지할 호스트 수
+DEFAULT_POOL_MAXSIZE = 20      # 호스트당 유지할 keep-alive 연결 수 (병렬 페이지 작업자 수 이상)
+
+class SharedPoolAdapter(HTTPAdapter):
+    """공유 연결 풀을 쓰는 어댑터. 세션을 닫아도 풀은 닫지 않습니다."""
+    def __init__(self, transport, max_retries=0):
+        self._transport = transport
+        super().__init__(pool_connections=transport.pool_connections, pool_maxsize=transport.pool_maxsize,
+                         max_retries=max_retries)
+
+    def init_poolmanager(self, connections, maxsize, block=DEFAULT_POOLBLOCK, **pool_kwargs):
+        self.poolmanager = self._transport.poolmanager
+
+    def close(self):
+        # 공유 풀은 HttpTransport.close()에서만 정리하고, 이 어댑터의 프록시 연결만 닫습니다.
+        for proxy in self.proxy_manager.values():
+            proxy.clear()
+
+class HttpTransport:
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        # 기본 HTTPAdapter가 만드는 것과 같은 PoolManager를 한 번만 만들어 둡니다.
+        self.poolmanager = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize).poolmanager
+        self.sessions_created = 0
+
+    def adapter(self, max_retries=0):
+        """공유 풀 위에서 동작하는 어댑터 (재시도 정책은 어댑터마다 따로 둡니다)."""
+        return SharedPoolAdapter(self, max_retries)
+
+    def session(self, max_retries=0):
+        """공유 풀을 쓰는 새 Session."""
+        session = requests.Session()
+        adapter = self.adapter(max_retries)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.sessions_created += 1
+        return session
+
+    def stats(self):
+        """호스트별 요청 수와 새로 맺은 연결 수, 전체 연결 재사용률."""
+        hosts = {}
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = hosts.setdefault(f"{key.key_scheme}://{key.key_host}", {'requests': 0, 'connections': 0})
+            host['requests'] += pool.num_requests
+            host['connections'] += pool.num_connections
+        total_requests = sum(host['requests'] for host in hosts.values())
+        total_connections = sum(host['connections'] for host in hosts.values())
+        reuse_rate = 1 - total_connections / total_requests if total_requests else None
+        return {'sessions': self.sessions_created, 'requests': total_requests, 'connections': total_connections,
+                'reuse_rate': reuse_rate, 'hosts': hosts}
+
+    def log_stats(self):
+        stats = self.stats()
+        if not stats['requests']:
+            return
+        logging.info(f"🔌 HTTP 연결 재사용: 요청 {stats['requests']}회 / 새 연결 {stats['connections']}개 "
+                     f"(재사용률 {stats['reuse_rate']:.0%}, 세션 {stats['sessions']}개)")
+
+    def close(self):
+        self.poolmanager.clear()
+
+_transport = None
+_transport_config = {}
+_transport_lock = threading.Lock()
+
+def configure_transport(transport_config):
+    """설정 파일의 pool_connections/pool_maxsize를 적용합니다. 이미 만든 풀은 닫고 다음 요청부터 새 크기로 만듭니다."""
+    global _transport
+    with _transport_lock:
+        _transport_config.clear()
+        _transport_config.update({key: value for key, value in (transport_config or {}).items()
+                                  if key in ('pool_connections', 'pool_maxsize', 'http2')})
+        if _transport_config.get('http2') and not H2_AVAILABLE:
+            logging.warning("⚠️ h2 패키지가 없어 HTTP/1.1을 사용합니다 (pip install httpx[http2]).")
+        if _transport is not None:
+            _transport.close()
+            _transport = None
+
+def get_transport():
+    """프로세스에서 공유하는 HTTP 연결 풀."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HttpTransport(_transport_config.get('pool_connections', DEFAULT_POOL_CONNECTIONS),
+                                       _transport_config.get('pool_maxsize', DEFAULT_POOL_MAXSIZE))
+        return _transport
+
+def http2_enabled():
+    """비동기 클라이언트에서 HTTP/2를 쓸지 (설정에서 켰고 h2가 설치된 경우)."""
+    return bool(_transport_config.get('http2')) and H2_AVAILABLE
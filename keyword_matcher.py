@@ -0,0 +1,51 @@
+"""
+Aho-Corasick 다중 키워드 매처
+키워드 집합을 한 번 오토마톤으로 컴파일해 두고 텍스트를 한 번만 훑어 포함된 키워드를 모두 찾음
+"""
+from collections import deque
+
+class AhoCorasick:
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self._delta = [{}]      # 상태별 문자 전이 (실패 링크를 미리 반영한 DFA)
+        self._outputs = [()]    # 상태에 도달했을 때 끝나는 패턴 번호들
+        self._build()
+
+    def _build(self):
+        goto, fail = [{}], [0]
+        outputs = [[]]
+        for idx, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                if ch not in goto[state]:
+                    goto.append({}); fail.append(0); outputs.append([])
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].append(idx)
+
+        # BFS로 실패 링크를 계산하고, 루트에서 나가는 전이를 기본값으로 하는 DFA 전이표를 만듭니다.
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())  # 루트 자식의 실패 링크는 루트(0)
+        while queue:
+            state = queue.popleft()
+            outputs[state].extend(outputs[fail[state]])
+            transitions = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                transitions[ch] = nxt
+                queue.append(nxt)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def find_all(self, text):
+        """텍스트에 포함된 패턴 번호 집합을 돌려줍니다."""
+        found = set()
+        delta, outputs = self._delta, self._outputs
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
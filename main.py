@@ -1,11 +1,13 @@
 import requests
-import pandas as pd
 import json
 import time
 import random
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from analysis import analyze_sentiment, topic_modeling
+from review_pipeline import StreamingReviewAnalyzer
+from summary_cache import get_summary_cache
+from review_buffer import ReviewBuffer
+from pacing import get_pacer
+from http_transport import get_transport
 
 # --- 설정 부분 ---
 PRODUCT_ID = "5753732771"
@@ -25,14 +27,13 @@ USER_AGENTS = [
 PROXIES = []
 
 def get_session_with_retry():
-    session = requests.Session()
     retry_strategy = Retry(
         total=3,
         backoff_factor=1,
         status_forcelist=[429, 500, 502, 503, 504]
     )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
+    session = get_transport().session(retry_strategy)
+    session.hooks['response'].append(get_pacer("main").record_response)
     return session
     
 def get_random_headers(product_id):
@@ -46,20 +47,18 @@ def get_random_headers(product_id):
         "Upgrade-Insecure-Requests": "1"
     }
 
-def random_delay(min_delay=2, max_delay=5):
-    delay = random.uniform(min_delay, max_delay)
-    time.sleep(delay)
+def pace_request():
+    """응답 상태에 맞춰 조정되는 요청 간격만큼 기다립니다 (pacing 참고)."""
+    get_pacer("main").wait()
 
-def crawl_reviews(product_id):
-    """지정된 상품 ID의 모든 리뷰를 크롤링합니다."""
-    all_reviews = []
-    page = 1
-    session = get_session_with_retry()
-    
+def fetch_product_info(session, product_id):
+    """summary API로 (merchant_no, origin_product_no, 상태 코드)를 조회합니다."""
+    status_code = None
     print("상품 정보를 가져오는 중...")
     try:
         info_url = f"https://smartstore.naver.com/i/v1/products/{product_id}/summary"
         info_res = session.get(info_url, headers=get_random_headers(product_id), timeout=10)
+        status_code = info_res.status_code
         info_res.raise_for_status() # 오류 발생 시 예외 발생
         
         product_info = info_res.json()
@@ -69,12 +68,23 @@ def crawl_reviews(product_id):
 
         if not merchant_no or not origin_product_no:
             print("상품 정보(merchant_no, origin_product_no)를 찾을 수 없습니다.")
-            return None
+            return None, None, status_code
         
         print(f"Merchant No: {merchant_no}, Origin Product No: {origin_product_no}")
 
     except (requests.exceptions.RequestException, json.JSONDecodeError, KeyError) as e:
         print(f"상품 정보 획득 실패: {e}")
+        return None, None, status_code
+    return merchant_no, origin_product_no, status_code
+
+def crawl_reviews(product_id, on_page=None):
+    """지정된 상품 ID의 모든 리뷰를 크롤링합니다."""
+    reviews_buffer = ReviewBuffer()
+    page = 1
+    session = get_session_with_retry()
+    
+    merchant_no, origin_product_no, _ = get_summary_cache().resolve(product_id, lambda: fetch_product_info(session, product_id), source='main')
+    if not merchant_no or not origin_product_no:
         return None
 
     while True:
@@ -93,11 +103,12 @@ def crawl_reviews(product_id):
                 print("더 이상 리뷰가 없습니다. 크롤링을 종료합니다.")
                 break
 
+            page_reviews = []
             for review in reviews:
                 option_contents = review.get('productOptionContents', [])
                 option_text = " / ".join([opt.get('optionContent', '') for opt in option_contents])
                 
-                all_reviews.append({
+                page_reviews.append({
                     'id': review.get('id'),
                     'rating': review.get('reviewScore'),
                     'writer': review.get('writerMemberId'),
@@ -105,12 +116,16 @@ def crawl_reviews(product_id):
                     'content': review.get('reviewContent', ''),
                     'option': option_text,
                 })
+            reviews_buffer.extend(page_reviews)
+            if on_page:
+                on_page(page_reviews)
             
-            print(f"{page} 페이지의 리뷰 {len(reviews)}건을 가져왔습니다. (총 {len(all_reviews)}건)")
+            print(f"{page} 페이지의 리뷰 {len(reviews)}건을 가져왔습니다. (총 {len(reviews_buffer)}건)")
             page += 1
-            random_delay(2, 5)
+            pace_request()
 
         except requests.exceptions.RequestException as e:
+            get_pacer("main").record_exception(e)
             print(f"네트워크 오류: {e}, 30초 후 재시도합니다.")
             time.sleep(30)
             continue
@@ -118,21 +133,20 @@ def crawl_reviews(product_id):
             print("JSON 파싱 오류가 발생했습니다.")
             break
             
-    return pd.DataFrame(all_reviews)
+    return reviews_buffer.to_frame()
 
 if __name__ == '__main__':
-    review_df = crawl_reviews(PRODUCT_ID)
+    positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른', '편하고', '예뻐요', '가볍고', '튼튼', '잘', '맘에']
+    negative_keywords = ['불편', '별로', '실망', '아쉬', '불만', '느린', '무거', '약한', '문제', '고장']
+    analyzer = StreamingReviewAnalyzer(positive_keywords, negative_keywords)
+    review_df = crawl_reviews(PRODUCT_ID, on_page=analyzer.submit_page)
 
     if review_df is not None and not review_df.empty:
-        positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른', '편하고', '예뻐요', '가볍고', '튼튼', '잘', '맘에']
-        negative_keywords = ['불편', '별로', '실망', '아쉬', '불만', '느린', '무거', '약한', '문제', '고장']
-        
-        review_df['sentiment'] = review_df['content'].apply(lambda x: analyze_sentiment(x, positive_keywords, negative_keywords))
+        print("\n--- 토픽 모델링 결과 ---")
+        review_df = analyzer.finish(review_df, NUM_TOPICS, product_id=PRODUCT_ID)
+
         print("\n--- 감성 분석 결과 ---")
         print(review_df['sentiment'].value_counts())
-        
-        print("\n--- 토픽 모델링 결과 ---")
-        review_df = topic_modeling(review_df, NUM_TOPICS)
 
         review_df.to_csv(OUTPUT_FILE_NAME, index=False, encoding='utf-8-sig')
         print(f"\n분석이 완료되었으며, 결과가 '{OUTPUT_FILE_NAME}' 파일로 저장되었습니다.")
@@ -3,16 +3,15 @@
 모바일 앱 API 엔드포인트를 활용하여 차단 우회
 """
 import requests
-import pandas as pd
-import json
-import time
 import random
-import uuid
-import re
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from retry_policy import RetryPolicy
 from urllib3.exceptions import InsecureRequestWarning
-from analysis import analyze_sentiment, topic_modeling
+from review_iterator import paginate_reviews, collect_reviews, SORT_RANKING, ENDPOINT_MOBILE_REVIEWS
+from review_pipeline import StreamingReviewAnalyzer
+from summary_cache import get_summary_cache
+from pacing import get_pacer
+from http_transport import get_transport
+from response_archive import install_archive, install_replay
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -33,21 +32,41 @@ MOBILE_ENDPOINTS = {
 }
 
 class MobileNaverCrawler:
-    def __init__(self, product_id):
+    review_endpoint = ENDPOINT_MOBILE_REVIEWS
+
+    def __init__(self, product_id, archive=None, replay_archive=None, retry_policy=None):
+        """archive(ResponseArchive)를 주면 받은 응답 원문을 보관하고, replay_archive를 주면 네트워크 대신 아카이브로 응답합니다.
+        retry_policy(RetryPolicy)의 시간 예산 안에서만 재시도합니다 (정상 응답하는 페이지 수집은 예산과 무관)."""
         self.product_id = product_id
+        self.product_info = None
+        self.replay = replay_archive is not None
+        self.pacer = get_pacer("mobile")
+        self.retry_policy = retry_policy or RetryPolicy()
         self.session = self._create_mobile_session()
+        if archive is not None:
+            install_archive(self.session, archive)
+        if replay_archive is not None:
+            install_replay(self.session, replay_archive)
         self.request_count = 0
-        
+
+    @classmethod
+    def from_config(cls, product_id, crawler_config, archive=None, browser_pool=None, retry_policy=None):
+        """스케줄러용 생성자 (crawler_registry.Crawler 참고)."""
+        return cls(product_id, archive=archive, retry_policy=retry_policy)
+
+    def start(self):
+        return True
+
     def _create_mobile_session(self):
-        session = requests.Session()
-        retry_strategy = Retry(
+        retry_strategy = self.retry_policy.urllib3_retry(
             total=8, backoff_factor=2,
             status_forcelist=[403, 429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=15, pool_maxsize=30)
-        session.mount("https://", adapter)
+        # 상품/크롤러가 바뀌어도 연결을 다시 맺지 않도록 프로세스 공유 연결 풀을 씁니다.
+        session = get_transport().session(retry_strategy)
         session.verify = False
+        session.hooks['response'].append(self.pacer.record_response)
         return session
     
     def _get_mobile_headers(self, referer_url=None):
@@ -60,16 +79,25 @@ class MobileNaverCrawler:
         return headers
 
     def _mobile_delay(self):
-        delay = random.uniform(1.5, 4.0)
-        print(f"📱 {delay:.2f}초 대기...")
-        time.sleep(delay)
+        if self.replay:
+            return
+        delay = self.pacer.wait()
+        print(f"📱 {delay:.2f}초 대기 (현재 {self.pacer.rate:.2f} req/s)")
         self.request_count += 1
     
-    def get_product_info_mobile(self):
+    def get_product_info(self):
+        """상품 정보(merchant_no, origin_product_no, 상태 코드). 요약 캐시에 있으면 요청하지 않습니다."""
+        if self.product_info is None:
+            self.product_info = get_summary_cache().resolve(self.product_id, self._fetch_product_info_mobile, source='mobile')
+        return self.product_info
+
+    def _fetch_product_info_mobile(self):
         print("📱 모바일 API로 상품 정보 수집 중...")
         url = MOBILE_ENDPOINTS['product_summary'].format(product_id=self.product_id)
+        status_code = None
         try:
-            response = self.session.get(url, headers=self._get_mobile_headers(), timeout=20)
+            response = self.session.get(url, headers=self._get_mobile_headers(), timeout=self.retry_policy.timeout(20))
+            status_code = response.status_code
             response.raise_for_status()
             data = response.json()
             
@@ -79,73 +107,64 @@ class MobileNaverCrawler:
             
             if merchant_no and origin_product_no:
                 print(f"✅ 정보 획득 성공! Merchant No: {merchant_no}, Product No: {origin_product_no}")
-                return merchant_no, origin_product_no
+                return merchant_no, origin_product_no, status_code
             else:
                 print("❌ 응답에서 상품 정보를 찾을 수 없습니다.")
-                return None, None
+                return None, None, status_code
         except Exception as e:
             print(f"❌ 모바일 API 상품 정보 수집 실패: {e}")
-            return None, None
+            return None, None, status_code
 
-    def crawl_reviews_mobile(self):
-        merchant_no, origin_product_no = self.get_product_info_mobile()
-        if not merchant_no or not origin_product_no:
+    def _fetch_review_page(self, origin_product_no, page, sort=SORT_RANKING):
+        try:
+            self._mobile_delay()
+            url = MOBILE_ENDPOINTS['reviews_v1'].format(product_id=origin_product_no) + f"?page={page}&size=20"
+            if sort != SORT_RANKING:
+                # 이 엔드포인트가 정렬 인자를 지키는지는 보장되지 않으므로, 증분 수집 시 최신순 여부는 paginate_reviews가 확인합니다.
+                url += f"&sort={sort}"
+            headers = self._get_mobile_headers(referer_url=f"https://m.smartstore.naver.com/products/{origin_product_no}")
+            
+            response = self.session.get(url, headers=headers, timeout=25)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            self.pacer.record_exception(e)
+            print(f"❌ 페이지 {page} 처리 중 오류: {e}. 크롤링을 중단합니다.")
             return None
-        
-        all_reviews = []
-        page = 1
+
+    def iter_review_pages(self, sort=SORT_RANKING, watermark=None, progress=None, checkpoint=None, workers=1):
+        """리뷰를 페이지 단위로 (페이지 번호, 레코드 목록)씩 돌려줍니다. 인자는 paginate_reviews 참고."""
+        merchant_no, origin_product_no, _ = self.get_product_info()
+        if not merchant_no or not origin_product_no:
+            return
         print("📱 모바일 API로 리뷰 크롤링 시작...")
+        yield from paginate_reviews(lambda page: self._fetch_review_page(origin_product_no, page, sort),
+                                    watermark=watermark, progress=progress,
+                                    checkpoint=checkpoint, endpoint=self.review_endpoint, workers=workers)
 
-        while True:
-            try:
-                self._mobile_delay()
-                url = MOBILE_ENDPOINTS['reviews_v1'].format(product_id=origin_product_no) + f"?page={page}&size=20"
-                headers = self._get_mobile_headers(referer_url=f"https://m.smartstore.naver.com/products/{origin_product_no}")
-                
-                response = self.session.get(url, headers=headers, timeout=25)
-                response.raise_for_status()
-                data = response.json()
-                
-                reviews = data.get('contents', [])
-                if not reviews:
-                    print(f"✅ 모든 리뷰 수집 완료 (총 {len(all_reviews)}개)")
-                    break
-                
-                for review in reviews:
-                    option_contents = review.get('productOptionContents', [])
-                    option_text = " / ".join([opt.get('optionContent', '') for opt in option_contents])
-                    all_reviews.append({
-                        'id': review.get('id'),
-                        'rating': review.get('reviewScore'),
-                        'writer': review.get('writerMemberId'),
-                        'date': review.get('createDate'),
-                        'content': review.get('reviewContent', ''),
-                        'option': option_text,
-                    })
-                
-                print(f"📄 페이지 {page}: {len(reviews)}개 리뷰 수집 (총 {len(all_reviews)}개)")
-                page += 1
-            
-            except Exception as e:
-                print(f"❌ 페이지 {page} 처리 중 오류: {e}. 크롤링을 중단합니다.")
-                break
+    def crawl_reviews(self, on_page=None):
+        return collect_reviews(self.iter_review_pages(), on_page)
 
-        return pd.DataFrame(all_reviews) if all_reviews else None
+    def close(self):
+        self.session.close()
+
+    # 이전 메서드 이름 호환
+    get_product_info_mobile = get_product_info
+    crawl_reviews_mobile = crawl_reviews
 
 if __name__ == '__main__':
     print("📱 === 모바일 네이버 크롤러 시작 ===")
     print(f"🎯 타겟 상품: {PRODUCT_ID}")
     
+    positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른', '편하고', '예뻐요']
+    negative_keywords = ['불편', '별로', '실망', '아쉬', '불만', '느린', '무거']
+    analyzer = StreamingReviewAnalyzer(positive_keywords, negative_keywords)
     crawler = MobileNaverCrawler(PRODUCT_ID)
-    review_df = crawler.crawl_reviews_mobile()
+    review_df = crawler.crawl_reviews(on_page=analyzer.submit_page)
     
     if review_df is not None and not review_df.empty:
-        print("\n📊 === 데이터 분석 시작 ===")
-        positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른', '편하고', '예뻐요']
-        negative_keywords = ['불편', '별로', '실망', '아쉬', '불만', '느린', '무거']
-        
-        review_df['sentiment'] = review_df['content'].apply(lambda x: analyze_sentiment(x, positive_keywords, negative_keywords))
-        review_df = topic_modeling(review_df, NUM_TOPICS)
+        print("\n📊 === 데이터 분석 마무리 (토픽 학습) ===")
+        review_df = analyzer.finish(review_df, NUM_TOPICS, product_id=PRODUCT_ID)
         
         review_df.to_csv(OUTPUT_FILE_NAME, index=False, encoding='utf-8-sig')
         print(f"\n✅ 분석 완료! 결과가 '{OUTPUT_FILE_NAME}' 파일로 저장되었습니다.")
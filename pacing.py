@@ -0,0 +1,129 @@
+"""
+응답 기반 적응형 요청 간격 제어 (AIMD)
+고정된 무작위 대기 대신, 정상 응답이 이어지면 요청 속도를 조금씩 올리고(가산 증가)
+429/403/5xx/네트워크 오류나 느린 응답이 오면 속도를 크게 줄임(승산 감소)
+간격은 크롤러별 최소/최대 범위 안에서만 움직이며 현재 속도는 주기적으로 로그에 남김
+"""
+import random
+import threading
+import time
+import logging
+from collections import deque
+
+# 크롤러별 기본 (최소 간격, 최대 간격, 시작 간격) 초. 기존 고정 대기 범위를 시작점으로 삼았습니다.
+PACING_PROFILES = {
+    "advanced": {"min_delay": 0.5, "max_delay": 15.0, "initial_delay": 3.5},
+    "main": {"min_delay": 0.5, "max_delay": 15.0, "initial_delay": 3.5},
+    "mobile": {"min_delay": 0.5, "max_delay": 12.0, "initial_delay": 2.75},
+    "stealth": {"min_delay": 2.0, "max_delay": 30.0, "initial_delay": 8.5},
+    "selenium": {"min_delay": 1.0, "max_delay": 15.0, "initial_delay": 3.5},
+}
+THROTTLE_STATUS = {403, 429}
+LOG_EVERY = 20
+
+class PacingController:
+    def __init__(self, name, min_delay=0.5, max_delay=15.0, initial_delay=3.0, rate_step=0.05, backoff=0.5,
+                 slow_latency=3.0, jitter=0.2, window=50):
+        """rate_step: 정상 응답마다 올릴 초당 요청 수, backoff: 오류 시 속도에 곱할 비율, slow_latency: 이보다 느린 응답은 혼잡 신호."""
+        self.name = name
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.rate_step = rate_step
+        self.backoff = backoff
+        self.slow_latency = slow_latency
+        self.jitter = jitter
+        self.delay = min(max(initial_delay, min_delay), max_delay)
+        self._not_before = 0.0
+        self._next_slot = 0.0
+        self._outcomes = deque(maxlen=window)
+        self._latencies = deque(maxlen=window)
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return 1.0 / self.delay
+
+    def error_rate(self):
+        return self._outcomes.count(False) / len(self._outcomes) if self._outcomes else 0.0
+
+    def wait(self, slots=1):
+        """다음 요청 전까지 현재 간격(± jitter)만큼 기다리고, 기다린 초를 돌려줍니다.
+        여러 스레드가 같은 제어기를 쓰면 요청 시각을 차례로 예약해 합계 속도가 현재 속도를 넘지 않습니다.
+        요청 여러 개를 한꺼번에 보낼 때는 slots에 그 수를 주면 자리를 그만큼 예약하고 마지막 자리까지 기다립니다."""
+        with self._lock:
+            now = time.monotonic()
+            delay = self.delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            start_at = max(now + delay, self._not_before, self._next_slot) + self.delay * (slots - 1)
+            self._next_slot = start_at + self.delay
+            delay = start_at - now
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+    def record(self, latency=None, status_code=None, error=False, retry_after=None):
+        """요청 결과를 반영해 간격을 조정합니다."""
+        congested = error or status_code in THROTTLE_STATUS or (status_code is not None and status_code >= 500)
+        with self._lock:
+            if congested:
+                self.delay = min(self.max_delay, 1.0 / (self.rate * self.backoff))
+                if retry_after:
+                    self._not_before = time.monotonic() + retry_after
+            elif latency is not None and latency > self.slow_latency:
+                # 느려지기 시작하면 오류가 나기 전에 조금 물러섭니다.
+                self.delay = min(self.max_delay, self.delay * 1.25)
+            else:
+                self.delay = max(self.min_delay, 1.0 / (self.rate + self.rate_step))
+            self._outcomes.append(not congested)
+            if latency is not None:
+                self._latencies.append(latency)
+            self._requests += 1
+            should_log = congested or self._requests % LOG_EVERY == 0
+        if should_log:
+            self.log_state(status_code if congested else None)
+
+    def record_response(self, response, *args, **kwargs):
+        """requests 응답 훅. session.hooks['response']에 등록하면 모든 응답이 자동으로 반영됩니다."""
+        retry_after = response.headers.get('Retry-After') if response.status_code == 429 else None
+        try:
+            retry_after = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after = None
+        self.record(response.elapsed.total_seconds(), response.status_code, retry_after=retry_after)
+        return response
+
+    def record_exception(self, exc):
+        """연결/타임아웃/재시도 소진처럼 응답 훅에 잡히지 않는 requests 오류만 반영합니다."""
+        from requests.exceptions import RequestException, HTTPError
+        if isinstance(exc, RequestException) and not isinstance(exc, HTTPError):
+            self.record(error=True)
+
+    def log_state(self, status_code=None):
+        avg_latency = sum(self._latencies) / len(self._latencies) if self._latencies else 0.0
+        reason = f" ← {status_code}" if status_code else ""
+        logging.info(f"⏱️ [{self.name}] 요청 간격 {self.delay:.2f}초 ({self.rate:.2f} req/s), "
+                     f"평균 응답 {avg_latency:.2f}초, 오류율 {self.error_rate():.0%}{reason}")
+
+_pacers = {}
+_overrides = {}
+_pacers_lock = threading.Lock()
+
+def configure_pacing(pacing_config):
+    """설정 파일의 crawler별 pacing 범위로 기본값을 덮어씁니다 (이미 만든 제어기에도 적용)."""
+    with _pacers_lock:
+        for name, values in (pacing_config or {}).items():
+            _overrides[name] = dict(values)
+            pacer = _pacers.get(name)
+            if pacer is not None:
+                pacer.min_delay = values.get('min_delay', pacer.min_delay)
+                pacer.max_delay = values.get('max_delay', pacer.max_delay)
+                pacer.delay = min(max(pacer.delay, pacer.min_delay), pacer.max_delay)
+
+def get_pacer(name):
+    """크롤러 이름별로 프로세스에서 공유하는 제어기. 재시도/새 인스턴스도 이전 속도에서 이어갑니다."""
+    with _pacers_lock:
+        if name not in _pacers:
+            settings = dict(PACING_PROFILES.get(name, {}))
+            settings.update(_overrides.get(name, {}))
+            _pacers[name] = PacingController(name, **settings)
+        return _pacers[name]
@@ -0,0 +1,218 @@
+"""
+원본 응답 아카이브 / 오프라인 재생 / 재파싱
+크롤러 세션에 어댑터로 끼워 API 응답 원문을 gzip으로 압축해 내용 해시로 저장하고,
+같은 (엔드포인트, 파라미터) 요청을 네트워크 없이 아카이브에서 돌려주거나
+아카이브만으로 결과 CSV를 다시 만들 수 있게 함 (새 필드를 뽑을 때 재크롤링 불필요)
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from review_iterator import parse_review, ReviewCsvWriter
+
+DEFAULT_ARCHIVE_DIR = "crawl_results/.archive"
+
+SUMMARY_PATH = re.compile(r"/products/(\d+)/summary$")
+REVIEWS_PATH = re.compile(r"/products/(\d+)/reviews(?:/writable-reviews)?$")
+
+def request_key(url):
+    """URL을 (엔드포인트, 정렬된 쿼리 파라미터)로 정규화합니다."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}", tuple(sorted(parse_qsl(parts.query)))
+
+class ResponseArchive:
+    def __init__(self, base_dir=DEFAULT_ARCHIVE_DIR):
+        self.base_dir = Path(base_dir)
+        self.objects_dir = self.base_dir / "objects"
+        self.index_path = self.base_dir / "index.jsonl"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._latest = {}
+        self._load_index()
+
+    def _load_index(self):
+        for entry in self.iter_entries():
+            self._latest[(entry['endpoint'], tuple(map(tuple, entry['params'])))] = entry
+
+    def _object_path(self, content_hash):
+        return self.objects_dir / content_hash[:2] / f"{content_hash}.json.gz"
+
+    def put(self, url, status_code, content):
+        """응답 원문을 저장합니다. 같은 내용은 한 번만 저장되고 색인에는 요청마다 한 줄이 추가됩니다."""
+        endpoint, params = request_key(url)
+        content_hash = hashlib.sha256(content).hexdigest()
+        object_path = self._object_path(content_hash)
+        entry = {'endpoint': endpoint, 'params': [list(p) for p in params], 'status_code': status_code,
+                 'hash': content_hash, 'fetched_at': datetime.now().isoformat()}
+        with self._lock:
+            if not object_path.exists():
+                object_path.parent.mkdir(exist_ok=True)
+                with gzip.open(object_path, 'wb') as f:
+                    f.write(content)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._latest[(endpoint, params)] = entry
+        return content_hash
+
+    def lookup(self, url):
+        """같은 요청의 가장 최근 색인 항목 (없으면 None)."""
+        return self._latest.get(request_key(url))
+
+    def read(self, content_hash):
+        with gzip.open(self._object_path(content_hash), 'rb') as f:
+            return f.read()
+
+    def iter_entries(self):
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def latest_entries(self):
+        return list(self._latest.values())
+
+def _build_response(request, status_code, content):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers = CaseInsensitiveDict({'Content-Type': 'application/json;charset=UTF-8'})
+    response.encoding = 'utf-8'
+    response.url = request.url
+    response.request = request
+    response.reason = "OK" if status_code == 200 else "Archived"
+    return response
+
+class ArchivingAdapter(BaseAdapter):
+    """기존 어댑터(재시도 설정 포함)로 요청을 보내고 받은 응답 원문을 아카이브에 남깁니다."""
+    def __init__(self, inner, archive):
+        super().__init__()
+        self.inner = inner
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        response = self.inner.send(request, **kwargs)
+        try:
+            self.archive.put(request.url, response.status_code, response.content)
+        except Exception as e:
+            print(f"⚠️  응답 아카이브 저장 실패: {e}")
+        return response
+
+    def close(self):
+        self.inner.close()
+
+class ReplayAdapter(BaseAdapter):
+    """네트워크 대신 아카이브에서 응답을 돌려줍니다. 아카이브에 없는 요청은 404로 응답합니다."""
+    def __init__(self, archive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        entry = self.archive.lookup(request.url)
+        if entry is None:
+            return _build_response(request, 404, b'{}')
+        return _build_response(request, entry['status_code'], self.archive.read(entry['hash']))
+
+    def close(self):
+        pass
+
+def install_archive(session, archive):
+    """세션에 마운트된 어댑터들을 아카이브 어댑터로 감쌉니다."""
+    for prefix, adapter in list(session.adapters.items()):
+        if not isinstance(adapter, ArchivingAdapter):
+            session.mount(prefix, ArchivingAdapter(adapter, archive))
+    return session
+
+def install_replay(session, archive):
+    """세션이 네트워크 대신 아카이브에서 응답을 받도록 합니다."""
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, ReplayAdapter(archive))
+    return session
+
+def reparse(archive, output_dir, product_ids=None):
+    """아카이브의 리뷰 응답만으로 상품별 결과 CSV를 다시 만듭니다. 만든 파일 경로 목록을 돌려줍니다."""
+    # summary 응답으로 상품 id ↔ 원상품 번호를 잇습니다.
+    product_of = {}
+    for entry in archive.latest_entries():
+        match = SUMMARY_PATH.search(urlsplit(entry['endpoint']).path)
+        if match and entry['status_code'] == 200:
+            data = json.loads(archive.read(entry['hash']))
+            product_data = data.get('product') or data.get('data') or {}
+            if product_data.get('productNo'):
+                product_of[str(product_data['productNo'])] = match.group(1)
+
+    groups = {}
+    for entry in archive.latest_entries():
+        match = REVIEWS_PATH.search(urlsplit(entry['endpoint']).path)
+        if not match or entry['status_code'] != 200:
+            continue
+        params = dict(entry['params'])
+        product_id = product_of.get(match.group(1), match.group(1))
+        if product_ids and product_id not in product_ids:
+            continue
+        group = groups.setdefault((product_id, entry['endpoint'], params.get('sort', '')), {})
+        group[int(params.get('page', 1))] = entry['hash']
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    written = {}
+    for (product_id, endpoint, sort), pages in sorted(groups.items()):
+        # 같은 상품을 여러 엔드포인트/정렬로 받았다면 리뷰 id로 합칩니다.
+        if product_id not in written:
+            output_file = output_dir / f"{product_id}_{timestamp}_reparsed.csv"
+            written[product_id] = (ReviewCsvWriter(output_file), set())
+        writer, seen_ids = written[product_id]
+        for page in sorted(pages):
+            data = json.loads(archive.read(pages[page]))
+            records = [parse_review(review) for review in data.get('contents', [])]
+            records = [record for record in records if str(record['id']) not in seen_ids]
+            seen_ids.update(str(record['id']) for record in records)
+            writer.write(records)
+
+    paths = []
+    for product_id, (writer, _) in written.items():
+        count = writer.close()
+        if count:
+            print(f"💾 {product_id}: {count}개 리뷰 재생성 → {writer.output_file}")
+            paths.append(str(writer.output_file))
+    return paths
+
+def replay_crawl(archive, product_id, crawler_name, output_file):
+    """크롤러를 아카이브 재생 모드로 실행해 네트워크 없이 수집 과정을 재현합니다."""
+    from review_iterator import write_reviews_csv
+    from crawler_registry import get_crawler_class
+    crawler = get_crawler_class(crawler_name)(product_id, replay_archive=archive)
+    return write_reviews_csv(crawler.iter_review_pages(), output_file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="원본 응답 아카이브 재파싱/재생")
+    parser.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    reparse_parser = subparsers.add_parser("reparse", help="아카이브로 결과 CSV 재생성")
+    reparse_parser.add_argument("--product", action="append", help="특정 상품 id만 (여러 번 지정 가능)")
+    reparse_parser.add_argument("--output-dir", default="crawl_results/reparsed")
+    replay_parser = subparsers.add_parser("replay", help="크롤러를 네트워크 없이 아카이브로 실행")
+    replay_parser.add_argument("product_id")
+    replay_parser.add_argument("--crawler", choices=["advanced", "mobile"], default="advanced")
+    replay_parser.add_argument("--output", default="reviews_replay.csv")
+    args = parser.parse_args()
+
+    archive = ResponseArchive(args.archive_dir)
+    if args.command == "reparse":
+        paths = reparse(archive, args.output_dir, set(args.product) if args.product else None)
+        print(f"✅ {len(paths)}개 결과 파일 재생성")
+    else:
+        count = replay_crawl(archive, args.product_id, args.crawler, args.output)
+        print(f"✅ 재생 완료: {count}개 리뷰 → {args.output}")
@@ -0,0 +1,89 @@
+"""
+마감 시간 기반 재시도 예산
+urllib3 재시도, 크롤러의 수동 재시도, 스케줄러의 크롤러별 재시도/폴백이 각자 횟수로만 제한되면
+죽은 상품 하나가 수십 분을 쓰므로, 실행 전체와 상품별 벽시계 예산을 하나의 정책 객체로 내려보내
+모든 계층이 남은 시간 안에서만 기다리고 재시도하게 함
+"""
+import random
+import time
+
+from urllib3.util.retry import Retry
+
+class RetryPolicy:
+    def __init__(self, budget_seconds=None, parent=None, base_delay=1.0, max_delay=60.0):
+        """budget_seconds: 이 정책의 벽시계 예산(초, None이면 무제한), parent: 함께 지켜야 할 상위 예산 (예: 실행 전체)."""
+        self.budget_seconds = budget_seconds
+        self.deadline = None
+        self.parent = parent
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.start()
+
+    def start(self):
+        """예산 시계를 지금부터 다시 잽니다 (동시 실행 대기열에서 기다린 시간은 빼기 위해)."""
+        self.deadline = time.monotonic() + self.budget_seconds if self.budget_seconds else None
+        return self
+
+    @classmethod
+    def from_config(cls, retry_config, budget_key, parent=None):
+        """설정의 분 단위 예산(budget_key)과 백오프 범위로 정책을 만듭니다."""
+        minutes = retry_config.get(budget_key)
+        return cls(minutes * 60 if minutes else None, parent=parent,
+                   base_delay=retry_config.get('base_delay', 1.0), max_delay=retry_config.get('max_delay', 60.0))
+
+    def remaining(self):
+        """남은 초 (무제한이면 inf). 상위 예산이 더 적게 남았으면 그쪽을 따릅니다."""
+        remaining = self.deadline - time.monotonic() if self.deadline is not None else float('inf')
+        if self.parent is not None:
+            remaining = min(remaining, self.parent.remaining())
+        return remaining
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def backoff(self, attempt):
+        """attempt번째 재시도 전 대기 초. 지수 백오프를 남은 예산의 절반 이하로 줄여 재시도할 시간을 남깁니다."""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+        return max(0.0, min(delay, self.remaining() / 2))
+
+    def sleep(self, attempt):
+        """백오프만큼 기다립니다. 예산이 남아 있어 다시 시도해도 되면 True."""
+        if self.expired():
+            return False
+        time.sleep(self.backoff(attempt))
+        return not self.expired()
+
+    def timeout(self, default):
+        """요청 타임아웃을 남은 예산 안으로 줄입니다 (최소 1초)."""
+        return max(1.0, min(default, self.remaining()))
+
+    def urllib3_retry(self, **kwargs):
+        """세션 어댑터용 Retry. 예산이 바닥나면 남은 횟수와 상관없이 재시도를 멈춥니다."""
+        return DeadlineRetry(policy=self, **kwargs)
+
+class DeadlineRetry(Retry):
+    """남은 예산을 넘겨 기다리지 않고, 예산이 바닥나면 소진된 것으로 보는 urllib3 Retry."""
+    def __init__(self, *args, policy=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.policy = policy
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.policy = self.policy
+        return retry
+
+    def is_exhausted(self):
+        return super().is_exhausted() or (self.policy is not None and self.policy.expired())
+
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff if self.policy is None else max(0.0, min(backoff, self.policy.remaining()))
+
+    def sleep_for_retry(self, response):
+        retry_after = self.get_retry_after(response)
+        if not retry_after:
+            return False
+        if self.policy is not None:
+            retry_after = max(0.0, min(retry_after, self.policy.remaining()))
+        time.sleep(retry_after)
+        return True
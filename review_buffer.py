@@ -0,0 +1,108 @@
+"""
+열 단위 리뷰 버퍼
+리뷰마다 dict를 쌓아 두었다가 DataFrame(object 열)으로 바꾸면 최고 메모리가 두 배가 되므로,
+페이지가 올 때마다 타입이 정해진 배열에 열 단위로 이어 붙이고 적은 복사로 DataFrame을 만듦
+정렬 순서가 바뀌어 같은 리뷰가 두 번 오면 id로 걸러냄
+"""
+from array import array
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from review_iterator import REVIEW_FIELDS
+
+_NAT = np.iinfo(np.int64).min  # datetime64[ns]로 보면 NaT
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def _to_epoch_ns(value):
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return _NAT
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    delta = parsed - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 10**9 + delta.microseconds * 1000
+
+def _to_rating(value):
+    try:
+        rating = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return rating if 1 <= rating <= 5 else 0
+
+class ReviewBuffer:
+    """id(int64), rating(int8, 0=없음), date(UTC ns), option(범주 코드) 열과 writer/content 문자열 목록으로 리뷰를 모읍니다."""
+    def __init__(self):
+        self._ids = array('q')
+        self._ratings = array('b')
+        self._dates = array('q')
+        self._option_codes = array('i')
+        self._option_index = {}
+        self._writers = []
+        self._contents = []
+        self._seen = set()
+        self._str_ids = None  # 숫자가 아닌 id가 나오면 문자열 목록으로 전환합니다.
+        self.duplicates = 0
+        self._frozen = False
+
+    def __len__(self):
+        return len(self._contents)
+
+    def _append_id(self, review_id):
+        if self._str_ids is None:
+            try:
+                self._ids.append(int(review_id))
+                return
+            except (TypeError, ValueError, OverflowError):
+                self._str_ids = [str(value) for value in self._ids]
+                self._ids = array('q')
+        self._str_ids.append(str(review_id))
+
+    def extend(self, records):
+        """페이지 레코드(dict 목록)를 이어 붙이고 새로 추가된 리뷰 수를 돌려줍니다. 이미 받은 id는 건너뜁니다."""
+        if self._frozen:
+            raise RuntimeError("to_frame() 이후에는 리뷰를 더 추가할 수 없습니다 (DataFrame이 버퍼를 공유합니다).")
+        added = 0
+        for record in records:
+            review_id = record.get('id')
+            key = str(review_id)
+            if review_id is not None:
+                if key in self._seen:
+                    self.duplicates += 1
+                    continue
+                self._seen.add(key)
+            self._append_id(review_id if review_id is not None else -1)
+            self._ratings.append(_to_rating(record.get('rating')))
+            self._dates.append(_to_epoch_ns(record.get('date')))
+            option = record.get('option') or ''
+            code = self._option_index.get(option)
+            if code is None:
+                code = self._option_index[option] = len(self._option_index)
+            self._option_codes.append(code)
+            self._writers.append(record.get('writer'))
+            self._contents.append(record.get('content', ''))
+            added += 1
+        return added
+
+    def to_frame(self):
+        """배열 버퍼를 그대로 감싸(숫자 열은 복사 없이) DataFrame을 만듭니다. 이후에는 버퍼에 추가할 수 없습니다."""
+        self._frozen = True
+        if self._str_ids is None:
+            ids = np.frombuffer(self._ids, dtype=np.int64) if len(self._ids) else np.empty(0, dtype=np.int64)
+        else:
+            ids = np.array(self._str_ids, dtype=object)
+        ratings = np.frombuffer(self._ratings, dtype=np.int8) if len(self._ratings) else np.empty(0, dtype=np.int8)
+        dates = np.frombuffer(self._dates, dtype=np.int64) if len(self._dates) else np.empty(0, dtype=np.int64)
+        codes = np.frombuffer(self._option_codes, dtype=np.int32) if len(self._option_codes) else np.empty(0, dtype=np.int32)
+        categories = list(self._option_index)
+        columns = {
+            'id': ids,
+            'rating': pd.arrays.IntegerArray(ratings, ratings == 0),
+            'writer': np.array(self._writers, dtype=object),
+            'date': pd.Series(dates.view('datetime64[ns]')).dt.tz_localize('UTC').array,
+            'content': np.array(self._contents, dtype=object),
+            'option': pd.Categorical.from_codes(codes, categories=categories) if categories else pd.Categorical([]),
+        }
+        return pd.DataFrame(columns, columns=REVIEW_FIELDS, copy=False)
@@ -0,0 +1,261 @@
+"""
+크롤러 공통 리뷰 페이지 반복자
+각 크롤러는 페이지 하나를 가져오는 전송 함수(fetch_page)만 제공하고,
+페이지 순회/파싱/종료 판정은 여기서 처리하여 페이지 단위로 리뷰를 흘려보냄
+"""
+import csv
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+REVIEW_FIELDS = ['id', 'rating', 'writer', 'date', 'content', 'option']
+
+SORT_RANKING = "REVIEW_RANKING"
+SORT_NEWEST = "REVIEW_CREATE_DATE_DESC"  # 증분 크롤링은 최신순으로 받아 워터마크에서 멈춥니다.
+
+# 체크포인트 커서는 엔드포인트별로 저장합니다 (같은 엔드포인트를 쓰는 크롤러끼리는 커서를 이어받음).
+ENDPOINT_WRITABLE_REVIEWS = "writable-reviews"  # advanced/stealth/selenium
+ENDPOINT_MOBILE_REVIEWS = "mobile-reviews"
+
+def parse_review(review):
+    """API 응답의 리뷰 하나를 결과 레코드(dict)로 변환합니다."""
+    option_contents = review.get('productOptionContents', [])
+    option_text = " / ".join([opt.get('optionContent', '') for opt in option_contents])
+    return {
+        'id': review.get('id'), 'rating': review.get('reviewScore'),
+        'writer': review.get('writerMemberId'), 'date': review.get('createDate'),
+        'content': review.get('reviewContent', ''), 'option': option_text,
+    }
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except (TypeError, ValueError):
+        return None
+
+def is_at_or_before(record, watermark):
+    """리뷰가 워터마크(마지막으로 수집한 작성일시 + 그 시각의 리뷰 id들) 이전 또는 같은 리뷰인지 판정합니다."""
+    record_date, mark_date = _parse_date(record.get('date')), _parse_date(watermark.get('date'))
+    if record_date is None or mark_date is None:
+        return str(record.get('id')) in watermark.get('ids', [])
+    if record_date != mark_date:
+        return record_date < mark_date
+    return str(record.get('id')) in watermark.get('ids', [])
+
+def advance_watermark(watermark, records):
+    """수집한 레코드 중 가장 최신 작성일시로 워터마크를 올립니다. 같은 시각의 리뷰 id는 모두 기억합니다."""
+    newest, newest_date = dict(watermark) if watermark else None, None
+    if newest:
+        newest_date = _parse_date(newest.get('date'))
+    for record in records:
+        record_date = _parse_date(record.get('date'))
+        if record_date is None:
+            continue
+        if newest_date is None or record_date > newest_date:
+            newest, newest_date = {'date': record.get('date'), 'ids': [str(record.get('id'))]}, record_date
+        elif record_date == newest_date and str(record.get('id')) not in newest['ids']:
+            newest['ids'].append(str(record.get('id')))
+    return newest
+
+def _is_newest_first(records, progress):
+    """페이지의 작성일시가 (이전 페이지 마지막 리뷰부터 이어서) 늘어나지 않는지 확인하고, 이번 페이지의 가장 오래된 시각을 기억합니다.
+    엔드포인트가 정렬 인자를 무시하면 워터마크에서 멈춘 뒤 그보다 새 리뷰를 놓치므로, 최신순일 때만 워터마크를 믿습니다."""
+    dates = [date for date in (_parse_date(record.get('date')) for record in records) if date is not None]
+    chain = ([progress['oldest_date']] if progress.get('oldest_date') else []) + dates
+    if any(later > earlier for earlier, later in zip(chain, chain[1:])):
+        return False
+    if dates:
+        progress['oldest_date'] = dates[-1]
+    return True
+
+PARALLEL_MIN_PAGES = 10  # 남은 페이지가 이보다 적으면 병렬로 받지 않습니다.
+
+def total_pages_of(data):
+    """첫 페이지 응답에 실린 전체 페이지 수 (totalPages, 없으면 totalElements / size). 알 수 없으면 None."""
+    if data.get('totalPages'):
+        return int(data['totalPages'])
+    total, size = data.get('totalElements'), data.get('size') or len(data.get('contents', []))
+    if total and size:
+        return math.ceil(int(total) / int(size))
+    return None
+
+def _format_eta(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}시간 {minutes}분" if hours else f"{minutes}분 {seconds}초"
+
+def begin_pagination(progress, watermark=None, start_page=1, checkpoint=None, endpoint=None):
+    """progress를 초기화하고 실제 시작 페이지(체크포인트가 있으면 저장된 커서 다음 페이지)를 돌려줍니다."""
+    progress.update(completed=False, reached_watermark=False, unordered=False, oldest_date=None, pages=0, reviews=0,
+                    watermark=watermark, total_pages=None, last_page=None, started_at=time.monotonic())
+    if checkpoint is not None:
+        start_page = max(start_page, checkpoint.next_page(endpoint))
+        if start_page > 1:
+            print(f"♻️  체크포인트에서 이어서 {start_page} 페이지부터 수집합니다.")
+    return start_page
+
+def accept_review_page(page, reviews, progress, watermark=None, checkpoint=None, endpoint=None):
+    """응답의 리뷰 목록을 파싱해 워터마크 이전/이미 수집한 리뷰를 걸러낸 새 레코드 목록을 돌려주고 progress를 갱신합니다.
+    워터마크가 있는데 응답이 최신순이 아니면 progress['unordered']를 세우고 빈 목록을 돌려줍니다 (호출자는 미완료로 멈춰야 함)."""
+    records = [parse_review(review) for review in reviews]
+    if watermark and not _is_newest_first(records, progress):
+        progress['unordered'] = True
+        print(f"⚠️  페이지 {page}의 리뷰가 최신순이 아니라 증분 수집을 믿을 수 없어 중단합니다 (정렬 인자를 무시하는 엔드포인트).")
+        return []
+    if watermark:
+        new_records = [record for record in records if not is_at_or_before(record, watermark)]
+        progress['reached_watermark'] = len(new_records) < len(records)
+        records = new_records
+    if checkpoint is not None:
+        records = checkpoint.record_page(endpoint, page, records)
+    progress.update(pages=progress['pages'] + 1, reviews=progress['reviews'] + len(records),
+                    watermark=advance_watermark(progress['watermark'], records))
+    if records:
+        print(f"📄 페이지 {page}: {len(records)}개 리뷰 수집 (총 {progress['reviews']}개){_progress_suffix(page, progress)}")
+    return records
+
+def _progress_suffix(page, progress):
+    """전체 페이지 수를 알면 ' - 진행률, 남은 시간' 문구를 만듭니다."""
+    if not progress.get('total_pages'):
+        return ""
+    remaining = max(progress['last_page'] - page, 0)
+    done = progress['pages']
+    eta = (time.monotonic() - progress['started_at']) / done * remaining if done else 0
+    return f" - {page / progress['total_pages']:.0%}, 남은 시간 약 {_format_eta(eta)}"
+
+def _fetch_ahead(fetch_page, first_page, last_page, workers):
+    """first_page~last_page를 최대 workers개 스레드로 미리 받으면서 페이지 순서대로 (페이지, 응답)을 돌려줍니다.
+    동시에 받아 두는 페이지는 workers * 2개로 제한하고, 소비를 멈추면 남은 요청은 취소합니다."""
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="review-page")
+    pending = {}
+    next_submit = first_page
+    try:
+        for page in range(first_page, last_page + 1):
+            while next_submit <= last_page and next_submit < page + workers * 2:
+                pending[next_submit] = executor.submit(fetch_page, next_submit)
+                next_submit += 1
+            yield page, pending.pop(page).result()
+    finally:
+        for future in pending.values():
+            future.cancel()
+        executor.shutdown(wait=True)
+
+def _iter_responses(fetch_page, page, max_pages, watermark, progress, workers):
+    """페이지 번호와 응답을 차례로 돌려줍니다. 첫 응답에서 전체 페이지 수를 알게 되면
+    (워터마크로 중간에 멈출 일이 없고 남은 페이지가 충분할 때) 나머지는 workers개 스레드로 미리 받습니다."""
+    data = fetch_page(page)
+    if data is None:
+        yield page, data
+        return
+    total_pages = total_pages_of(data)
+    last_page = min(total_pages, max_pages) if total_pages and max_pages else (total_pages or max_pages)
+    progress.update(total_pages=total_pages, last_page=last_page)
+    yield page, data
+    if workers > 1 and not watermark and total_pages and last_page - page >= PARALLEL_MIN_PAGES:
+        print(f"⚡ 전체 {total_pages}페이지 중 {page + 1}~{last_page} 페이지를 {workers}개 작업자로 나눠 받습니다.")
+        yield from _fetch_ahead(fetch_page, page + 1, last_page, workers)
+        return
+    while max_pages is None or page < max_pages:
+        page += 1
+        yield page, fetch_page(page)
+
+def paginate_reviews(fetch_page, start_page=1, max_pages=None, watermark=None, progress=None, checkpoint=None, endpoint=None,
+                     workers=1):
+    """fetch_page(page)가 돌려준 응답(JSON dict)을 페이지 단위로 파싱해 (페이지 번호, 레코드 목록)을 돌려줍니다.
+    fetch_page가 None을 돌려주면(오류) 또는 리뷰가 없는 페이지가 나오면 순회를 끝냅니다.
+    watermark가 주어지면(최신순 정렬 전제) 그 이전 리뷰가 나오는 순간 멈춥니다. 응답이 최신순이 아니면 미완료로 멈춥니다.
+    progress(dict)를 넘기면 completed(끝까지/워터마크까지 정상 도달 여부)와 새 워터마크를 기록합니다.
+    checkpoint(CrawlCheckpoint)를 넘기면 endpoint의 저장된 커서 다음 페이지부터 시작하고, 페이지마다 진행 상황을 저장하며
+    이미 수집한 리뷰는 건너뜁니다.
+    workers > 1이면 첫 응답의 전체 페이지 수를 보고 나머지 페이지를 여러 스레드로 받되 결과는 페이지 순서대로 돌려줍니다
+    (fetch_page는 스레드에서 동시에 불려도 안전해야 하며, 요청 속도는 fetch_page 안의 속도 제어기가 지킵니다)."""
+    progress = progress if progress is not None else {}
+    page = begin_pagination(progress, watermark, start_page, checkpoint, endpoint)
+    if max_pages is not None and page > max_pages:
+        print(f"⚠️  최대 페이지({max_pages})에 도달하여 중단합니다.")
+        return
+    responses = _iter_responses(fetch_page, page, max_pages, watermark, progress, workers)
+    try:
+        for page, data in responses:
+            if data is None:
+                return
+            reviews = data.get('contents', [])
+            if not reviews:
+                print(f"✅ 모든 리뷰 수집 완료 (총 {progress['reviews']}개)")
+                break
+            records = accept_review_page(page, reviews, progress, watermark, checkpoint, endpoint)
+            if progress['unordered']:
+                return
+            if records:
+                yield page, records
+            if progress['reached_watermark']:
+                print(f"✅ 이전 수집 지점에 도달하여 중단합니다 (새 리뷰 {progress['reviews']}개)")
+                break
+        else:
+            if max_pages is not None and page >= max_pages and page != progress['total_pages']:
+                print(f"⚠️  최대 페이지({max_pages})에 도달하여 중단합니다.")
+                return
+            print(f"✅ 모든 리뷰 수집 완료 (총 {progress['reviews']}개)")
+    finally:
+        # 중간에 멈추면 미리 받던 페이지 요청을 취소합니다.
+        responses.close()
+    progress['completed'] = True
+
+def collect_reviews(pages, on_page=None):
+    """페이지 반복자를 모두 소비해 DataFrame으로 모읍니다 (리뷰가 없으면 None).
+    리뷰는 열 단위 버퍼에 모으며, 랭킹 정렬이 바뀌어 두 번 받은 리뷰는 한 번만 남깁니다."""
+    from review_buffer import ReviewBuffer
+    buffer = ReviewBuffer()
+    for _, records in pages:
+        buffer.extend(records)
+        if on_page:
+            on_page(records)
+    if buffer.duplicates:
+        print(f"🔁 중복 리뷰 {buffer.duplicates}개를 제외했습니다.")
+    return buffer.to_frame() if len(buffer) else None
+
+class ReviewCsvWriter:
+    """결과 CSV를 열어 두고 레코드를 도착하는 대로 이어 씁니다. 이미 쓴 리뷰 id는 다시 쓰지 않습니다."""
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.count = 0
+        self._seen_ids = set()
+        self._file = open(output_file, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.DictWriter(self._file, fieldnames=REVIEW_FIELDS, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write(self, records):
+        new_records = []
+        for record in records:
+            review_id = record.get('id')
+            if review_id is not None:
+                if str(review_id) in self._seen_ids:
+                    continue
+                self._seen_ids.add(str(review_id))
+            new_records.append(record)
+        self._writer.writerows(new_records)
+        self._file.flush()
+        self.count += len(new_records)
+
+    def close(self, keep_empty=False):
+        """파일을 닫고 저장한 리뷰 수를 돌려줍니다. keep_empty=False면 리뷰가 없을 때 파일을 지웁니다."""
+        self._file.close()
+        if not self.count and not keep_empty:
+            os.remove(self.output_file)
+        return self.count
+
+def write_reviews_csv(pages, output_file, on_page=None, keep_empty=False):
+    """페이지가 도착하는 대로 CSV에 이어 써서 메모리를 일정하게 유지합니다. 저장한 리뷰 수를 돌려줍니다.
+    keep_empty=False면 리뷰가 하나도 없을 때 파일을 지웁니다."""
+    writer = ReviewCsvWriter(output_file)
+    try:
+        for _, records in pages:
+            writer.write(records)
+            if on_page:
+                on_page(records)
+    finally:
+        count = writer.close(keep_empty)
+    return count
@@ -0,0 +1,83 @@
+"""
+크롤링 중 페이지 단위 스트리밍 분석
+크롤러가 페이지를 받을 때마다 감성 분석과 토큰화를 백그라운드 스레드에서 미리 수행하여
+마지막 페이지가 도착하면 토픽 학습만 남도록 함
+"""
+import queue
+import threading
+import logging
+
+from analysis import (analyze_sentiment_batch, tokenize_texts, fit_topics, fit_topics_dedup, topic_modeling,
+                      DEDUP_NEAR_DUPLICATES, USE_TOPIC_STORE)
+
+_STOP = object()
+
+class StreamingReviewAnalyzer:
+    def __init__(self, positive_keywords, negative_keywords, tokenizer=None, dedup=None):
+        """dedup: 유사 중복 군집마다 대표 리뷰만 토픽 학습 (None이면 REVIEWER_DEDUP 환경 변수에 따른 기본값)."""
+        self.positive_keywords = positive_keywords
+        self.negative_keywords = negative_keywords
+        self.tokenizer = tokenizer
+        self.dedup = DEDUP_NEAR_DUPLICATES if dedup is None else dedup
+        self.sentiments, self.tokens = [], []
+        self.pages_done = 0
+        self._seen_ids = set()
+        self._error = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit_page(self, reviews):
+        """크롤러의 페이지 콜백. 해당 페이지의 리뷰 dict 목록을 분석 대기열에 넣습니다.
+        리뷰 버퍼와 같은 기준으로 이미 받은 id는 건너뛰어 결과 행과 순서를 맞춥니다."""
+        contents = []
+        for review in reviews:
+            review_id = review.get('id')
+            if review_id is not None:
+                if str(review_id) in self._seen_ids:
+                    continue
+                self._seen_ids.add(str(review_id))
+            contents.append(review.get('content', ''))
+        self._queue.put(contents)
+
+    def _worker(self):
+        while True:
+            contents = self._queue.get()
+            if contents is _STOP:
+                break
+            if self._error:
+                continue
+            try:
+                labels, _ = analyze_sentiment_batch(contents, self.positive_keywords, self.negative_keywords)
+                # 페이지 단위는 작으므로 프로세스 풀 없이 바로 토큰화합니다.
+                tokens = tokenize_texts(contents, n_workers=1, tokenizer=self.tokenizer)
+                self.sentiments.extend(labels)
+                self.tokens.extend(tokens)
+                self.pages_done += 1
+            except Exception as e:
+                self._error = e
+                logging.warning(f"페이지 스트리밍 분석 실패, 마지막에 한꺼번에 분석합니다: {e}")
+
+    def finish(self, df, num_topics, product_id=None):
+        """남은 페이지 분석을 기다린 뒤 감성/토큰 컬럼을 붙이고 토픽만 학습합니다.
+        product_id를 주면 (USE_TOPIC_STORE) 저장된 상품별 토픽 모델을 새 리뷰로만 갱신합니다.
+        이때는 저장 모델의 리뷰별 토픽을 유지해야 하므로 유사 중복 묶기를 하지 않습니다."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        use_store = product_id is not None and USE_TOPIC_STORE
+
+        if self._error or len(self.tokens) != len(df):
+            if not self._error:
+                logging.warning(f"스트리밍 분석 결과({len(self.tokens)}건)와 리뷰 수({len(df)}건)가 달라 다시 분석합니다.")
+            df['sentiment'], _ = analyze_sentiment_batch(df['content'], self.positive_keywords, self.negative_keywords)
+            if not use_store:
+                return topic_modeling(df, num_topics, tokenizer=self.tokenizer, dedup=self.dedup)
+            df['tokens'] = tokenize_texts(df['content'], tokenizer=self.tokenizer)
+        else:
+            df['sentiment'] = self.sentiments
+            df['tokens'] = self.tokens
+
+        if use_store:
+            from topic_store import incremental_topic_modeling
+            return incremental_topic_modeling(df, num_topics, product_id, tokens=list(df['tokens']), tokenizer=self.tokenizer)
+        return fit_topics_dedup(df, num_topics) if self.dedup else fit_topics(df, num_topics)
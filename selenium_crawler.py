@@ -2,21 +2,20 @@
 Selenium 기반 네이버 스마트스토어 리뷰 크롤러
 실제 브라우저를 사용하여 IP 차단을 우회
 """
-import pandas as pd
 import json
 import time
 import random
-from datetime import datetime
-from analysis import analyze_sentiment, topic_modeling
+from review_iterator import paginate_reviews, collect_reviews, SORT_RANKING, ENDPOINT_WRITABLE_REVIEWS
+from review_pipeline import StreamingReviewAnalyzer
+from summary_cache import get_summary_cache
+from pacing import get_pacer
+from retry_policy import RetryPolicy
 
 try:
     from selenium import webdriver
     from selenium.webdriver.common.by import By
     from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.action_chains import ActionChains
-    from selenium.common.exceptions import TimeoutException, NoSuchElementException
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
@@ -29,44 +28,103 @@ PRODUCT_ID = "5753732771"
 OUTPUT_FILE_NAME = "reviews_selenium.csv"
 NUM_TOPICS = 5
 
+FETCH_BATCH_SIZE = 5  # JSON 캡처 모드에서 한 번의 스크립트 호출로 받을 페이지 수
+# 페이지를 렌더링하지 않고 같은 출처(쿠키 포함)에서 API를 병렬로 호출해 [상태 코드, 본문] 목록을 돌려줍니다.
+FETCH_SCRIPT = """
+const urls = arguments[0];
+const done = arguments[arguments.length - 1];
+Promise.all(urls.map(url =>
+    fetch(url, {credentials: 'include', headers: {'Accept': 'application/json, text/plain, */*'}})
+        .then(response => response.text().then(text => [response.status, text]))
+        .catch(error => [0, String(error)])
+)).then(done);
+"""
+
+def create_chrome_driver(headless=True, lightweight=False):
+    """크롤링용 Chrome 드라이버를 새로 띄웁니다. 실패하면 예외를 그대로 올립니다.
+    lightweight=True면 이미지/CSS를 끄고 DOM만 준비되면 로딩을 끝냅니다 (JSON 캡처 모드용)."""
+    chrome_options = Options()
+    
+    if lightweight:
+        chrome_options.page_load_strategy = 'eager'
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.stylesheets": 2,
+        })
+    
+    if headless:
+        chrome_options.add_argument("--headless")
+    
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-web-security")
+    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    user_agents = [
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    ]
+    chrome_options.add_argument(f"--user-agent={random.choice(user_agents)}")
+    
+    window_sizes = ["1920,1080", "1366,768", "1440,900"]
+    chrome_options.add_argument(f"--window-size={random.choice(window_sizes)}")
+    
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
 class SeleniumNaverCrawler:
-    def __init__(self, product_id, headless=True):
+    review_endpoint = ENDPOINT_WRITABLE_REVIEWS
+
+    def __init__(self, product_id, headless=True, pool=None, json_capture=False, fetch_batch_size=FETCH_BATCH_SIZE,
+                 retry_policy=None):
+        """pool(BrowserPool)을 주면 브라우저를 새로 띄우지 않고 풀에서 빌려 쓰고 close()에서 돌려줍니다.
+        json_capture=True면 리뷰 API를 페이지 렌더링 없이 브라우저 안의 fetch로 fetch_batch_size 페이지씩 받습니다.
+        retry_policy(RetryPolicy)의 시간 예산이 바닥나면 풀의 브라우저를 더 기다리지 않습니다."""
         if not SELENIUM_AVAILABLE:
             raise ImportError("Selenium이 설치되지 않았습니다.")
         
         self.product_id = product_id
+        self.product_info = None
+        self.pacer = get_pacer("selenium")
+        self.retry_policy = retry_policy or RetryPolicy()
         self.headless = headless
         self.driver = None
         self.wait = None
+        self.pool = pool
+        self.pooled = None
+        self.pages_loaded = 0
+        self.json_capture = json_capture
+        self.fetch_batch_size = fetch_batch_size
+        self._prefetched = {}
+
+    @classmethod
+    def from_config(cls, product_id, crawler_config, archive=None, browser_pool=None, retry_policy=None):
+        """스케줄러용 생성자 (crawler_registry.Crawler 참고). 브라우저 응답은 세션을 거치지 않아 archive는 쓰지 않습니다."""
+        selenium_config = crawler_config.get('selenium', {})
+        return cls(product_id, headless=selenium_config.get('headless', True),
+                   pool=browser_pool() if browser_pool else None,
+                   json_capture=selenium_config.get('json_capture', False),
+                   fetch_batch_size=selenium_config.get('fetch_batch_size', FETCH_BATCH_SIZE),
+                   retry_policy=retry_policy)
+
+    def start(self):
+        return self._setup_driver()
         
     def _setup_driver(self):
-        """브라우저 드라이버 설정"""
-        chrome_options = Options()
-        
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        user_agents = [
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-        ]
-        chrome_options.add_argument(f"--user-agent={random.choice(user_agents)}")
-        
-        window_sizes = ["1920,1080", "1366,768", "1440,900"]
-        chrome_options.add_argument(f"--window-size={random.choice(window_sizes)}")
-        
+        """브라우저 드라이버 설정 (풀이 있으면 미리 띄워 둔 브라우저를 빌려옵니다)"""
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            if self.pool is not None:
+                remaining = self.retry_policy.remaining()
+                self.pooled = self.pool.checkout(timeout=None if remaining == float('inf') else max(remaining, 0))
+                self.driver = self.pooled.driver
+            else:
+                self.driver = create_chrome_driver(self.headless, lightweight=self.json_capture)
             self.wait = WebDriverWait(self.driver, 30)
             print("✅ Chrome 브라우저 초기화 완료")
             return True
@@ -74,19 +132,53 @@ class SeleniumNaverCrawler:
             print(f"❌ 브라우저 초기화 실패: {e}")
             print("Chrome 드라이버가 설치되어 있고 PATH에 추가되었는지 확인하세요.")
             return False
-    
-    def _human_like_delay(self, min_delay=2, max_delay=5):
-        """인간과 같은 지연"""
-        delay = random.uniform(min_delay, max_delay)
-        print(f"⏳ {delay:.2f}초 대기...")
-        time.sleep(delay)
+
+    def _navigate(self, url):
+        self.driver.get(url)
+        self.pages_loaded += 1
+
+    def _read_json_via_dom(self, url):
+        """API 주소로 이동해 렌더링된 body 텍스트를 JSON으로 읽습니다 (JSON이 아니면 None)."""
+        self._navigate(url)
+        body_text = self.driver.find_element(By.TAG_NAME, "body").text
+        if not body_text or not body_text.strip().startswith('{'):
+            return None
+        return json.loads(body_text)
+
+    def _fetch_json_batch(self, urls):
+        """브라우저 안의 fetch로 여러 API 응답을 한 번에 받아 [(상태 코드, JSON 또는 None)] 목록을 돌려줍니다."""
+        # fetch가 쿠키와 같은 출처 정책을 따르도록 스마트스토어 도메인에 머물러 있어야 합니다.
+        if not self.driver.current_url.startswith("https://smartstore.naver.com"):
+            self._navigate(f"https://smartstore.naver.com/i/v1/products/{self.product_id}/summary")
+        self.driver.set_script_timeout(60)
+        results = []
+        for status_code, text in self.driver.execute_async_script(FETCH_SCRIPT, urls):
+            try:
+                results.append((status_code, json.loads(text) if status_code == 200 else None))
+            except ValueError:
+                results.append((status_code, None))
+        return results
+
+    def _review_url(self, merchant_no, origin_product_no, page, sort):
+        return f"https://smartstore.naver.com/main/products/{origin_product_no}/reviews/writable-reviews?page={page}&sort={sort}&merchantNo={merchant_no}"
+
+    def _human_like_delay(self, slots=1):
+        """응답 상태에 따라 조정되는 지연 (pacing 참고). 페이지를 slots개 한꺼번에 받을 때는 그만큼 기다립니다."""
+        delay = self.pacer.wait(slots)
+        print(f"⏳ {delay:.2f}초 대기 (현재 {self.pacer.rate:.2f} req/s)")
 
     def get_product_info(self):
-        """상품 정보 가져오기"""
+        """상품 정보(merchant_no, origin_product_no, 상태 코드). 요약 캐시에 있으면 요청하지 않습니다."""
+        if self.product_info is None:
+            self.product_info = get_summary_cache().resolve(self.product_id, self._fetch_product_info, source='selenium')
+        return self.product_info
+
+    def _fetch_product_info(self):
+        """브라우저로 상품 정보 가져오기 (브라우저는 상태 코드를 알 수 없어 JSON을 받으면 200으로 봅니다)"""
         print("🔍 브라우저로 상품 정보 수집 중...")
         api_url = f"https://smartstore.naver.com/i/v1/products/{self.product_id}/summary"
         try:
-            self.driver.get(api_url)
+            self._navigate(api_url)
             self._human_like_delay()
             
             body_text = self.driver.find_element(By.TAG_NAME, "body").text
@@ -103,66 +195,82 @@ class SeleniumNaverCrawler:
                 print(f"✅ API로 상품 정보 획득!")
                 print(f"   📊 Merchant No: {merchant_no}")
                 print(f"   📊 Origin Product No: {origin_product_no}")
-                return merchant_no, origin_product_no
+                return merchant_no, origin_product_no, 200
             else:
                 print("❌ 상품 정보(merchant_no, origin_product_no)를 찾을 수 없습니다.")
-                return None, None
+                return None, None, 200
         except Exception as e:
             print(f"❌ 상품 정보 수집 실패: {e}")
-            return None, None
+            return None, None, None
     
-    def crawl_reviews(self):
-        """리뷰 크롤링"""
-        merchant_no, origin_product_no = self.get_product_info()
-        if not merchant_no or not origin_product_no:
+    def _fetch_review_page(self, merchant_no, origin_product_no, page, sort=SORT_RANKING):
+        if self.json_capture:
+            return self._fetch_review_page_captured(merchant_no, origin_product_no, page, sort)
+        try:
+            print(f"📄 페이지 {page} 수집 중...")
+            self._human_like_delay()
+            started = time.monotonic()
+            data = self._read_json_via_dom(self._review_url(merchant_no, origin_product_no, page, sort))
+            if data is None:
+                # 브라우저는 상태 코드를 알 수 없으므로 JSON이 아닌 응답(차단/오류 페이지)을 혼잡 신호로 봅니다.
+                self.pacer.record(time.monotonic() - started, error=True)
+                print(f"❌ 페이지 {page}: 올바른 JSON 응답이 아닙니다. 크롤링을 중단합니다.")
+                return None
+            self.pacer.record(time.monotonic() - started, 200)
+            return data
+        except Exception as e:
+            self.pacer.record(error=True)
+            print(f"❌ 페이지 {page} 처리 중 오류 발생: {e}")
             return None
-        
-        all_reviews, page, max_pages = [], 1, 100
-        print("📝 브라우저로 리뷰 크롤링 시작...")
-        
-        while page <= max_pages:
+
+    def _fetch_review_page_captured(self, merchant_no, origin_product_no, page, sort):
+        """JSON 캡처 모드: 미리 받아 둔 페이지가 없으면 page부터 fetch_batch_size 페이지를 한 번에 받습니다."""
+        if page not in self._prefetched:
+            pages = list(range(page, page + self.fetch_batch_size))
             try:
-                review_url = f"https://smartstore.naver.com/main/products/{origin_product_no}/reviews/writable-reviews?page={page}&sort=REVIEW_RANKING&merchantNo={merchant_no}"
-                print(f"📄 페이지 {page} 수집 중...")
-                self.driver.get(review_url)
-                self._human_like_delay()
-                
-                body_text = self.driver.find_element(By.TAG_NAME, "body").text
-                if not body_text or not body_text.strip().startswith('{'):
-                    print(f"❌ 페이지 {page}: 올바른 JSON 응답이 아닙니다. 크롤링을 중단합니다.")
-                    break
-                
-                data = json.loads(body_text)
-                reviews = data.get('contents', [])
-                if not reviews:
-                    print("✅ 모든 리뷰 수집 완료!")
-                    break
-                
-                for review in reviews:
-                    option_contents = review.get('productOptionContents', [])
-                    option_text = " / ".join([opt.get('optionContent', '') for opt in option_contents])
-                    all_reviews.append({
-                        'id': review.get('id'),
-                        'rating': review.get('reviewScore'),
-                        'writer': review.get('writerMemberId'),
-                        'date': review.get('createDate'),
-                        'content': review.get('reviewContent', ''),
-                        'option': option_text,
-                    })
-                
-                print(f"✅ 페이지 {page}: {len(reviews)}개 리뷰 수집 (총 {len(all_reviews)}개)")
-                page += 1
-                
+                print(f"📄 페이지 {pages[0]}~{pages[-1]} 일괄 수집 중...")
+                # 한 번에 보내는 요청마다 간격 자리를 하나씩 잡아야 설정한 속도를 넘지 않습니다.
+                self._human_like_delay(len(pages))
+                started = time.monotonic()
+                results = self._fetch_json_batch([self._review_url(merchant_no, origin_product_no, p, sort) for p in pages])
             except Exception as e:
-                print(f"❌ 페이지 {page} 처리 중 오류 발생: {e}")
-                break
-        
-        return pd.DataFrame(all_reviews) if all_reviews else None
+                self.pacer.record(error=True)
+                print(f"❌ 페이지 {page} 일괄 수집 중 오류 발생: {e}")
+                return None
+            elapsed = (time.monotonic() - started) / len(pages)
+            for status_code, _ in results:
+                self.pacer.record(elapsed, status_code or None, error=not status_code)
+            self._prefetched = {p: data for p, (_, data) in zip(pages, results)}
+        data = self._prefetched.pop(page, None)
+        if data is None:
+            print(f"❌ 페이지 {page}: 올바른 JSON 응답이 아닙니다. 크롤링을 중단합니다.")
+        return data
+
+    def iter_review_pages(self, sort=SORT_RANKING, watermark=None, progress=None, checkpoint=None, max_pages=100, workers=1):
+        """리뷰를 페이지 단위로 (페이지 번호, 레코드 목록)씩 돌려줍니다. 인자는 paginate_reviews 참고.
+        드라이버 하나를 여러 스레드가 함께 쓸 수 없으므로 workers는 무시하고 한 페이지씩 받습니다
+        (여러 페이지를 한 번에 받으려면 json_capture 모드를 쓰세요)."""
+        merchant_no, origin_product_no, _ = self.get_product_info()
+        if not merchant_no or not origin_product_no:
+            return
+        print("📝 브라우저로 리뷰 크롤링 시작...")
+        yield from paginate_reviews(lambda page: self._fetch_review_page(merchant_no, origin_product_no, page, sort),
+                                    max_pages=max_pages, watermark=watermark, progress=progress,
+                                    checkpoint=checkpoint, endpoint=self.review_endpoint)
+
+    def crawl_reviews(self, on_page=None):
+        """리뷰 크롤링"""
+        return collect_reviews(self.iter_review_pages(), on_page)
     
     def close(self):
-        """브라우저 종료"""
-        if self.driver:
+        """브라우저 종료 (풀에서 빌린 브라우저는 풀에 돌려줍니다)"""
+        if self.pooled is not None:
+            self.pool.release(self.pooled, self.pages_loaded)
+            self.pooled = self.driver = None
+            print("↩️  브라우저를 풀에 반납")
+        elif self.driver:
             self.driver.quit()
+            self.driver = None
             print("🔚 브라우저 종료")
 
 if __name__ == '__main__':
@@ -178,20 +286,17 @@ if __name__ == '__main__':
         if not crawler._setup_driver():
             exit(1)
         
-        review_df = crawler.crawl_reviews()
+        positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른', '편하고', '예뻐요']
+        negative_keywords = ['불편', '별로', '실망', '아쉬', '불만', '느린', '무거']
+        analyzer = StreamingReviewAnalyzer(positive_keywords, negative_keywords)
+        review_df = crawler.crawl_reviews(on_page=analyzer.submit_page)
         
         if review_df is not None and not review_df.empty:
-            print("\n📊 === 데이터 분석 시작 ===")
-            positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른', '편하고', '예뻐요']
-            negative_keywords = ['불편', '별로', '실망', '아쉬', '불만', '느린', '무거']
-            
-            review_df['sentiment'] = review_df['content'].apply(lambda x: analyze_sentiment(x, positive_keywords, negative_keywords))
+            print("\n--- 🏷️ 토픽 모델링 결과 ---")
+            review_df = analyzer.finish(review_df, NUM_TOPICS, product_id=PRODUCT_ID)
             print("\n--- 📈 감성 분석 결과 ---")
             print(review_df['sentiment'].value_counts())
             
-            print("\n--- 🏷️ 토픽 모델링 결과 ---")
-            review_df = topic_modeling(review_df, NUM_TOPICS)
-            
             review_df.to_csv(OUTPUT_FILE_NAME, index=False, encoding='utf-8-sig')
             print(f"\n✅ 분석 완료! 결과가 '{OUTPUT_FILE_NAME}' 파일로 저장되었습니다.")
         else:
@@ -1,6 +1,7 @@
 import requests
 import pandas as pd
 import json
+import asyncio
 import time
 import random
 import re
@@ -9,15 +10,23 @@ import os
 import schedule
 import threading
 import logging
+from itertools import chain
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple
 
 try:
-    from stealth_crawler import StealthNaverCrawler
-    from selenium_crawler import SeleniumNaverCrawler
-    from mobile_crawler import MobileNaverCrawler
-    from advanced_crawler import AdvancedNaverCrawler
+    # 크롤러 모듈은 crawler_registry가 처음 선택될 때 불러옵니다 (selenium 등은 쓸 때만 로드).
+    from crawler_registry import create_crawler, is_registered, register_plugins
+    from review_iterator import write_reviews_csv, advance_watermark, SORT_RANKING, SORT_NEWEST
+    from crawl_checkpoint import CrawlCheckpoint
+    from async_engine import AsyncCrawlEngine, HTTPX_AVAILABLE
+    from response_archive import ResponseArchive
+    from pacing import configure_pacing
+    from http_transport import configure_transport, get_transport
+    from retry_policy import RetryPolicy
+    from browser_pool import BrowserPool
+    from crawler_stats import CrawlerStats
     CRAWLERS_AVAILABLE = True
 except ImportError:
     CRAWLERS_AVAILABLE = False
@@ -32,12 +41,24 @@ class SmartCrawlerScheduler:
         self.config_file = config_file
         self.config = self._load_config()
         self.setup_logging()
+        if CRAWLERS_AVAILABLE:
+            # 크롤러별 요청 간격 범위 (생략하면 pacing.PACING_PROFILES 기본값)
+            configure_pacing(self.config.get('crawlers', {}).get('pacing', {}))
+            # 모든 크롤러 세션이 공유하는 연결 풀 크기 (병렬 페이지 작업자 수보다 크게)
+            configure_transport(self.config.get('crawlers', {}).get('transport', {}))
+            # 기본 크롤러 외에 {이름: "모듈:클래스"}로 추가한 전송 방식
+            register_plugins(self.config.get('crawlers', {}).get('plugins', {}))
+            self.stats = CrawlerStats(self.config.get('crawlers', {}).get('stats_file', 'crawler_stats.json'))
 
     def _load_config(self) -> Dict:
         default_config = {
             "schedule": {"auto_run_times": ["02:00", "03:30", "05:00"], "retry_interval_hours": 6},
             "vpn": {"enabled": False, "provider": "expressvpn", "countries": ["japan", "singapore"], "connect_command": "expressvpn connect {country}", "disconnect_command": "expressvpn disconnect", "status_command": "expressvpn status"},
-            "crawlers": {"priority_order": ["stealth", "selenium", "mobile", "advanced"], "max_retries_per_crawler": 2, "delay_between_crawlers": 300},
+            "crawlers": {"priority_order": ["stealth", "selenium", "mobile", "advanced"], "max_retries_per_crawler": 2, "delay_between_crawlers": 300, "incremental": False, "resume": True, "checkpoint_max_age_hours": 24, "page_workers": 3, "adaptive_order": True, "stats_file": "crawler_stats.json", "plugins": {},
+                         "transport": {"pool_connections": 10, "pool_maxsize": 20, "http2": False},
+                         "retry": {"run_budget_minutes": None, "product_budget_minutes": 20, "base_delay": 5, "max_delay": 120}, "archive_responses": False, "pacing": {},
+                         "selenium": {"pool_size": 1, "max_pages_per_browser": 300, "max_rss_mb": 1500, "headless": True, "json_capture": False, "fetch_batch_size": 5},
+                         "async": {"enabled": False, "max_concurrent_products": 8, "per_host_concurrency": 4, "requests_per_second": 2.0, "max_retries": 3}},
             "output": {"base_directory": "crawl_results", "filename_pattern": "{product_id}_{timestamp}_{crawler}.csv", "keep_logs_days": 30},
             "products": []
         }
@@ -151,7 +172,10 @@ class SmartCrawlerScheduler:
         except: return "상태 확인 불가"
 
     def crawl_product(self, product: Dict) -> Optional[str]:
+        """모든 크롤러를 차례로 시도해 성공한 결과 파일 경로를 돌려줍니다 (실패면 None).
+        실패했어도 체크포인트에 받은 리뷰가 있으면 부분 결과 파일을 남기고 그 경로를 product['partial_result']에 적습니다."""
         product_id = product.get("id")
+        product.pop('partial_result', None)
         self.logger.info(f"🎯 크롤링 시작: {product.get('name', '')} ({product_id})")
         
         vpn_config = self.config.get("vpn", {})
@@ -162,18 +186,35 @@ class SmartCrawlerScheduler:
         
         success_file = None
         crawler_config = self.config.get('crawlers', {})
-        crawler_order = crawler_config.get('priority_order', [])
+        crawler_order = self._crawler_order(product_id)
+        # 증분 모드: 최신순으로 받아 지난번 마지막 리뷰(워터마크)에 닿으면 멈춥니다.
+        watermark = product.get('watermark') if crawler_config.get('incremental') else None
+        if watermark:
+            self.logger.info(f"📌 증분 크롤링: {watermark.get('date')} 이후 리뷰만 수집")
+        checkpoint = self._open_checkpoint(product_id, watermark)
+        # 크롤러 재시도/폴백/세션 재시도가 모두 이 상품 예산(과 실행 전체 예산) 안에서만 돕니다.
+        retry_policy = self._product_policy()
         
         try:
             for crawler_name in crawler_order:
                 for retry in range(crawler_config.get('max_retries_per_crawler', 1)):
-                    self.logger.info(f"🤖 {crawler_name} 크롤러 시도 ({retry + 1})")
-                    result_path, status_code = self._run_crawler(crawler_name, product_id)
+                    if retry > 0 and not retry_policy.sleep(retry - 1):
+                        break
+                    if retry_policy.expired():
+                        break
+                    self.logger.info(f"🤖 {crawler_name} 크롤러 시도 ({retry + 1}, 남은 예산 {self._format_budget(retry_policy)})")
+                    progress = {}
+                    started = time.monotonic()
+                    result_path, status_code = self._run_crawler(crawler_name, product_id, watermark=watermark, progress=progress,
+                                                                  checkpoint=checkpoint, retry_policy=retry_policy)
+                    if CRAWLERS_AVAILABLE:
+                        self.stats.record(crawler_name, product_id, bool(result_path), time.monotonic() - started,
+                                          progress.get('pages', 0), status_code)
                     
                     if result_path:
                         success_file = result_path
                         self.logger.info(f"✅ {crawler_name} 크롤러로 성공!")
-                        product['success_count'] = product.get('success_count', 0) + 1
+                        self._record_success(product, progress, checkpoint)
                         break # 성공 시 다음 크롤러로 넘어가지 않음
                     
                     self.logger.warning(f"⚠️ {crawler_name} 크롤러 실패 (상태: {status_code})")
@@ -181,10 +222,19 @@ class SmartCrawlerScheduler:
                         self.logger.warning("🚫 IP 차단 가능성. VPN 재연결 시도.")
                         self.disconnect_vpn(); time.sleep(5); self.connect_vpn()
                 if success_file: break
+                if retry_policy.expired():
+                    self.logger.warning(f"⏰ 시간 예산을 모두 써서 남은 크롤러를 건너뜁니다: {product.get('name')}")
+                    break
             
             if not success_file:
                 product['fail_count'] = product.get('fail_count', 0) + 1
                 self.logger.error(f"❌ 모든 크롤러 실패: {product.get('name')}")
+                if checkpoint is not None and checkpoint.has_records():
+                    # 체크포인트는 남겨 두어 다음 실행이 이어서 수집하고, 지금까지 받은 리뷰는 부분 결과로 내보냅니다.
+                    # 부분 결과는 성공이 아니므로 반환값이 아니라 product['partial_result']로만 알립니다.
+                    partial_file = self._write_partial_result(product_id, checkpoint)
+                    if partial_file:
+                        product['partial_result'] = partial_file
             product['last_crawl'] = datetime.now().isoformat()
             self._save_config(self.config)
         finally:
@@ -192,49 +242,147 @@ class SmartCrawlerScheduler:
                 self.disconnect_vpn()
         return success_file
     
-    def _run_crawler(self, crawler_name: str, product_id: str) -> Tuple[Optional[str], Optional[int]]:
-        if not CRAWLERS_AVAILABLE: return None, None
-        
+    def _product_policy(self):
+        """상품 하나의 시간 예산. 일괄 실행 중이면 실행 전체 예산도 함께 지킵니다."""
+        retry_config = self.config.get('crawlers', {}).get('retry', {})
+        return RetryPolicy.from_config(retry_config, 'product_budget_minutes', parent=getattr(self, '_run_policy', None))
+
+    @staticmethod
+    def _format_budget(retry_policy) -> str:
+        remaining = retry_policy.remaining()
+        if remaining == float('inf'):
+            return "무제한"
+        return f"{remaining / 60:.1f}분" if remaining >= 60 else f"{max(remaining, 0):.0f}초"
+
+    def _crawler_order(self, product_id: str) -> List[str]:
+        """설정된 시도 순서를 과거 통계(기대 성공 소요 시간)로 다시 정렬합니다 (adaptive_order 비활성 시 그대로)."""
+        crawler_config = self.config.get('crawlers', {})
+        configured = crawler_config.get('priority_order', [])
+        if not CRAWLERS_AVAILABLE or not crawler_config.get('adaptive_order', True):
+            return configured
+        order = self.stats.order(configured, product_id)
+        if order != configured:
+            self.logger.info(f"🔀 통계 기반 시도 순서: {' → '.join(order)}")
+        return order
+
+    def _record_success(self, product: Dict, progress: Dict, checkpoint=None):
+        product['success_count'] = product.get('success_count', 0) + 1
+        # 중간에 끊긴 최신순 수집으로 워터마크를 올리면 사이의 리뷰를 영영 놓치므로, 정상 종료 시에만 갱신합니다.
+        if self.config.get('crawlers', {}).get('incremental') and progress.get('completed') and progress.get('watermark'):
+            product['watermark'] = progress['watermark']
+        if checkpoint is not None:
+            checkpoint.clear()
+
+    def _open_checkpoint(self, product_id: str, watermark: Optional[Dict] = None):
+        """재시작/크롤러 전환 시 이어서 수집할 수 있도록 상품의 체크포인트를 엽니다 (resume 비활성 시 None)."""
+        crawler_config = self.config.get('crawlers', {})
+        if not CRAWLERS_AVAILABLE or not crawler_config.get('resume', True):
+            return None
+        sort = SORT_NEWEST if crawler_config.get('incremental') else SORT_RANKING
+        output_dir = Path(self.config.get('output', {}).get('base_directory', 'crawl_results'))
+        return CrawlCheckpoint(product_id, sort, watermark=watermark, base_dir=output_dir / '.checkpoints',
+                               max_age_hours=crawler_config.get('checkpoint_max_age_hours', 24))
+
+    def _get_archive(self):
+        if getattr(self, '_archive', None) is None:
+            output_dir = Path(self.config.get('output', {}).get('base_directory', 'crawl_results'))
+            self._archive = ResponseArchive(output_dir / '.archive')
+        return self._archive
+
+    def _output_file(self, product_id: str, crawler_name: str) -> Path:
         output_config = self.config.get('output', {})
         output_dir = Path(output_config.get('base_directory', 'crawl_results'))
         output_dir.mkdir(exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename_pattern = output_config.get('filename_pattern', '{product_id}_{timestamp}_{crawler}.csv')
-        filename = filename_pattern.format(product_id=product_id, timestamp=timestamp, crawler=crawler_name)
-        output_file = output_dir / filename
+        return output_dir / filename_pattern.format(product_id=product_id, timestamp=timestamp, crawler=crawler_name)
+
+    def _write_partial_result(self, product_id: str, checkpoint) -> Optional[str]:
+        output_file = self._output_file(product_id, 'partial')
+        saved_count = write_reviews_csv(checkpoint.replay_pages(), output_file)
+        if not saved_count:
+            return None
+        self.logger.warning(f"⚠️ 부분 결과 저장: {output_file} ({saved_count}건, 다음 실행에서 이어서 수집)")
+        return str(output_file)
+
+    def _finalize_result(self, output_file: Path, saved_count: int, progress: Dict, status_code: Optional[int],
+                         checkpoint=None) -> Tuple[Optional[str], Optional[int]]:
+        """수집을 마친 결과 파일을 성공으로 남길지 판정합니다. 실패면 파일을 지우고 (None, 상태 코드)를 돌려줍니다."""
+        incremental = self.config.get('crawlers', {}).get('incremental', False)
+        if checkpoint is not None and not progress.get('completed'):
+            if output_file.exists():
+                output_file.unlink()
+            return None, status_code
+        if checkpoint is not None and incremental:
+            # 이전 시도에서 받은 리뷰도 워터마크 계산에 포함합니다.
+            progress['watermark'] = advance_watermark(progress.get('watermark'), checkpoint.iter_records())
+
+        if saved_count or (incremental and progress.get('completed')):
+            # 증분 모드에서 새 리뷰가 없으면 헤더만 있는 결과 파일을 남기고 성공으로 처리합니다.
+            self.logger.info(f"💾 결과 저장: {output_file} ({saved_count}건)")
+            return str(output_file), 200
+        if output_file.exists():
+            output_file.unlink()
+        return None, status_code
+
+    def _run_crawler(self, crawler_name: str, product_id: str, watermark: Optional[Dict] = None,
+                     progress: Optional[Dict] = None, checkpoint=None, retry_policy=None) -> Tuple[Optional[str], Optional[int]]:
+        """checkpoint를 넘기면 저장된 커서부터 이어서 수집하고, 끝까지 받지 못한 시도는 실패로 돌려 다음 크롤러가 이어받게 합니다.
+        retry_policy(RetryPolicy)를 넘기면 크롤러의 재시도와 재시도 대기가 그 시간 예산 안에서만 돕니다."""
+        if not CRAWLERS_AVAILABLE: return None, None
+        
+        output_file = self._output_file(product_id, crawler_name)
         status_code = None
+        crawler_instance = None
 
+        if not is_registered(crawler_name):
+            self.logger.error(f"알 수 없는 크롤러: {crawler_name}"); return None, None
         try:
-            crawler_map = {
-                "advanced": AdvancedNaverCrawler, "stealth": StealthNaverCrawler,
-                "mobile": MobileNaverCrawler, "selenium": SeleniumNaverCrawler,
-            }
-            if crawler_name not in crawler_map:
-                self.logger.error(f"알 수 없는 크롤러: {crawler_name}"); return None, None
-
-            crawler_instance = crawler_map[crawler_name](product_id)
+            crawler_config = self.config.get('crawlers', {})
+            # 응답 원문을 남겨 두면 response_archive.py reparse로 재크롤링 없이 결과를 다시 만들 수 있습니다.
+            archive = self._get_archive() if crawler_config.get('archive_responses') else None
+            crawler_instance = create_crawler(crawler_name, product_id, crawler_config, archive=archive,
+                                              browser_pool=self._get_browser_pool, retry_policy=retry_policy)
+            if not crawler_instance.start():
+                return None, None
             
-            # 각 크롤러 인스턴스의 정보 획득 메서드를 호출하여 상태 코드 확인
-            info_method_map = {
-                "advanced": "get_product_info", "stealth": "get_product_info_stealth",
-                "mobile": "get_product_info_mobile", "selenium": "get_product_info"
-            }
-            if hasattr(crawler_instance, info_method_map[crawler_name]):
-                 _, _, status_code = getattr(crawler_instance, info_method_map[crawler_name])()
+            # 상품 정보로 상태 코드 확인 (결과는 인스턴스와 요약 캐시에 남아 iter_review_pages가 다시 요청하지 않습니다)
+            _, _, status_code = crawler_instance.get_product_info()
             
-            result_df = None
+            # 페이지가 도착하는 대로 CSV에 기록하여 대량 리뷰도 메모리를 일정하게 유지합니다.
+            saved_count = 0
+            progress = progress if progress is not None else {}
+            incremental = self.config.get('crawlers', {}).get('incremental', False)
             if status_code == 200:
-                result_df = crawler_instance.crawl_reviews()
-
-            if result_df is not None and not result_df.empty:
-                result_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-                self.logger.info(f"💾 결과 저장: {output_file}")
-                return str(output_file), 200
-            else:
-                return None, status_code
+                pages = crawler_instance.iter_review_pages(sort=SORT_NEWEST if incremental else SORT_RANKING,
+                                                           watermark=watermark, progress=progress, checkpoint=checkpoint,
+                                                           workers=self.config.get('crawlers', {}).get('page_workers', 1))
+                if checkpoint is not None:
+                    # 이전 시도에서 받아 둔 리뷰를 먼저 쓰고 이어서 새 페이지를 씁니다.
+                    pages = chain(checkpoint.replay_pages(), pages)
+                saved_count = write_reviews_csv(pages, output_file, keep_empty=incremental)
+            return self._finalize_result(output_file, saved_count, progress, status_code, checkpoint)
         except Exception as e:
             self.logger.error(f"❌ {crawler_name} 실행 오류: {e}")
+            if output_file.exists():
+                output_file.unlink()
             return None, status_code
+        finally:
+            if crawler_instance is not None:
+                crawler_instance.close()
+
+    def _get_browser_pool(self):
+        """일괄 실행 동안 Selenium 크롤러가 공유하는 브라우저 풀 (처음 쓸 때 만듭니다)."""
+        if getattr(self, '_browser_pool', None) is None:
+            self._browser_pool = BrowserPool.from_config(self.config.get('crawlers', {}).get('selenium', {}))
+        return self._browser_pool
+
+    def _close_browser_pool(self):
+        pool = getattr(self, '_browser_pool', None)
+        if pool is not None:
+            self.logger.info(f"🌐 브라우저 풀 종료: {pool.stats}")
+            pool.close()
+            self._browser_pool = None
 
     def start_scheduler(self):
         self.logger.info("🎬 스케줄러 시작 - Ctrl+C로 중단")
@@ -252,8 +400,68 @@ class SmartCrawlerScheduler:
     def crawl_all_products(self):
         self.logger.info(f"🚀 전체 크롤링 시작")
         active_products = [p for p in self.list_products() if p.get("enabled", True)]
-        for product in active_products:
-            self.crawl_product(product)
+        async_config = self.config.get('crawlers', {}).get('async', {})
+        if CRAWLERS_AVAILABLE:
+            # 실행 전체 예산: 상품별 예산과 별개로 한 번의 일괄 실행이 쓸 수 있는 총 시간
+            self._run_policy = RetryPolicy.from_config(self.config.get('crawlers', {}).get('retry', {}), 'run_budget_minutes')
+        try:
+            if async_config.get('enabled') and CRAWLERS_AVAILABLE and HTTPX_AVAILABLE:
+                results = asyncio.run(self.crawl_products_async(active_products))
+                # 비동기 엔진으로 받지 못한 상품만 기존 크롤러 폴백 체인으로 넘깁니다 (체크포인트에서 이어서 수집).
+                active_products = [product for product in active_products if not results.get(product.get('id'))]
+                if active_products:
+                    self.logger.info(f"🔁 비동기 수집 실패 {len(active_products)}개 상품을 기존 크롤러로 재시도")
+            elif async_config.get('enabled'):
+                self.logger.warning("⚠️ httpx가 없어 비동기 엔진 대신 순차 크롤링을 사용합니다.")
+            for index, product in enumerate(active_products):
+                if CRAWLERS_AVAILABLE and self._run_policy.expired():
+                    self.logger.warning(f"⏰ 실행 시간 예산을 모두 써서 남은 {len(active_products) - index}개 상품을 다음 실행으로 미룹니다.")
+                    break
+                self.crawl_product(product)
+        finally:
+            self._run_policy = None
+            self._close_browser_pool()
+            if CRAWLERS_AVAILABLE:
+                get_transport().log_stats()
+
+    async def crawl_products_async(self, products: List[Dict]) -> Dict[str, Optional[str]]:
+        """여러 상품을 asyncio 엔진으로 동시에 수집합니다. 상품 id별 결과 파일 경로(실패 시 None)를 돌려줍니다."""
+        crawler_config = self.config.get('crawlers', {})
+        engine = AsyncCrawlEngine.from_config(crawler_config.get('async', {}))
+        incremental = crawler_config.get('incremental', False)
+        sort = SORT_NEWEST if incremental else SORT_RANKING
+
+        async def crawl_one(client, product):
+            product_id = product.get('id')
+            watermark = product.get('watermark') if incremental else None
+            checkpoint = self._open_checkpoint(product_id, watermark)
+            output_file = self._output_file(product_id, 'async')
+            progress = {}
+            try:
+                # 상품 예산은 엔진이 동시 실행 자리를 얻은 뒤부터 잽니다.
+                saved_count, status_code = await engine.crawl_product(client, product_id, output_file, sort=sort, watermark=watermark,
+                                                                      progress=progress, checkpoint=checkpoint, keep_empty=incremental,
+                                                                      retry_policy=self._product_policy())
+                result_path, status_code = self._finalize_result(output_file, saved_count, progress, status_code, checkpoint)
+            except Exception as e:
+                self.logger.error(f"❌ 비동기 크롤링 오류 ({product_id}): {e}")
+                if output_file.exists():
+                    output_file.unlink()
+                result_path, status_code = None, None
+            if result_path:
+                self.logger.info(f"✅ 비동기 엔진으로 성공: {product.get('name', '')} ({product_id})")
+                self._record_success(product, progress, checkpoint)
+                product['last_crawl'] = datetime.now().isoformat()
+            else:
+                self.logger.warning(f"⚠️ 비동기 엔진 실패: {product.get('name', '')} ({product_id}, 상태: {status_code})")
+            return product_id, result_path
+
+        self.logger.info(f"⚡ 비동기 엔진으로 {len(products)}개 상품 동시 수집 "
+                         f"(상품 {engine.max_concurrent_products}개, 호스트당 {engine.per_host_concurrency}개, 초당 {engine.requests_per_second}회)")
+        async with engine.open_client() as client:
+            results = await asyncio.gather(*(crawl_one(client, product) for product in products))
+        self._save_config(self.config)
+        return dict(results)
 
     def manual_crawl(self, product_id_or_url: str) -> Optional[str]:
         if product_id_or_url.startswith("http"):
@@ -276,6 +484,7 @@ if __name__ == "__main__":
         print("5. 수동 크롤링 (URL/ID 입력)")
         print("6. 스케줄러 시작 (자동 실행)")
         print("7. 전체 상품 즉시 크롤링")
+        print("8. 크롤러 통계 보기")
         print("0. 종료")
         choice = input("선택하세요: ").strip()
 
@@ -312,5 +521,12 @@ if __name__ == "__main__":
             scheduler.start_scheduler()
         elif choice == '7':
             scheduler.crawl_all_products()
+        elif choice == '8':
+            if CRAWLERS_AVAILABLE:
+                print(scheduler.stats.report())
+                pid = input("상품별 통계를 볼 상품 ID (선택사항): ").strip()
+                if pid:
+                    print(scheduler.stats.report(pid))
+                    print(f"🔀 시도 순서: {' → '.join(scheduler._crawler_order(pid))}")
         elif choice == '0':
             break
\ No newline at end of file
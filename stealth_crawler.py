@@ -3,15 +3,15 @@
 극도로 강화된 IP 차단 우회 기법들을 포함
 """
 import requests
-import pandas as pd
-import json
-import time
 import random
-from datetime import datetime
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from retry_policy import RetryPolicy
 from urllib3.exceptions import InsecureRequestWarning
-from analysis import analyze_sentiment, topic_modeling
+from review_iterator import paginate_reviews, collect_reviews, SORT_RANKING, ENDPOINT_WRITABLE_REVIEWS
+from review_pipeline import StreamingReviewAnalyzer
+from summary_cache import get_summary_cache
+from pacing import get_pacer
+from http_transport import get_transport
+from response_archive import install_archive
 
 requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
 
@@ -30,24 +30,40 @@ STEALTH_USER_AGENTS = [
 FREE_PROXIES = []
 
 class StealthNaverCrawler:
-    def __init__(self, product_id):
+    review_endpoint = ENDPOINT_WRITABLE_REVIEWS
+
+    def __init__(self, product_id, archive=None, retry_policy=None):
+        """archive(ResponseArchive)를 주면 받은 응답 원문을 보관하고, retry_policy(RetryPolicy)의 시간 예산 안에서만 재시도합니다."""
         self.product_id = product_id
+        self.product_info = None
+        self.pacer = get_pacer("stealth")
+        self.retry_policy = retry_policy or RetryPolicy()
         self.session = self._create_stealth_session()
         self.request_count = 0
         self.last_request_time = 0
         self.current_proxy = None
         self.failed_proxies = set()
-        
+        if archive is not None:
+            install_archive(self.session, archive)
+
+    @classmethod
+    def from_config(cls, product_id, crawler_config, archive=None, browser_pool=None, retry_policy=None):
+        """스케줄러용 생성자 (crawler_registry.Crawler 참고)."""
+        return cls(product_id, archive=archive, retry_policy=retry_policy)
+
+    def start(self):
+        return True
+
     def _create_stealth_session(self):
-        session = requests.Session()
-        retry_strategy = Retry(
+        retry_strategy = self.retry_policy.urllib3_retry(
             total=10, backoff_factor=3,
             status_forcelist=[403, 429, 500, 502, 503, 504],
             allowed_methods={"GET", "POST", "OPTIONS"}
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
+        # 상품/크롤러가 바뀌어도 연결을 다시 맺지 않도록 프로세스 공유 연결 풀을 씁니다.
+        session = get_transport().session(retry_strategy)
         session.verify = False
+        session.hooks['response'].append(self.pacer.record_response)
         return session
     
     def _rotate_proxy(self):
@@ -73,17 +89,26 @@ class StealthNaverCrawler:
         return headers
     
     def _extreme_delay(self):
-        delay = random.uniform(5, 12)
-        print(f"⏳ {delay:.2f}초 대기 (스텔스 모드)...")
-        time.sleep(delay)
+        delay = self.pacer.wait()
+        print(f"⏳ {delay:.2f}초 대기 (스텔스 모드, 현재 {self.pacer.rate:.2f} req/s)...")
+
+    def get_product_info(self):
+        """상품 정보(merchant_no, origin_product_no, 상태 코드). 요약 캐시에 있으면 요청하지 않습니다."""
+        if self.product_info is None:
+            self.product_info = get_summary_cache().resolve(self.product_id, self._fetch_product_info_stealth, source='stealth')
+        return self.product_info
 
-    def get_product_info_stealth(self):
+    def _fetch_product_info_stealth(self):
         print("🕵️  스텔스 모드로 상품 정보 수집 중...")
         info_url = f"https://smartstore.naver.com/i/v1/products/{self.product_id}/summary"
         for attempt in range(5):
+            if self.retry_policy.expired():
+                print(f"⏰ 시간 예산을 모두 써서 정보 획득을 중단합니다 (시도 {attempt}회)")
+                break
             try:
                 self._extreme_delay()
-                response = self.session.get(info_url, headers=self._generate_stealth_headers(), proxies=self._rotate_proxy(), timeout=30)
+                response = self.session.get(info_url, headers=self._generate_stealth_headers(), proxies=self._rotate_proxy(),
+                                            timeout=self.retry_policy.timeout(30))
                 
                 if response.status_code == 200:
                     product_info = response.json()
@@ -99,65 +124,61 @@ class StealthNaverCrawler:
                     if self.current_proxy: self.failed_proxies.add(str(self.current_proxy))
 
             except Exception as e:
+                self.pacer.record_exception(e)
                 print(f"❌ 정보 획득 시도 {attempt + 1} 중 네트워크 오류: {e}")
                 if self.current_proxy: self.failed_proxies.add(str(self.current_proxy))
         
         print("❌ 모든 시도 실패 - 상품 정보를 가져올 수 없습니다")
         return None, None, None
 
-    def crawl_reviews_stealth(self):
-        merchant_no, origin_product_no, _ = self.get_product_info_stealth()
-        if not merchant_no or not origin_product_no:
+    def _fetch_review_page(self, merchant_no, origin_product_no, page, sort=SORT_RANKING):
+        try:
+            self._extreme_delay()
+            url = f"https://smartstore.naver.com/main/products/{origin_product_no}/reviews/writable-reviews?page={page}&sort={sort}&merchantNo={merchant_no}"
+            response = self.session.get(url, headers=self._generate_stealth_headers(), timeout=30)
+            
+            if response.status_code != 200:
+                print(f"❌ 페이지 {page} 로드 실패, 상태 코드: {response.status_code}. 크롤링을 중단합니다.")
+                return None
+            return response.json()
+        except Exception as e:
+            self.pacer.record_exception(e)
+            print(f"❌ 오류로 크롤링 중단: {e}")
             return None
-        
-        all_reviews, page = [], 1
+
+    def iter_review_pages(self, sort=SORT_RANKING, watermark=None, progress=None, checkpoint=None, workers=1):
+        """리뷰를 페이지 단위로 (페이지 번호, 레코드 목록)씩 돌려줍니다. 인자는 paginate_reviews 참고."""
+        merchant_no, origin_product_no, _ = self.get_product_info()
+        if not merchant_no or not origin_product_no:
+            return
         print("🕵️  스텔스 리뷰 크롤링 시작...")
-        
-        while True:
-            try:
-                self._extreme_delay()
-                url = f"https://smartstore.naver.com/main/products/{origin_product_no}/reviews/writable-reviews?page={page}&sort=REVIEW_RANKING&merchantNo={merchant_no}"
-                response = self.session.get(url, headers=self._generate_stealth_headers(), timeout=30)
-                
-                if response.status_code != 200:
-                    print(f"❌ 페이지 {page} 로드 실패, 상태 코드: {response.status_code}. 크롤링을 중단합니다.")
-                    break
-
-                data = response.json()
-                reviews = data.get('contents', [])
-                if not reviews:
-                    print("✅ 모든 리뷰 수집 완료!")
-                    break
-                
-                for review in reviews:
-                    option_contents = review.get('productOptionContents', [])
-                    option_text = " / ".join([opt.get('optionContent', '') for opt in option_contents])
-                    all_reviews.append({
-                        'id': review.get('id'), 'rating': review.get('reviewScore'),
-                        'writer': review.get('writerMemberId'), 'date': review.get('createDate'),
-                        'content': review.get('reviewContent', ''), 'option': option_text,
-                    })
-                print(f"📝 페이지 {page}: {len(reviews)}개 리뷰 수집 (총 {len(all_reviews)}개)")
-                page += 1
-            except Exception as e:
-                print(f"❌ 오류로 크롤링 중단: {e}")
-                break
-                
-        return pd.DataFrame(all_reviews) if all_reviews else None
+        yield from paginate_reviews(lambda page: self._fetch_review_page(merchant_no, origin_product_no, page, sort),
+                                    watermark=watermark, progress=progress,
+                                    checkpoint=checkpoint, endpoint=self.review_endpoint, workers=workers)
+
+    def crawl_reviews(self, on_page=None):
+        return collect_reviews(self.iter_review_pages(), on_page)
+
+    def close(self):
+        self.session.close()
+
+    # 이전 메서드 이름 호환
+    get_product_info_stealth = get_product_info
+    crawl_reviews_stealth = crawl_reviews
 
 if __name__ == '__main__':
     print("🕵️  === 스텔스 네이버 크롤러 시작 ===")
     print(f"🎯 타겟 상품: {PRODUCT_ID}")
     
+    positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른']
+    negative_keywords = ['불편', '별로', '실망', '아쉬', '불만']
+    analyzer = StreamingReviewAnalyzer(positive_keywords, negative_keywords)
     crawler = StealthNaverCrawler(PRODUCT_ID)
-    review_df = crawler.crawl_reviews_stealth()
+    review_df = crawler.crawl_reviews(on_page=analyzer.submit_page)
     
     if review_df is not None and not review_df.empty:
-        print("\n📊 === 데이터 분석 시작 ===")
-        positive_keywords = ['좋아요', '만족', '추천', '최고', '빠른']
-        negative_keywords = ['불편', '별로', '실망', '아쉬', '불만']
-        review_df['sentiment'] = review_df['content'].apply(lambda x: analyze_sentiment(x, positive_keywords, negative_keywords))
-        review_df = topic_modeling(review_df, NUM_TOPICS)
+        print("\n📊 === 데이터 분석 마무리 (토픽 학습) ===")
+        review_df = analyzer.finish(review_df, NUM_TOPICS, product_id=PRODUCT_ID)
         review_df.to_csv(OUTPUT_FILE_NAME, index=False, encoding='utf-8-sig')
         print(f"\n✅ 분석 완료! 결과가 '{OUTPUT_FILE_NAME}' 파일로 저장되었습니다.")
     else:
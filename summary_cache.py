@@ -0,0 +1,112 @@
+"""
+상품 요약(merchantNo / originProductNo) 영구 캐시
+상품 id로 한 번 알아낸 번호는 바뀌지 않으므로 TTL 동안 /summary 요청 없이 재사용하고,
+존재하지 않는 상품(404 등)은 짧은 TTL로 실패 결과를 캐시해 매번 다시 두드리지 않음
+크롤러마다 엔드포인트와 응답 형태가 달라 한 크롤러의 실패가 다른 크롤러에도 맞다는 보장이 없으므로,
+성공 결과만 크롤러끼리 공유하고 실패 결과는 그 결과를 낸 크롤러(source)에게만 돌려줌
+"""
+import json
+import os
+import threading
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = "cache/product_summary.json"
+SUMMARY_TTL_HOURS = 24 * 7
+NEGATIVE_TTL_MINUTES = 60
+# 차단(403/429)이나 서버 오류는 일시적이므로 실패 캐시 대상이 아닙니다.
+# 200인데 번호가 없는 응답도 차단 페이지나 응답 형태 변경일 수 있어 캐시하지 않습니다.
+NEGATIVE_STATUS = {400, 404, 410}
+
+def _negative_key(product_id, source):
+    return f"{product_id}@{source}"
+
+class SummaryCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_hours=SUMMARY_TTL_HOURS, negative_ttl_minutes=NEGATIVE_TTL_MINUTES):
+        self.path = Path(path)
+        self.ttl = timedelta(hours=ttl_hours)
+        self.negative_ttl = timedelta(minutes=negative_ttl_minutes)
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"상품 요약 캐시 로드 실패, 비우고 시작합니다: {e}")
+            return {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def lookup(self, product_id, source=None):
+        """유효한 캐시 항목이 있으면 (merchant_no, origin_product_no, status_code)를, 없으면 None을 돌려줍니다.
+        성공 결과는 누구에게나, 실패 결과는 같은 source(크롤러 이름)로 저장된 것만 돌려줍니다."""
+        with self._lock:
+            entry = self._entries.get(str(product_id))
+            negative = self._entries.get(_negative_key(product_id, source)) if source else None
+        # 예전 형식의 번호 없는 항목은 어느 크롤러의 실패인지 알 수 없으므로 무시합니다.
+        if entry and entry.get('merchant_no'):
+            if datetime.now() - datetime.fromisoformat(entry['resolved_at']) <= self.ttl:
+                return entry['merchant_no'], entry.get('origin_product_no'), entry.get('status_code')
+        if negative and datetime.now() - datetime.fromisoformat(negative['resolved_at']) <= self.negative_ttl:
+            return None, None, negative.get('status_code')
+        return None
+
+    def store(self, product_id, merchant_no, origin_product_no, status_code, source=None):
+        """조회 결과를 기록합니다. 성공 결과는 상품 id로, 확정적인 실패(NEGATIVE_STATUS)는 source가 있을 때만 그 크롤러 몫으로 저장합니다."""
+        if merchant_no and origin_product_no:
+            key = str(product_id)
+        elif status_code in NEGATIVE_STATUS and source:
+            key = _negative_key(product_id, source)
+        else:
+            return
+        with self._lock:
+            self._entries[key] = {
+                'merchant_no': merchant_no, 'origin_product_no': origin_product_no,
+                'status_code': status_code, 'resolved_at': datetime.now().isoformat(),
+            }
+            self._save()
+
+    def resolve(self, product_id, fetch, source=None):
+        """캐시에 있으면 그대로, 없으면 fetch()로 (merchant_no, origin_product_no, status_code)를 받아 캐시한 뒤 돌려줍니다.
+        source는 실패 결과를 구분할 크롤러 이름입니다 (lookup 참고)."""
+        cached = self.lookup(product_id, source)
+        if cached is not None:
+            if cached[0]:
+                print(f"📦 캐시된 상품 정보 사용: Merchant No: {cached[0]}, Product No: {cached[1]}")
+            else:
+                print(f"📦 최근 조회에 실패한 상품입니다 (상태: {cached[2]}). 요청을 건너뜁니다.")
+            return cached
+        result = fetch()
+        self.store(product_id, *result, source=source)
+        return result
+
+    def invalidate(self, product_id):
+        """상품의 성공 결과와 모든 크롤러의 실패 결과를 지웁니다."""
+        prefix = _negative_key(product_id, '')
+        with self._lock:
+            keys = [key for key in self._entries if key == str(product_id) or key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            if keys:
+                self._save()
+
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+def get_summary_cache():
+    """프로세스 전체에서 공유하는 요약 캐시."""
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = SummaryCache()
+        return _summary_cache
@@ -0,0 +1,44 @@
+"""
+워터마크(증분 수집) 회귀 확인
+정렬 인자를 무시하는 엔드포인트가 오래된 순서로 응답하면 워터마크에서 멈춘 것을 완료로 보면 안 됨
+(그러면 워터마크가 받지 못한 리뷰 너머로 올라가 다음 실행에서도 영영 빠짐)
+
+사용법: python -m pytest tests
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from review_iterator import paginate_reviews  # noqa: E402
+
+WATERMARK = {'date': '2024-01-05T00:00:00', 'ids': ['5']}
+
+def _review(day):
+    return {'id': day, 'createDate': f'2024-01-{day:02d}T00:00:00', 'reviewContent': f'리뷰 {day}'}
+
+def _fetcher(days_per_page):
+    def fetch_page(page):
+        days = days_per_page[page - 1] if page <= len(days_per_page) else []
+        return {'contents': [_review(day) for day in days], 'totalPages': len(days_per_page)}
+    return fetch_page
+
+def _crawl(days_per_page):
+    progress = {}
+    pages = list(paginate_reviews(_fetcher(days_per_page), watermark=WATERMARK, progress=progress))
+    return pages, progress
+
+def test_newest_first_stops_at_watermark():
+    pages, progress = _crawl([[9, 8, 7], [6, 5, 4]])
+    assert [record['id'] for _, records in pages for record in records] == [9, 8, 7, 6]
+    assert progress['completed']
+    assert progress['watermark']['date'] == '2024-01-09T00:00:00'
+
+def test_unordered_page_is_not_completed():
+    pages, progress = _crawl([[1, 2, 3], [4, 5, 6]])
+    assert pages == []
+    assert progress['unordered'] and not progress['completed']
+
+def test_order_is_checked_across_pages():
+    pages, progress = _crawl([[9, 8], [12, 11]])
+    assert len(pages) == 1
+    assert progress['unordered'] and not progress['completed']
@@ -0,0 +1,37 @@
+"""
+유사 중복 묶기 후 토픽 학습 회귀 확인
+템플릿 리뷰만 있는 상품은 대표 리뷰가 몇 건 남지 않아 TfidfVectorizer(min_df=2)가 학습을 거부하므로,
+이때는 모든 리뷰로 학습해야 함 (크롤링 결과를 저장하기 전에 분석이 죽지 않도록)
+
+사용법: python -m pytest tests
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import analysis  # noqa: E402
+from review_pipeline import StreamingReviewAnalyzer  # noqa: E402
+
+TEMPLATES = ['좋아요 잘 쓸게요 튼튼해요', '색상 예뻐요 가볍고 편해요']
+NUM_TOPICS = 5
+
+def _templated_reviews():
+    return [{'id': i, 'content': TEMPLATES[i % 2]} for i in range(40)]
+
+def test_topic_modeling_falls_back_when_few_representatives(monkeypatch):
+    monkeypatch.setattr(analysis, 'USE_TOKEN_CACHE', False)
+    df = analysis.topic_modeling(pd.DataFrame(_templated_reviews()), NUM_TOPICS, n_workers=1, tokenizer='regex', dedup=True)
+    assert len(df) == 40
+    assert df['topic'].notna().all()
+    assert all(df['tokens'])
+
+def test_streaming_finish_falls_back_when_few_representatives(monkeypatch):
+    monkeypatch.setattr(analysis, 'USE_TOKEN_CACHE', False)
+    reviews = _templated_reviews()
+    analyzer = StreamingReviewAnalyzer(['좋아요'], ['아쉬'], tokenizer='regex', dedup=True)
+    analyzer.submit_page(reviews)
+    df = analyzer.finish(pd.DataFrame(reviews), NUM_TOPICS)
+    assert len(df) == 40
+    assert df['topic'].notna().all()
@@ -0,0 +1,90 @@
+"""
+리뷰 토큰화 결과 디스크 캐시
+리뷰 본문 해시 + 토크나이저 버전을 키로 SQLite에 저장하여 재분석 시 재토큰화를 피함
+"""
+import sqlite3
+import hashlib
+import json
+import time
+import threading
+import logging
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = "cache/token_cache.sqlite"
+DEFAULT_MAX_ENTRIES = 500000
+_BATCH_SIZE = 500  # SQLite 바인딩 변수 개수 제한 대응
+
+class TokenCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, tokens TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tokens_last_used ON tokens(last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(text, tokenizer_version):
+        """리뷰 본문과 토크나이저 버전으로 캐시 키를 만듭니다."""
+        return hashlib.sha1(f"{tokenizer_version}\0{text}".encode('utf-8')).hexdigest()
+
+    def get_many(self, keys):
+        """키 목록에 대한 캐시 결과를 {key: tokens} 형태로 돌려줍니다."""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(unique_keys), _BATCH_SIZE):
+                batch = unique_keys[i:i + _BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(f"SELECT key, tokens FROM tokens WHERE key IN ({placeholders})", batch).fetchall()
+                found.update((key, json.loads(tokens)) for key, tokens in rows)
+            if found:
+                now = time.time()
+                self._conn.executemany("UPDATE tokens SET last_used = ? WHERE key = ?", [(now, key) for key in found])
+                self._conn.commit()
+        hits = sum(1 for key in keys if key in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items):
+        """{key: tokens} 항목을 저장하고 용량을 넘으면 오래 쓰지 않은 항목부터 지웁니다."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(key, json.dumps(tokens, ensure_ascii=False), now) for key, tokens in items.items()]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO tokens (key, tokens, last_used) VALUES (?, ?, ?)", rows)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM tokens WHERE key IN (SELECT key FROM tokens ORDER BY last_used ASC LIMIT ?)", (overflow,)
+            )
+            logging.info(f"토큰 캐시 LRU 정리: {overflow}개 항목 삭제")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits, 'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0, 'entries': len(self),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,112 @@
+"""
+토큰화 백엔드 모음
+- okt: konlpy Okt 명사 추출 (JDK 필요, 정확하지만 느림)
+- regex: 정규식 어절 분리 + 조사/어미 제거 (순수 파이썬, JVM 불필요)
+- ngram: 한글 음절 2-gram (순수 파이썬, JVM 불필요, 어휘가 가장 큼)
+"""
+import re
+import threading
+
+_okt = None
+_okt_lock = threading.Lock()
+
+def get_okt():
+    """프로세스 전역 Okt 인스턴스를 돌려줍니다. 첫 호출 때 JVM이 기동됩니다."""
+    global _okt
+    if _okt is None:
+        with _okt_lock:
+            if _okt is None:
+                from konlpy.tag import Okt
+                _okt = Okt()
+    return _okt
+
+class OktTokenizer:
+    name = "okt"
+    # 토큰화 규칙(품사, 길이 필터 등)을 바꾸면 버전을 올려 기존 캐시를 무효화합니다.
+    version = "okt-nouns-v1"
+
+    def warmup(self):
+        get_okt().nouns("워밍업 문장")
+
+    def tokenize(self, text):
+        if isinstance(text, str):
+            return [token for token in get_okt().nouns(text) if len(token) > 1]
+        return []
+
+# 긴 것부터 검사해야 '에서는'이 '는'보다 먼저 제거됩니다.
+JOSA_SUFFIXES = sorted([
+    '에서는', '으로는', '에게서', '까지는', '이라서', '이에요', '이네요', '입니다', '했어요', '해요', '네요', '예요',
+    '에서', '으로', '에게', '까지', '부터', '처럼', '보다', '하고', '이랑', '이나', '에는', '에도', '인데', '이고',
+    '은', '는', '이', '가', '을', '를', '에', '의', '도', '만', '로', '와', '과', '랑', '요',
+], key=len, reverse=True)
+
+STOPWORDS = {
+    '너무', '정말', '진짜', '그냥', '아주', '조금', '많이', '그리고', '하지만', '그래서', '근데', '이번', '다음',
+    '있어', '없어', '같아', '좋아', '했는데', '해서', '하는', '합니다', '있습니다', '같습니다', '제품', '상품',
+}
+
+_WORD_PATTERN = re.compile(r'[가-힣]+|[A-Za-z]+|[0-9]+')
+_HANGUL_RUN = re.compile(r'[가-힣]+')
+
+class RegexTokenizer:
+    name = "regex"
+    version = "regex-josa-v1"
+
+    def warmup(self):
+        pass
+
+    def _strip_josa(self, word):
+        for suffix in JOSA_SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+                return word[:-len(suffix)]
+        return word
+
+    def tokenize(self, text):
+        if not isinstance(text, str):
+            return []
+        tokens = []
+        for word in _WORD_PATTERN.findall(text.lower()):
+            if '가' <= word[0] <= '힣':
+                word = self._strip_josa(word)
+            if len(word) > 1 and word not in STOPWORDS:
+                tokens.append(word)
+        return tokens
+
+class CharNgramTokenizer:
+    name = "ngram"
+    version = "hangul-bigram-v1"
+
+    def __init__(self, n=2):
+        self.n = n
+
+    def warmup(self):
+        pass
+
+    def tokenize(self, text):
+        if not isinstance(text, str):
+            return []
+        n = self.n
+        tokens = []
+        for run in _HANGUL_RUN.findall(text):
+            if len(run) <= n:
+                if len(run) > 1:
+                    tokens.append(run)
+                continue
+            tokens.extend(run[i:i + n] for i in range(len(run) - n + 1))
+        return tokens
+
+TOKENIZERS = {
+    OktTokenizer.name: OktTokenizer,
+    RegexTokenizer.name: RegexTokenizer,
+    CharNgramTokenizer.name: CharNgramTokenizer,
+}
+
+_instances = {}
+
+def get_tokenizer(name):
+    """이름으로 토큰화 백엔드 인스턴스를 돌려줍니다 (프로세스 내 재사용)."""
+    if name not in TOKENIZERS:
+        raise ValueError(f"알 수 없는 토크나이저: {name} (사용 가능: {', '.join(TOKENIZERS)})")
+    if name not in _instances:
+        _instances[name] = TOKENIZERS[name]()
+    return _instances[name]
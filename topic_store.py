@@ -0,0 +1,164 @@
+"""
+상품별 증분 토픽 모델 저장소
+TF-IDF 어휘와 LDA 상태를 디스크에 보관하고, 새로 수집된 리뷰만 partial_fit으로 반영
+"""
+import sys
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from analysis import tokenize_texts, build_vectorizer, build_lda, print_topic_keywords, DEFAULT_TOKENIZER
+
+DEFAULT_STORE_DIR = "topic_models"
+REFIT_EVERY_UPDATES = 30  # 증분 갱신이 이 횟수만큼 쌓이면 전체 재학습
+REFIT_OOV_RATIO = 0.3     # 새 리뷰 토큰 중 기존 어휘 밖 비율이 이보다 크면 전체 재학습
+STORE_VERSION = 2
+
+def _review_key(review_id, content):
+    if pd.notna(review_id):
+        return str(review_id)
+    text = content if isinstance(content, str) else ""
+    return "h:" + hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def _align_topics(old_lda, old_features, new_lda, new_features):
+    """새 토픽 순서를 이전 모델과 가장 비슷하게 맞추는 순열을 돌려줍니다 (헝가리안 매칭)."""
+    old_index = {word: i for i, word in enumerate(old_features)}
+    shared = [(old_index[word], j) for j, word in enumerate(new_features) if word in old_index]
+    if not shared:
+        return np.arange(new_lda.n_components)
+    old_cols, new_cols = map(list, zip(*shared))
+    old_dist = old_lda.components_[:, old_cols]
+    new_dist = new_lda.components_[:, new_cols]
+    old_dist = old_dist / np.linalg.norm(old_dist, axis=1, keepdims=True)
+    new_dist = new_dist / np.linalg.norm(new_dist, axis=1, keepdims=True)
+    _, perm = linear_sum_assignment(-(old_dist @ new_dist.T))
+    return perm
+
+class TopicModelStore:
+    def __init__(self, base_dir=DEFAULT_STORE_DIR, refit_every=REFIT_EVERY_UPDATES, refit_oov_ratio=REFIT_OOV_RATIO):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.refit_every = refit_every
+        self.refit_oov_ratio = refit_oov_ratio
+
+    def _model_path(self, product_id):
+        return self.base_dir / f"{product_id}.joblib"
+
+    def load(self, product_id):
+        path = self._model_path(product_id)
+        if not path.exists():
+            return None
+        try:
+            state = joblib.load(path)
+            return state if state.get('version') == STORE_VERSION else None
+        except Exception as e:
+            logging.warning(f"토픽 모델 로드 실패, 새로 학습합니다 ({product_id}): {e}")
+            return None
+
+    def save(self, product_id, state):
+        path = self._model_path(product_id)
+        tmp_path = path.with_suffix('.tmp')
+        joblib.dump(state, tmp_path)
+        tmp_path.replace(path)
+
+    def update(self, df, product_id, num_topics, tokens=None, **tokenize_kwargs):
+        """새 리뷰만 반영해 상품 토픽 모델을 갱신하고 df['topic']을 채웁니다.
+        tokens(행별 토큰 목록)를 주면 다시 토큰화하지 않고 그대로 씁니다."""
+        ids = df['id'] if 'id' in df.columns else [None] * len(df)
+        keys = [_review_key(review_id, content) for review_id, content in zip(ids, df['content'])]
+        state = self.load(product_id)
+        tokenizer = tokenize_kwargs.get('tokenizer') or DEFAULT_TOKENIZER
+
+        needs_refit = (
+            state is None or state['num_topics'] != num_topics or state['tokenizer'] != tokenizer
+            or state['updates_since_refit'] >= self.refit_every
+        )
+        if not needs_refit:
+            assignments = state['assignments']
+            new_rows = [i for i, key in enumerate(keys) if key not in assignments]
+            if tokens is not None:
+                new_tokens = [tokens[i] for i in new_rows]
+            else:
+                new_tokens = tokenize_texts(df['content'].iloc[new_rows], **tokenize_kwargs) if new_rows else []
+            vocabulary = state['vectorizer'].vocabulary_
+            total = sum(len(tokens) for tokens in new_tokens)
+            oov = sum(1 for tokens in new_tokens for token in tokens if token not in vocabulary)
+            if total and oov / total > self.refit_oov_ratio:
+                logging.info(f"어휘 밖 토큰 비율 {oov / total:.1%} → 전체 재학습")
+                needs_refit = True
+            elif new_rows:
+                self._partial_update(state, [keys[i] for i in new_rows], new_tokens)
+                self.save(product_id, state)
+            logging.info(f"토픽 모델 증분 갱신 ({product_id}): 신규 리뷰 {len(new_rows)}건")
+
+        if needs_refit:
+            state = self._full_refit(df, keys, num_topics, tokenizer, state, tokens, tokenize_kwargs)
+            if state is None:
+                logging.warning("분석할 텍스트가 없어 토픽 모델링을 건너뜁니다.")
+                df['topic'] = '분석 불가'
+                return df
+            self.save(product_id, state)
+            logging.info(f"토픽 모델 전체 재학습 ({product_id}): 리뷰 {len(keys)}건")
+
+        df['topic'] = [state['assignments'].get(key, 0) for key in keys]
+        print_topic_keywords(state['lda'], state['vectorizer'].get_feature_names_out())
+        return df
+
+    def _partial_update(self, state, new_keys, new_tokens):
+        vectorizer, lda = state['vectorizer'], state['lda']
+        matrix = vectorizer.transform([" ".join(tokens) for tokens in new_tokens])
+        state['n_docs'] += len(new_keys)
+        lda.set_params(total_samples=state['n_docs'])
+        lda.partial_fit(matrix)
+        for key, topic in zip(new_keys, lda.transform(matrix).argmax(axis=1)):
+            state['assignments'][key] = int(topic)
+        state['updates_since_refit'] += 1
+
+    def _full_refit(self, df, keys, num_topics, tokenizer, old_state, tokens, tokenize_kwargs):
+        if tokens is None:
+            tokens = tokenize_texts(df['content'], **tokenize_kwargs)
+        texts = [" ".join(doc) for doc in tokens]
+        if not any(texts):
+            return None
+
+        vectorizer = build_vectorizer()
+        matrix = vectorizer.fit_transform(texts)
+        lda = build_lda(num_topics)
+        lda.fit(matrix)
+
+        if old_state is not None and old_state['num_topics'] == num_topics and old_state['tokenizer'] == tokenizer:
+            # 재학습 후에도 토픽 번호가 유지되도록 이전 모델 기준으로 토픽 순서를 맞춥니다.
+            perm = _align_topics(old_state['lda'], old_state['vectorizer'].get_feature_names_out(),
+                                 lda, vectorizer.get_feature_names_out())
+            lda.components_ = lda.components_[perm]
+            lda.exp_dirichlet_component_ = lda.exp_dirichlet_component_[perm]
+
+        topics = lda.transform(matrix).argmax(axis=1)
+        return {
+            'version': STORE_VERSION, 'num_topics': num_topics, 'tokenizer': tokenizer,
+            'vectorizer': vectorizer, 'lda': lda,
+            'assignments': {key: int(topic) for key, topic in zip(keys, topics)},
+            'n_docs': len(keys), 'updates_since_refit': 0,
+            'last_full_fit': datetime.now().isoformat(),
+        }
+
+def incremental_topic_modeling(df, num_topics, product_id, store=None, tokens=None, **tokenize_kwargs):
+    """topic_modeling의 증분 버전. 상품별 저장된 모델을 새 리뷰로만 갱신합니다 (tokens는 TopicModelStore.update 참고)."""
+    store = store or TopicModelStore()
+    return store.update(df, product_id, num_topics, tokens=tokens, **tokenize_kwargs)
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print("사용법: python topic_store.py <상품ID> <리뷰 CSV> [토픽 수]")
+        sys.exit(1)
+    product_id, csv_path = sys.argv[1], sys.argv[2]
+    num_topics = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    review_df = pd.read_csv(csv_path)
+    review_df = incremental_topic_modeling(review_df, num_topics, product_id)
+    review_df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    print(f"\n✅ 토픽 갱신 완료! 결과가 '{csv_path}' 파일에 저장되었습니다.")
@@ -116,6 +116,14 @@ def vpn_status():
     status = scheduler.get_vpn_status()
     return jsonify({'success': True, 'status': status, 'enabled': scheduler.config.get("vpn", {}).get("enabled")})
 
+@app.route('/api/crawler_stats', methods=['GET'])
+def crawler_stats():
+    stats = getattr(scheduler, 'stats', None)
+    if stats is None:
+        return jsonify({'success': False, 'error': '크롤러 모듈을 불러오지 못했습니다.'}), 503
+    product_id = request.args.get('product_id')
+    return jsonify({'success': True, 'stats': stats.snapshot(product_id),
+                    'order': scheduler._crawler_order(product_id) if product_id else scheduler.config['crawlers']['priority_order']})
 
 # --- 백그라운드 작업 ---
 def run_crawl_job(job_id, url, name, crawler_type):
@@ -154,6 +162,9 @@ def run_crawl_job(job_id, url, name, crawler_type):
         
         if result_file:
             update_job('completed', 100, '크롤링이 성공적으로 완료되었습니다!', result=result_file)
+        elif temp_product.get('partial_result'):
+            raise Exception(f"모든 크롤러가 끝까지 수집하지 못했습니다. 지금까지 받은 리뷰만 부분 결과로 저장했습니다: "
+                            f"{temp_product['partial_result']} (다음 실행에서 이어서 수집)")
         else:
             raise Exception("모든 크롤러가 실패했습니다. 네트워크 상태나 상품 URL을 확인해주세요.")
             